@@ -4,59 +4,133 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from dotenv import load_dotenv
 from openai import AzureOpenAI
 from src.database.db_manager import DatabaseManager
+from src.core.conversation_log import ConversationLog
+from src.core.context_window import ContextWindow, TokenCounter
+from src.core.fast_path import FastPathResponder
+from src.core.intent_matcher import match_intents
+from src.core.logger import get_logger
+from src.core.response_cache import ResponseCache
+from src.core.tracing import tracer
+
+logger = get_logger("brain")
+
+
+def create_llm_client():
+    """
+    Azure OpenAI 클라이언트 생성 (여러 ChipiBrain이 하나를 공유할 수 있음 - 내부 HTTP 커넥션 풀 재사용)
+
+    Returns:
+        AzureOpenAI
+    """
+    load_dotenv('config/.env', encoding='utf-8')
+
+    azure_endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
+    azure_api_key = os.environ.get("AZURE_OPENAI_API_KEY")
+    api_version = os.environ.get("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
+
+    if not azure_endpoint:
+        raise ValueError("AZURE_OPENAI_ENDPOINT가 설정되지 않았습니다.")
+
+    if azure_api_key:
+        # API 키 인증
+        return AzureOpenAI(
+            api_version=api_version,
+            azure_endpoint=azure_endpoint,
+            api_key=azure_api_key,
+        )
+
+    # 암호 없는 인증 (Managed Identity 등)
+    from azure.identity import DefaultAzureCredential
+    credential = DefaultAzureCredential()
+    return AzureOpenAI(
+        api_version=api_version,
+        azure_endpoint=azure_endpoint,
+        azure_ad_token_provider=lambda: credential.get_token(
+            "https://cognitiveservices.azure.com/.default"
+        ).token,
+    )
+
 
 class ChipiBrain:
-    def __init__(self):
+    def __init__(self, client=None, db_manager=None, executor=None, memory_file=None, user_email=None):
+        """
+        초기화 (인자를 넘기지 않으면 혼자 쓰는 클라이언트/DB 연결을 직접 만듦)
+
+        Args:
+            client: 공유할 AzureOpenAI 클라이언트 (기본값: create_llm_client()로 새로 생성)
+            db_manager: 공유할 DatabaseManager (넘기면 close()에서 닫지 않음, False면 DB 없이 동작)
+            executor: DB 컨텍스트 미리 조회에 쓸 공유 ThreadPoolExecutor (넘기면 종료하지 않음)
+            memory_file: 대화 히스토리 저널 경로 (기본값: env의 CHIPI_MEMORY_FILE 또는 memory.jsonl)
+                         디바이스마다 따로 쓰는 경우 예전 memory.txt는 변환하지 않음
+            user_email: 대화 상대 이메일 (있으면 디바이스 소유자보다 우선, 없으면 디바이스 소유자)
+        """
         load_dotenv('config/.env', encoding='utf-8')
 
         # ==========================================
         # 1. Azure OpenAI 설정
         # ==========================================
-        azure_endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
-        azure_api_key = os.environ.get("AZURE_OPENAI_API_KEY")
-        api_version = os.environ.get("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
         deployment_name = os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
+        self.client = client or create_llm_client()
+        self.deployment_name = deployment_name
+
+        # 대화 히스토리 저널 (턴마다 새 메시지만 이어 씀, 시작할 때는 마지막 부분만 읽음)
+        self.memory_tail = int(os.environ.get("CHIPI_MEMORY_TAIL", "100"))
+        self.memory_log = ConversationLog(
+            memory_file or os.environ.get("CHIPI_MEMORY_FILE", "memory.jsonl"),
+            max_entries=max(self.memory_tail, int(os.environ.get("CHIPI_MEMORY_MAX_ENTRIES", "1000"))),
+            legacy_path=None if memory_file else "memory.txt",
+        )
+        self._unsaved = []  # 아직 저널에 기록하지 않은 메시지
+        self.history_version = 0  # 대화에 메시지가 추가될 때마다 증가 (미리 만든 응답이 아직 유효한지 확인용)
+        self.messages = self.load_memory()
 
-        if not azure_endpoint:
-            raise ValueError("AZURE_OPENAI_ENDPOINT가 설정되지 않았습니다.")
+        # 프롬프트 토큰 예산: 시스템 프롬프트 + 최근 대화만 보내고 오래된 대화는 요약으로 접음
+        self.context_window = ContextWindow(
+            budget_tokens=int(os.environ.get("CHIPI_CONTEXT_BUDGET", "3000")),
+            counter=TokenCounter(deployment_name),
+            summarize=self._summarize,
+        )
 
-        # Azure OpenAI 클라이언트 초기화
-        if azure_api_key:
-            # API 키 인증
-            self.client = AzureOpenAI(
-                api_version=api_version,
-                azure_endpoint=azure_endpoint,
-                api_key=azure_api_key,
-            )
-        else:
-            # 암호 없는 인증 (Managed Identity 등)
-            from azure.identity import DefaultAzureCredential
-            credential = DefaultAzureCredential()
-            self.client = AzureOpenAI(
-                api_version=api_version,
-                azure_endpoint=azure_endpoint,
-                azure_ad_token_provider=lambda: credential.get_token(
-                    "https://cognitiveservices.azure.com/.default"
-                ).token,
-            )
+        # 자주 묻는 짧은 질문(인사/온도/습도)은 모아둔 응답으로 LLM 없이 답함 (CHIPI_RESPONSE_CACHE=1일 때)
+        self.response_cache = ResponseCache() if os.environ.get("CHIPI_RESPONSE_CACHE", "0") == "1" else None
 
-        self.deployment_name = deployment_name
-        self.messages = self.load_memory()
+        # 온도/습도만 묻는 질문은 센서 값으로 문장 틀을 골라 바로 답함 (CHIPI_FAST_PATH_DEVICES에 있는 디바이스만)
+        self.fast_path = FastPathResponder()
 
         # ==========================================
         # 3. 데이터베이스 초기화
         # ==========================================
-        try:
-            self.db_manager = DatabaseManager()
-            self.db_manager.connect()
-        except Exception as e:
-            print(f"⚠️  데이터베이스 연결 실패: {e}")
-            self.db_manager = None
+        self._owns_db = db_manager is None
+        if db_manager is not None:
+            self.db_manager = db_manager or None
+        else:
+            try:
+                self.db_manager = DatabaseManager()
+                self.db_manager.connect()
+            except Exception as e:
+                logger.warning(f"⚠️  데이터베이스 연결 실패: {e}")
+                self.db_manager = None
+
+        # DB 컨텍스트 미리 조회 (STT/프롬프트 준비와 겹쳐서 진행, 늦으면 마지막 컨텍스트 사용)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=int(os.environ.get("CHIPI_PREFETCH_WORKERS", "4")),
+            thread_name_prefix="chipi-prefetch",
+        )
+        self.context_deadline = float(os.environ.get("CHIPI_CONTEXT_DEADLINE_MS", "500")) / 1000
+        self._prefetch_lock = threading.Lock()
+        self.prefetch_max_age = 60  # 이보다 오래된 미리 조회 결과는 다시 조회 (초)
+        self._prefetch = {}       # device_serial -> (Future, 시작 시각)
+        self._last_context = {}   # device_serial -> 마지막으로 성공한 컨텍스트
+        self.user_email = user_email
 
         # ==========================================
         # 2. 시스템 프롬프트 설정 (.env에서 읽음)
@@ -69,111 +143,270 @@ class ChipiBrain:
         }
 
     def load_memory(self):
-        """대화 히스토리 로드"""
-        history_file = "memory.txt"
-        messages = []
-
-        if os.path.exists(history_file):
-            try:
-                with open(history_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        if ":" in line:
-                            # 첫 번째 콜론만 분리 (내용에 콜론이 있을 수 있으므로)
-                            role, content = line.split(":", 1)
-                            messages.append(
-                                {"role": role.strip(), "content": content.strip()}
-                            )
-            except Exception as e:
-                print(f"히스토리 로드 오류: {e}")
-
-        return messages
+        """대화 히스토리 로드 (저널의 마지막 CHIPI_MEMORY_TAIL개만)"""
+        try:
+            return self.memory_log.load_tail(self.memory_tail)
+        except Exception as e:
+            logger.error(f"히스토리 로드 오류: {e}")
+            return []
 
     def save_memory(self):
-        """대화 히스토리 저장"""
-        history_file = "memory.txt"
+        """대화 히스토리 저장 (지난 저장 이후 새로 생긴 메시지만 추가)"""
         try:
-            with open(history_file, "w", encoding="utf-8") as f:
-                for msg in self.messages:
-                    # 시스템 메시지는 저장하지 않음 (매번 설정에 따라 달라질 수 있으므로)
-                    if msg.get("role") != "system":
-                        # 줄바꿈 문자가 있을 경우 파일 형식이 깨질 수 있으므로 replace 처리 등을 고려할 수 있음
-                        clean_content = msg['content'].replace("\n", " ") 
-                        f.write(f"{msg['role']}:{clean_content}\n")
+            # 시스템 메시지는 저장하지 않음 (매번 설정에 따라 달라질 수 있으므로)
+            self.memory_log.append([msg for msg in self._unsaved if msg.get("role") != "system"])
+            self._unsaved = []
         except Exception as e:
-            print(f"히스토리 저장 오류: {e}")
+            logger.error(f"히스토리 저장 오류: {e}")
 
     def create_new_memory(self):
         """새 대화 히스토리 생성 (초기화)"""
         self.messages = []
-        # 파일을 비움
-        with open("memory.txt", "w", encoding="utf-8") as f:
-            pass
+        self._unsaved = []
+        self.history_version += 1
+        # 저널을 비움
+        self.memory_log.clear()
 
     def add_msg(self, msg):
         """사용자 메시지 추가"""
-        self.messages.append({"role": "user", "content": msg})
+        self._append_message("user", msg)
+
+    def _append_message(self, role, content):
+        """메시지를 대화에 추가하고 다음 save_memory() 때 저장되도록 표시"""
+        message = {"role": role, "content": content}
+        self.messages.append(message)
+        self._unsaved.append(message)
+        self.history_version += 1
+
+    def _summarize(self, previous_summary, messages):
+        """밀려난 대화를 기존 요약에 합쳐 새 요약 생성 (ContextWindow에서 호출)
+
+        Args:
+            previous_summary: 기존 요약 (없으면 "")
+            messages: 새로 요약에 반영할 메시지 리스트
+
+        Returns:
+            str: 새 요약
+        """
+        dialogue = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        prompt = (
+            "다음은 식물 친구 AI와 사용자의 대화야. 기존 요약에 새 대화를 합쳐서 "
+            "사용자에 대해 기억할 사실, 감정 상태, 약속한 내용 위주로 5문장 이내 한국어로 요약해줘.\n\n"
+            f"## 기존 요약\n{previous_summary or '(없음)'}\n\n## 새 대화\n{dialogue}"
+        )
+        response = self.client.chat.completions.create(
+            model=self.deployment_name,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=int(os.environ.get("CHIPI_SUMMARY_MAX_TOKENS", "200")),
+            temperature=0.3,
+        )
+        return response.choices[0].message.content
+
+    def _request_messages(self):
+        """토큰 예산에 맞춘 요청용 메시지 (밀려난 대화는 self.messages에서도 정리)"""
+        request_messages, kept = self.context_window.fit(self.messages)
+        if self.messages and self.messages[0].get("role") == "system":
+            self.messages = [self.messages[0]] + kept
+        else:
+            self.messages = kept
+        return request_messages
+
+    def _refresh_summary_async(self):
+        """밀려난 대화가 있으면 응답이 끝난 뒤 백그라운드에서 요약 갱신"""
+        if self.context_window.has_pending():
+            threading.Thread(target=self.context_window.refresh_summary, daemon=True).start()
+
+    def prefetch_context(self, device_serial):
+        """DB 컨텍스트 조회를 백그라운드에서 시작 (사용자 발화를 듣기 전에 호출해 두면 STT와 겹침)
+
+        Args:
+            device_serial: 디바이스 시리얼
+
+        Returns:
+            Future 또는 None (DB/시리얼이 없을 때)
+        """
+        if not device_serial or not self.db_manager:
+            return None
+
+        with self._prefetch_lock:
+            future, started_at = self._prefetch.get(device_serial, (None, 0))
+            # 듣기가 길어져 오래된 결과면 새로 조회
+            if future is None or (future.done() and time.monotonic() - started_at > self.prefetch_max_age):
+                future = self._executor.submit(self._fetch_context, device_serial, self.user_email,
+                                               tracer.turn_id)
+                future.add_done_callback(lambda f: self._remember_context(device_serial, f))
+                self._prefetch[device_serial] = (future, time.monotonic())
+            return future
+
+    def _fetch_context(self, device_serial, user_email, turn_id):
+        # 백그라운드 스레드라 요청한 턴 ID를 받아서 기록
+        start = time.perf_counter()
+        try:
+            return self.db_manager.get_turn_context(device_serial, user_email)
+        finally:
+            tracer.record("db.build_context", time.perf_counter() - start, turn_id=turn_id)
+
+    def _remember_context(self, device_serial, future):
+        """조회가 끝나면 (마감 시간을 넘겼더라도) 다음 턴 대비용으로 보관"""
+        if not future.cancelled() and future.exception() is None and future.result():
+            self._last_context[device_serial] = future.result()
+
+    def _await_context(self, device_serial, peek=False):
+        """미리 시작한 조회 결과를 마감 시간까지만 기다림 (넘기면 마지막 컨텍스트로 대체)
+
+        Args:
+            device_serial: 디바이스 시리얼
+            peek: True면 결과만 보고 미리 조회한 Future는 남겨둠 (미리 응답 생성용 - 이번 턴이 다시 씀)
+        """
+        future = self.prefetch_context(device_serial)
+        if future is None:
+            return None
+
+        try:
+            with tracer.span("db.context_wait") as attrs:
+                try:
+                    return future.result(timeout=self.context_deadline)
+                except FutureTimeoutError:
+                    attrs["fallback"] = True
+                    logger.warning(f"⚠️  DB 컨텍스트 조회 지연 ({self.context_deadline * 1000:.0f}ms 초과) → 이전 컨텍스트 사용")
+                    return self._last_context.get(device_serial)
+                except Exception as e:
+                    attrs["fallback"] = True
+                    logger.error(f"❌ DB 컨텍스트 조회 오류: {e}")
+                    return self._last_context.get(device_serial)
+        finally:
+            # 다음 턴은 새로 조회 (끝나지 않은 조회는 백그라운드에서 마저 진행)
+            with self._prefetch_lock:
+                if not peek and self._prefetch.get(device_serial, (None, 0))[0] is future:
+                    del self._prefetch[device_serial]
 
     def get_run_id(self, ai_name):
         """호환성을 위한 메서드"""
         return ai_name
 
-    def wait_run(self, ai_name, device_serial=None):
-        """AI 응답 생성 및 반환
+    def _last_user_message(self):
+        """최근 사용자 메시지 (소문자, 없으면 빈 문자열)"""
+        for msg in reversed(self.messages):
+            if msg.get("role") == "user":
+                return msg.get("content", "").lower()
+        return ""
+
+    def _fast_reply(self, ai_name, device_serial, turn_context):
+        """
+        온도/습도만 묻는 질문이면 LLM 없이 만든 응답 (디바이스가 꺼져 있거나 해당 없으면 None)
+        """
+        if not self.fast_path.enabled_for(device_serial) or not turn_context:
+            return None
+        sensor_data = turn_context.get("sensor")
+        plant_status = self._plant_status(sensor_data)
+        if plant_status is None:
+            return None
+        return self.fast_path.respond(self._last_user_message(), ai_name, sensor_data, plant_status)
+
+    def _plant_status(self, sensor_data):
+        """센서 데이터로 식물 상태 판단 (온도/습도가 없거나 DB가 없으면 None)"""
+        if not self.db_manager or not sensor_data:
+            return None
+        if sensor_data.get("temperature") is None or sensor_data.get("humidity") is None:
+            return None
+        return self.db_manager.get_plant_status(sensor_data["temperature"], sensor_data["humidity"])
+
+    def _answers_locally(self, text, ai_name, device_serial, turn_context):
+        """빠른 응답이나 응답 캐시로 LLM 없이 답할 발화인지 (미리 응답을 만들 필요가 없음)"""
+        sensor_data = turn_context.get("sensor") if turn_context else None
+        plant_status = self._plant_status(sensor_data)
+        if plant_status is not None and self.fast_path.enabled_for(device_serial) \
+                and self.fast_path.handles(text, ai_name, sensor_data, plant_status):
+            return True
+        return self.response_cache is not None and \
+            self.response_cache.would_hit(text, ai_name, sensor_data, plant_status)
+
+    def _lookup_cache(self, ai_name, turn_context):
+        """
+        응답 캐시 조회 (캐시를 끄면 항상 (None, None))
+
+        Returns:
+            (key, reply): LLM 응답을 저장할 키, 모아둔 응답 (없으면 None)
+        """
+        if self.response_cache is None:
+            return None, None
+        sensor_data = turn_context.get("sensor") if turn_context else None
+        return self.response_cache.lookup(self._last_user_message(), ai_name, sensor_data,
+                                          self._plant_status(sensor_data))
+
+    def _prepare_messages(self, ai_name, turn_context):
+        """요청 전에 시스템 프롬프트를 만들어 self.messages 맨 앞에 넣음
 
         Args:
             ai_name: AI 페르소나 이름 (chipi, jarvis_4 등)
-            device_serial: 디바이스 시리얼 (DB 컨텍스트 추가용, 선택사항)
+            turn_context: _await_context()로 받은 사용자/디바이스/센서 데이터 (없으면 None)
+
+        Returns:
+            str: 최종 시스템 프롬프트
         """
         # 0. 최근 사용자 메시지 가져오기
-        last_user_msg = ""
-        for msg in reversed(self.messages):
-            if msg.get("role") == "user":
-                last_user_msg = msg.get("content", "").lower()
-                break
+        last_user_msg = self._last_user_message()
+
+        final_system_prompt = self._build_system_prompt(ai_name, last_user_msg, turn_context)
+
+        # 3. 시스템 메시지 처리
+        # 현재 메시지 목록에 시스템 메시지가 없거나, 다른 페르소나의 메시지일 수 있으므로
+        # 가장 첫 번째 메시지가 system인지 확인하고 교체하거나 추가합니다.
+        if self.messages and self.messages[0].get("role") == "system":
+            self.messages[0] = {"role": "system", "content": final_system_prompt}
+        else:
+            self.messages.insert(0, {"role": "system", "content": final_system_prompt})
 
+        return final_system_prompt
+
+    def _build_system_prompt(self, ai_name, last_user_msg, turn_context):
+        """사용자 발화와 DB 컨텍스트로 이번 턴의 시스템 프롬프트 생성 (self.messages는 건드리지 않음)
+
+        Args:
+            ai_name: AI 페르소나 이름
+            last_user_msg: 마지막 사용자 발화 (소문자)
+            turn_context: 사용자/디바이스/센서 데이터 (없으면 None)
+
+        Returns:
+            str: 최종 시스템 프롬프트
+        """
         # 0-1. 특정 상황 감지 및 시스템 프롬프트 수정 (LLM이 다양하게 응답하도록)
-        user_name = None
         special_context = ""
+        intents = match_intents(last_user_msg)
+        has_temp_keyword = "temperature" in intents
+        has_humidity_keyword = "humidity" in intents
 
-        if device_serial and self.db_manager:
-            user_info = self.db_manager.get_user_by_device_serial(device_serial)
-            user_name = user_info.get('name') if user_info else None
+        # 0-2. 선택된 AI의 시스템 프롬프트 가져오기
+        system_prompt = self.system_prompts.get(
+            ai_name, "You are a helpful assistant. Respond in Korean."
+        )
+
+        user = turn_context.get("user") if turn_context else None
+        user_name = user.get('name') if user else None
+        sensor_data = turn_context.get("sensor") if turn_context else None
 
         # 물 주기 표현 감지
-        if any(k in last_user_msg for k in ["물 줄게", "물 줘", "물을 줄게", "물을 줘"]):
+        if "water" in intents:
             special_context += "## 특별 상황: user가 물을 주려고 해!\n감사를 표현하고 user의 건강을 먼저 생각해줘. 다양하게 응답해.\n"
 
         # 온도 질문 감지 ("온도 어때?", "지금 온도?" 등)
-        has_temp_keyword = any(k in last_user_msg for k in ["온도", "따뜻", "더워", "추워"])
-        if has_temp_keyword and "습도" not in last_user_msg:
-            sensor_data = self.db_manager.get_sensor_data_by_serial(device_serial)
+        if has_temp_keyword and not has_humidity_keyword:
             if sensor_data and sensor_data.get('temperature') is not None:
                 temp = sensor_data.get('temperature')
                 special_context += f"## 특별 상황: user가 온도를 묻고 있어!\n현재 온도는 {temp}도야. 이 정보를 바탕으로 다양하게 응답해.\n"
 
         # 습도 질문 감지 ("습도 어때?", "지금 습도?" 등)
-        has_humidity_keyword = any(k in last_user_msg for k in ["습도", "건조", "말라"])
-        if has_humidity_keyword and "온도" not in last_user_msg:
-            sensor_data = self.db_manager.get_sensor_data_by_serial(device_serial)
+        if has_humidity_keyword and not has_temp_keyword:
             if sensor_data and sensor_data.get('humidity') is not None:
                 humidity = sensor_data.get('humidity')
                 special_context += f"## 특별 상황: user가 습도를 묻고 있어!\n현재 습도는 {humidity}%야. 이 정보를 바탕으로 다양하게 응답해.\n"
 
-        # 1. 선택된 AI의 시스템 프롬프트 가져오기
-        system_prompt = self.system_prompts.get(
-            ai_name, "You are a helpful assistant. Respond in Korean."
-        )
-
-        # 2. DB 컨텍스트 추가 (device_serial이 있을 경우)
+        # 1. DB 컨텍스트 추가 (위에서 조회한 데이터로 문자열만 생성)
         db_context = ""
-        if device_serial and self.db_manager:
-            # 온도 또는 습도만 묻는지 확인
-            has_temp_keyword = any(k in last_user_msg for k in ["온도", "따뜻", "더워", "추워"])
-            has_humidity_keyword = any(k in last_user_msg for k in ["습도", "건조", "말라"])
-
-            db_context, user_name = self.db_manager.build_context(device_serial,
-                                                                    only_temperature=has_temp_keyword and not has_humidity_keyword,
-                                                                    only_humidity=has_humidity_keyword and not has_temp_keyword)
+        if turn_context:
+            db_context = self.db_manager.format_context(turn_context,
+                                                        only_temperature=has_temp_keyword and not has_humidity_keyword,
+                                                        only_humidity=has_humidity_keyword and not has_temp_keyword)
 
         # 최종 시스템 프롬프트 (DB 정보 포함)
         final_system_prompt = system_prompt
@@ -181,77 +414,280 @@ class ChipiBrain:
         # 사용자 이름으로 "user" 치환 (없으면 "user" 유지)
         if user_name:
             final_system_prompt = final_system_prompt.replace("user", user_name)
-            print(f"📝 사용자 호칭: {user_name}")
+            logger.debug(f"📝 사용자 호칭: {user_name}")
         else:
-            print(f"📝 사용자 호칭: user (기본값)")
+            logger.debug("📝 사용자 호칭: user (기본값)")
 
         if db_context:
             final_system_prompt += f"\n\n## 사용자 컨텍스트\n{db_context}"
-            print(f"📝 DB 컨텍스트 추가됨 (길이: {len(db_context)}자)")
+            logger.debug(f"📝 DB 컨텍스트 추가됨 (길이: {len(db_context)}자)")
         else:
-            print(f"⚠️  DB 컨텍스트 없음")
+            logger.debug("⚠️  DB 컨텍스트 없음")
 
         # special_context 추가 (특별 상황 처리)
         if special_context:
             final_system_prompt += f"\n\n{special_context}"
-            print(f"📝 특별 상황 감지됨")
+            logger.debug("📝 특별 상황 감지됨")
         else:
             # special_context가 없으면 일반 대화 모드 강조
             final_system_prompt += "\n\n## 일반 대화 모드\nuser와 자연스럽게 대화해. 친근하게 질문하고 관심 보여줘."
-            print(f"📝 일반 대화 모드")
+            logger.debug("📝 일반 대화 모드")
 
-        # 3. 시스템 메시지 처리
-        # 현재 메시지 목록에 시스템 메시지가 없거나, 다른 페르소나의 메시지일 수 있으므로
-        # 가장 첫 번째 메시지가 system인지 확인하고 교체하거나 추가합니다.
-        if self.messages and self.messages[0].get("role") == "system":
-            self.messages[0] = {"role": "system", "content": final_system_prompt}
-        else:
-            self.messages.insert(0, {"role": "system", "content": final_system_prompt})
+        return final_system_prompt
 
-        try:
-            print(f"📤 API 요청 중... (메시지 개수: {len(self.messages)})")
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=self.messages,
-                max_tokens=100,
-                temperature=0.7, # 치피의 감성적인 대화를 위해 약간 높임
-                top_p=1.0,
-            )
+    def wait_run(self, ai_name, device_serial=None):
+        """AI 응답 생성 및 반환
 
-            print(f"📥 API 응답 받음:")
-            print(f"   - choices 개수: {len(response.choices)}")
-            print(f"   - finish_reason: {response.choices[0].finish_reason}")
+        Args:
+            ai_name: AI 페르소나 이름 (chipi, jarvis_4 등)
+            device_serial: 디바이스 시리얼 (DB 컨텍스트 추가용, 선택사항)
+        """
+        with tracer.span("brain.prepare") as attrs:
+            # DB 조회 결과 기다리기 (마감 시간 초과 시 이전 컨텍스트)
+            turn_context = self._await_context(device_serial)
+            cache_key, cached_reply = None, self._fast_reply(ai_name, device_serial, turn_context)
+            attrs["fast_path"] = cached_reply is not None
+            if cached_reply is None:
+                cache_key, cached_reply = self._lookup_cache(ai_name, turn_context)
+                attrs["cached"] = cached_reply is not None
+            if cached_reply is None:
+                final_system_prompt = self._prepare_messages(ai_name, turn_context)
+                request_messages = self._request_messages()
+
+        if cached_reply is not None:
+            self._append_message("assistant", cached_reply)
+            self.save_memory()
+            self._refresh_summary_async()
+            return cached_reply
+
+        try:
+            logger.debug(f"📤 API 요청 중... (메시지 개수: {len(request_messages)})")
+            with tracer.span("llm.create", stream=False):
+                response = self.client.chat.completions.create(
+                    model=self.deployment_name,
+                    messages=request_messages,
+                    max_tokens=100,
+                    temperature=0.7, # 치피의 감성적인 대화를 위해 약간 높임
+                    top_p=1.0,
+                )
+
+            logger.debug(f"📥 API 응답 받음: choices {len(response.choices)}개, "
+                         f"finish_reason: {response.choices[0].finish_reason}")
 
             # 콘텐츠 필터 체크
             if hasattr(response.choices[0], 'content_filter_results') and response.choices[0].content_filter_results:
-                print(f"   - content_filter_results: {response.choices[0].content_filter_results}")
+                logger.debug(f"   - content_filter_results: {response.choices[0].content_filter_results}")
 
             assistant_message = response.choices[0].message.content
-            print(f"✓ 응답 메시지: {assistant_message}")
+            logger.debug(f"✓ 응답 메시지: {assistant_message}")
 
             # 응답이 None인 경우 처리
             if assistant_message is None:
-                print("⚠️  응답이 None입니다! (content 값이 비어있음)")
+                logger.warning("⚠️  응답이 None입니다! (content 값이 비어있음)")
                 if response.choices[0].finish_reason == 'content_filter':
-                    print("   → 원인: Azure 콘텐츠 필터 (안전 정책 위반)")
-                print(f"   전체 message 객체: {response.choices[0].message}")
+                    logger.warning("   → 원인: Azure 콘텐츠 필터 (안전 정책 위반)")
+                logger.debug(f"   전체 message 객체: {response.choices[0].message}")
                 assistant_message = "어, 지금은 잘 모르겠어. 잠시만 기다려줄래?"
+            elif cache_key is not None:
+                self.response_cache.store(cache_key, self._last_user_message(), assistant_message)
 
             # 응답 추가 및 저장
-            self.messages.append({"role": "assistant", "content": assistant_message})
+            self._append_message("assistant", assistant_message)
             self.save_memory()
+            self._refresh_summary_async()
 
             return assistant_message
 
         except Exception as e:
             error_msg = "어, 뭔가 잘못됐나봐. 잠시만 기다려줄래?"
-            print(f"❌ 응답 생성 오류: {e}")
-            print(f"❌ 최종 시스템 프롬프트:\n{final_system_prompt}\n")
-            print(f"❌ 메시지 목록:\n{self.messages}\n")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ 응답 생성 오류: {e}")
+            logger.debug(f"❌ 최종 시스템 프롬프트:\n{final_system_prompt}\n")
+            logger.debug(f"❌ 메시지 목록:\n{self.messages}\n")
             return error_msg
 
+    def stream_run(self, ai_name, device_serial=None):
+        """AI 응답을 토큰이 도착하는 대로 조각 단위로 반환 (제너레이터)
+        응답이 끝나면 wait_run과 동일하게 대화 히스토리에 추가하고 저장함
+
+        Args:
+            ai_name: AI 페르소나 이름 (chipi, jarvis_4 등)
+            device_serial: 디바이스 시리얼 (DB 컨텍스트 추가용, 선택사항)
+
+        Yields:
+            str: 응답 텍스트 조각
+        """
+        with tracer.span("brain.prepare") as attrs:
+            # DB 조회 결과 기다리기 (마감 시간 초과 시 이전 컨텍스트)
+            turn_context = self._await_context(device_serial)
+            cache_key, cached_reply = None, self._fast_reply(ai_name, device_serial, turn_context)
+            attrs["fast_path"] = cached_reply is not None
+            if cached_reply is None:
+                cache_key, cached_reply = self._lookup_cache(ai_name, turn_context)
+                attrs["cached"] = cached_reply is not None
+            if cached_reply is None:
+                final_system_prompt = self._prepare_messages(ai_name, turn_context)
+                request_messages = self._request_messages()
+
+        if cached_reply is not None:
+            # 빠른 응답/모아둔 응답은 한 번에 (SuperTone 음성 캐시에도 같은 문장이 있으면 합성 없이 재생)
+            try:
+                yield cached_reply
+            finally:
+                self._append_message("assistant", cached_reply)
+                self.save_memory()
+                self._refresh_summary_async()
+            return
+
+        pieces = []
+
+        # 제너레이터라 with 블록 대신 직접 재서 기록 (첫 토큰까지 / 전체 스트림)
+        turn_id = tracer.turn_id
+        start = time.perf_counter()
+
+        try:
+            logger.debug(f"📤 API 스트리밍 요청 중... (메시지 개수: {len(request_messages)})")
+            stream = self.client.chat.completions.create(
+                model=self.deployment_name,
+                messages=request_messages,
+                max_tokens=100,
+                temperature=0.7,
+                top_p=1.0,
+                stream=True,
+            )
+
+            finish_reason = None
+            for chunk in stream:
+                # Azure는 첫 청크에 프롬프트 필터 결과만 담아 보냄 (choices 비어 있음)
+                if not chunk.choices:
+                    continue
+
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+                delta = choice.delta.content if choice.delta else None
+                if delta:
+                    if not pieces:
+                        tracer.record("llm.first_token", time.perf_counter() - start, turn_id=turn_id)
+                    pieces.append(delta)
+                    yield delta
+
+            tracer.record("llm.stream", time.perf_counter() - start, turn_id=turn_id, finish_reason=finish_reason)
+            logger.debug(f"📥 스트리밍 완료 (finish_reason: {finish_reason})")
+
+            if not pieces:
+                logger.warning("⚠️  응답이 비어있습니다!")
+                if finish_reason == 'content_filter':
+                    logger.warning("   → 원인: Azure 콘텐츠 필터 (안전 정책 위반)")
+                pieces.append("어, 지금은 잘 모르겠어. 잠시만 기다려줄래?")
+                yield pieces[-1]
+            elif cache_key is not None:
+                self.response_cache.store(cache_key, self._last_user_message(), "".join(pieces))
+
+        except GeneratorExit:
+            # 사용자가 끼어들어 재생이 중단됨 - LLM 스트림을 닫고 여기까지 만든 응답만 기록
+            tracer.record("llm.stream", time.perf_counter() - start, turn_id=turn_id, interrupted=True)
+            logger.info(f"✋ 응답 중단 (조각 {len(pieces)}개까지 생성)")
+            if hasattr(stream, "close"):
+                stream.close()
+            if pieces:
+                self._append_message("assistant", "".join(pieces))
+                self.save_memory()
+                self._refresh_summary_async()
+            raise
+
+        except Exception as e:
+            logger.exception(f"❌ 응답 생성 오류: {e}")
+            logger.debug(f"❌ 최종 시스템 프롬프트:\n{final_system_prompt}\n")
+
+            # 이미 일부를 말했다면 그 부분까지만 응답으로 기록
+            if not pieces:
+                yield "어, 뭔가 잘못됐나봐. 잠시만 기다려줄래?"
+                return
+
+        assistant_message = "".join(pieces)
+        logger.debug(f"✓ 응답 메시지: {assistant_message}")
+
+        # 응답 추가 및 저장
+        self._append_message("assistant", assistant_message)
+        self.save_memory()
+        self._refresh_summary_async()
+
+    def draft_run(self, user_text, ai_name, device_serial=None, cancel=None):
+        """중간 인식 결과로 응답을 미리 생성 (대화 히스토리는 바꾸지 않음, 맞으면 commit_draft로 확정)
+        다른 스레드에서 실행되므로 self.messages 복사본으로 요청을 만듦
+
+        Args:
+            user_text: 아직 확정되지 않은 사용자 발화
+            ai_name: AI 페르소나 이름
+            device_serial: 디바이스 시리얼 (선택사항)
+            cancel: threading.Event (set되면 스트림을 닫고 None 반환)
+
+        Returns:
+            str: 미리 만든 응답 또는 None (취소/오류, LLM 없이 답할 발화)
+        """
+        history = [msg for msg in self.messages if msg.get("role") != "system"]
+        history.append({"role": "user", "content": user_text})
+
+        try:
+            with tracer.span("llm.speculative") as attrs:
+                turn_context = self._await_context(device_serial, peek=True)
+                # 빠른 응답/응답 캐시로 답할 말이면 LLM을 부르지 않음 (최종 결과가 나오면 그쪽으로 바로 답함)
+                if self._answers_locally(user_text, ai_name, device_serial, turn_context):
+                    attrs["local"] = True
+                    return None
+
+                final_system_prompt = self._build_system_prompt(ai_name, user_text.lower(), turn_context)
+                request_messages, _ = self.context_window.fit(
+                    [{"role": "system", "content": final_system_prompt}] + history, record_dropped=False)
+
+                stream = self.client.chat.completions.create(
+                    model=self.deployment_name,
+                    messages=request_messages,
+                    max_tokens=100,
+                    temperature=0.7,
+                    top_p=1.0,
+                    stream=True,
+                )
+
+                pieces = []
+                try:
+                    for chunk in stream:
+                        if cancel is not None and cancel.is_set():
+                            attrs["cancelled"] = True
+                            return None
+                        if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                            pieces.append(chunk.choices[0].delta.content)
+                finally:
+                    if hasattr(stream, "close"):
+                        stream.close()
+        except Exception as e:
+            logger.error(f"❌ 미리 응답 생성 오류: {e}")
+            return None
+
+        return "".join(pieces) or None
+
+    def commit_draft(self, user_text, reply, history_version):
+        """
+        미리 만든 응답을 이번 턴 응답으로 확정 (wait_run과 동일하게 히스토리에 추가하고 저장)
+
+        Args:
+            user_text: 최종 인식된 사용자 발화
+            reply: draft_run() 결과
+            history_version: draft_run()을 시작할 때의 self.history_version
+
+        Returns:
+            bool: 그 사이 대화가 바뀌어서 확정하지 못했으면 False
+        """
+        if history_version != self.history_version:
+            return False
+
+        self._append_message("user", user_text)
+        self._append_message("assistant", reply)
+        self.save_memory()
+        self._refresh_summary_async()
+        return True
+
     # def _generate_continuation(self, ai_name, device_serial, system_prompt):
     #     """대화 이어가기용 내부 메서드 (후속 질문/제안 생성)
     #     [대화 이어가기는 system prompt에 포함되어 자동으로 동작함]
@@ -358,13 +794,22 @@ class ChipiBrain:
     #         print(f"❌ 대화 이어가기 오류: {e}")
     #         return ""
 
-    def __del__(self):
-        """소멸자: 데이터베이스 연결 종료"""
-        if hasattr(self, 'db_manager') and self.db_manager:
+    def close(self):
+        """저장 안 된 대화를 저장하고, 직접 만든 미리 조회 스레드/DB 연결만 종료 (공유받은 것은 그대로 둠)"""
+        if getattr(self, '_unsaved', None):
+            self.save_memory()
+        if hasattr(self, '_executor') and self._owns_executor:
+            self._executor.shutdown(wait=False)
+        if getattr(self, 'db_manager', None) and self._owns_db:
             try:
                 self.db_manager.close()
             except:
                 pass
+            self.db_manager = None
+
+    def __del__(self):
+        """소멸자: 미리 조회 스레드 및 데이터베이스 연결 종료"""
+        self.close()
 
 
 # ==========================================
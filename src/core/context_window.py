@@ -0,0 +1,151 @@
+import threading
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from src.core.logger import get_logger
+
+logger = get_logger("brain")
+
+
+class TokenCounter:
+    """로컬 토크나이저로 토큰 수 계산 (tiktoken이 없으면 근사치)"""
+
+    # 메시지 하나당 role/구분자에 붙는 추가 토큰 (OpenAI chat 포맷 기준)
+    MESSAGE_OVERHEAD = 4
+
+    def __init__(self, model="gpt-4o"):
+        """
+        초기화
+
+        Args:
+            model: 토크나이저를 고를 모델 이름
+        """
+        self.encoding = None
+        if tiktoken:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def count(self, text):
+        """
+        텍스트의 토큰 수
+
+        Args:
+            text: 텍스트
+
+        Returns:
+            int: 토큰 수
+        """
+        if not text:
+            return 0
+        if self.encoding:
+            return len(self.encoding.encode(text))
+
+        # 근사치: 영문/숫자는 4글자당 1토큰, 한글 등은 글자당 1토큰 (넉넉하게 계산)
+        ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+        return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+    def count_message(self, message):
+        return self.count(message.get("content") or "") + self.MESSAGE_OVERHEAD
+
+
+class ContextWindow:
+    """토큰 예산 안에서 시스템 프롬프트 + 최근 대화만 보내고, 밀려난 대화는 요약으로 접음"""
+
+    def __init__(self, budget_tokens, counter, summarize=None):
+        """
+        초기화
+
+        Args:
+            budget_tokens: 요청 한 번에 보낼 최대 프롬프트 토큰 수
+            counter: TokenCounter
+            summarize: (이전 요약, 밀려난 메시지 리스트) -> 새 요약 함수 (None이면 요약 없이 버림)
+        """
+        self.budget_tokens = budget_tokens
+        self.counter = counter
+        self.summarize = summarize
+        self.summary = ""
+
+        self._pending = []  # 아직 요약에 반영하지 않은 밀려난 메시지
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()  # 요약 갱신은 한 번에 하나씩 (이전 요약 위에 이어 쌓도록)
+
+    def _summary_message(self):
+        if not self.summary:
+            return None
+        return {"role": "system", "content": f"## 이전 대화 요약\n{self.summary}"}
+
+    def fit(self, messages, record_dropped=True):
+        """
+        예산에 맞게 요청 메시지 구성
+
+        Args:
+            messages: [시스템 메시지, 대화 히스토리...] (맨 앞이 system이 아니어도 됨)
+            record_dropped: False면 밀려난 메시지를 요약 대기열에 넣지 않음 (미리 응답 생성처럼 히스토리를 바꾸지 않는 요청용)
+
+        Returns:
+            tuple: (요청에 보낼 메시지 리스트, 남겨둘 대화 히스토리)
+                   남겨두지 않은 앞부분은 다음 refresh_summary() 때 요약에 반영됨
+        """
+        if messages and messages[0].get("role") == "system":
+            head, history = [messages[0]], messages[1:]
+        else:
+            head, history = [], list(messages)
+
+        with self._lock:
+            summary_message = self._summary_message()
+
+        if summary_message:
+            head.append(summary_message)
+
+        used = sum(self.counter.count_message(m) for m in head)
+
+        # 최신 메시지부터 거꾸로 예산이 허락하는 만큼 (마지막 메시지는 항상 포함)
+        keep_from = len(history)
+        for i in range(len(history) - 1, -1, -1):
+            cost = self.counter.count_message(history[i])
+            if used + cost > self.budget_tokens and i < len(history) - 1:
+                break
+            used += cost
+            keep_from = i
+
+        dropped, kept = history[:keep_from], history[keep_from:]
+        if dropped and record_dropped:
+            with self._lock:
+                self._pending.extend(dropped)
+
+        return head + kept, kept
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def refresh_summary(self):
+        """밀려난 메시지를 기존 요약에 이어서 반영 (새로 밀려난 부분만 요약하므로 증분 갱신)"""
+        with self._refresh_lock:
+            self._refresh_summary()
+
+    def _refresh_summary(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            previous = self.summary
+
+        if not pending or not self.summarize:
+            return
+
+        try:
+            summary = self.summarize(previous, pending)
+        except Exception as e:
+            logger.warning(f"⚠️  대화 요약 오류: {e}")
+            summary = None
+
+        with self._lock:
+            if summary:
+                self.summary = summary
+            else:
+                # 실패하면 다음 번에 다시 시도 (계속 실패해도 무한정 쌓이지 않게 제한)
+                self._pending = (pending + self._pending)[-200:]
@@ -0,0 +1,157 @@
+import os
+import json
+import tempfile
+import threading
+
+from src.core.logger import get_logger
+
+logger = get_logger("brain")
+
+
+class ConversationLog:
+    """대화 히스토리를 JSON Lines로 이어 쓰는 저널 (턴마다 새 메시지만 추가)"""
+
+    def __init__(self, path, max_entries=1000, compact_every=200, legacy_path=None):
+        """
+        초기화
+
+        Args:
+            path: 저널 파일 경로 (.jsonl)
+            max_entries: 압축 후 남길 최대 메시지 수
+            compact_every: 저널이 max_entries보다 이만큼 길어지면 압축 (오래된 메시지 정리)
+            legacy_path: 예전 "role:content" 형식 파일 (저널이 없을 때 한 번만 옮겨옴)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+
+        if legacy_path and not os.path.exists(self.path) and os.path.exists(legacy_path):
+            self._migrate_legacy(legacy_path)
+
+        # 압축 기준은 이 프로세스가 추가한 수가 아니라 파일 전체 줄 수
+        # (자주 재시작하는 디바이스도 저널이 끝없이 커지지 않도록, 열 때 이미 길면 바로 압축)
+        self._lines = self._count_lines()
+        if self._lines > self.max_entries:
+            with self._lock:
+                self._compact()
+
+    def _count_lines(self):
+        """저널의 줄 수 (파일이 없으면 0)"""
+        if not os.path.exists(self.path):
+            return 0
+        count = 0
+        with open(self.path, "rb") as f:
+            for block in iter(lambda: f.read(65536), b""):
+                count += block.count(b"\n")
+        return count
+
+    def _migrate_legacy(self, legacy_path):
+        """예전 memory.txt 형식을 저널로 변환"""
+        messages = []
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if ":" in line:
+                        # 첫 번째 콜론만 분리 (내용에 콜론이 있을 수 있으므로)
+                        role, content = line.split(":", 1)
+                        messages.append({"role": role.strip(), "content": content.strip()})
+        except Exception as e:
+            logger.error(f"❌ 히스토리 변환 오류: {e}")
+            return
+
+        self._rewrite(messages[-self.max_entries:])
+        logger.info(f"📝 {legacy_path} → {self.path} 변환 완료 ({len(messages)}개)")
+
+    def append(self, messages):
+        """
+        메시지 추가 (파일 끝에 한 줄씩 이어 씀)
+
+        Args:
+            messages: {"role", "content"} 딕셔너리 리스트
+        """
+        if not messages:
+            return
+
+        # 줄바꿈은 JSON 안에서 \n으로 이스케이프되므로 내용이 그대로 보존됨
+        data = "".join(json.dumps(msg, ensure_ascii=False) + "\n" for msg in messages)
+
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+
+            self._lines += len(messages)
+            if self._lines >= self.max_entries + self.compact_every:
+                self._compact()
+
+    def load_tail(self, n):
+        """
+        마지막 n개 메시지만 읽기 (파일 끝에서부터 필요한 만큼만 seek)
+
+        Args:
+            n: 읽을 메시지 수
+
+        Returns:
+            list: 메시지 리스트 (오래된 것부터)
+        """
+        if n <= 0 or not os.path.exists(self.path):
+            return []
+
+        block_size = 8192
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+
+            # 온전한 줄 n개가 확보될 때까지 뒤에서부터 블록 단위로 읽음
+            while pos > 0 and data.count(b"\n") <= n:
+                read_size = min(block_size, pos)
+                pos -= read_size
+                f.seek(pos)
+                data = f.read(read_size) + data
+
+        lines = data.split(b"\n")
+        if pos > 0:
+            lines = lines[1:]  # 잘린 첫 줄 제외
+
+        messages = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                msg = json.loads(line.decode("utf-8"))
+            except (ValueError, UnicodeDecodeError):
+                continue  # 쓰다가 끊긴 줄은 건너뜀
+            if isinstance(msg, dict) and "role" in msg and "content" in msg:
+                messages.append(msg)
+
+        return messages[-n:]
+
+    def _compact(self):
+        """최근 max_entries개만 남기고 파일을 새로 씀 (호출 전 lock 필요)"""
+        messages = self.load_tail(self.max_entries)
+        self._rewrite(messages)
+        self._lines = len(messages)
+
+    def _rewrite(self, messages):
+        """임시 파일에 쓴 뒤 교체 (중간에 끊겨도 기존 저널 유지)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for msg in messages:
+                    f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+            os.replace(temp_path, self.path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def clear(self):
+        """저널 비우기"""
+        with self._lock:
+            with open(self.path, "w", encoding="utf-8"):
+                pass
+            self._lines = 0
@@ -0,0 +1,161 @@
+import os
+import sys
+import random
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.intent_matcher import is_question, match_intents, normalize
+from src.core.logger import get_logger
+
+logger = get_logger("fast_path")
+
+# 치피 말투 문장 틀 (가중치, 문장) - {value}는 센서 값
+# 상황: get_plant_status()의 issues 기준 (good / cold / hot / dry)
+DEFAULT_TEMPLATES = {
+    "temperature": {
+        "good": [
+            (3, "지금 {value}도야! 딱 좋아~"),
+            (2, "{value}도! 나 지금 기분 최고야."),
+            (1, "온도는 {value}도. 이 정도면 완전 쾌적해!"),
+        ],
+        "cold": [
+            (3, "{value}도야... 나 좀 추워. 따뜻한 데로 옮겨줄래?"),
+            (2, "으슬으슬해, 지금 {value}도밖에 안 돼."),
+            (1, "{value}도라서 잎이 움츠러들 것 같아. 조금만 따뜻하게 해줘!"),
+        ],
+        "hot": [
+            (3, "지금 {value}도야. 너무 더워~ 시원한 데로 옮겨줄래?"),
+            (2, "{value}도라니, 나 녹을 것 같아!"),
+            (1, "헉헉, {value}도야. 바람 좀 쐬고 싶어."),
+        ],
+    },
+    "humidity": {
+        "good": [
+            (3, "습도는 {value}%야! 촉촉해서 좋아~"),
+            (2, "지금 {value}%! 딱 알맞아."),
+            (1, "{value}%라서 잎이 반질반질해!"),
+        ],
+        "dry": [
+            (3, "습도가 {value}%밖에 안 돼... 나 목말라!"),
+            (2, "{value}%야. 너무 건조해, 물 좀 줄래?"),
+            (1, "바싹 마를 것 같아. 지금 {value}%야."),
+        ],
+    },
+    # 묻지 않은 쪽에 문제가 있을 때 덧붙이는 말 (get_plant_status의 issues)
+    "hint": {
+        "너무 추워": [(1, "근데 나 조금 추워.")],
+        "너무 더워": [(1, "근데 좀 덥긴 해.")],
+        "목이 말라": [(2, "근데 나 목말라!"), (1, "아, 그리고 물 좀 줄래?")],
+    },
+}
+
+# 여러 가지를 한꺼번에 묻거나 이유를 묻거나 무언가를 해달라는 말 (LLM으로 넘김)
+COMPOUND_MARKERS = ["그리고", "하고", "근데", "랑", "또", "왜", "어떻게", "뭐해", "기억",
+                    "올려", "내려", "높여", "낮춰", "사줄", "사 줄", "켜", "꺼"]
+
+_ISSUE_STATES = {"너무 추워": "cold", "너무 더워": "hot", "목이 말라": "dry"}
+_INTENT_ISSUES = {"temperature": ("너무 추워", "너무 더워"), "humidity": ("목이 말라",)}
+
+
+def _format_value(value):
+    """23.0 → "23", 23.45 → "23.5" """
+    value = round(float(value), 1)
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+class FastPathResponder:
+    """온도/습도만 묻는 짧은 질문은 LLM 없이 센서 값과 식물 상태로 문장 틀을 골라 바로 답함
+    디바이스별로 켜고(CHIPI_FAST_PATH_DEVICES), 여러 가지를 묻거나 묻는 말이 아니면 None을 돌려줘서 LLM으로 넘김
+    """
+
+    def __init__(self, devices=None, templates=None, max_chars=None, ai_names=("chipi",)):
+        """
+        초기화
+
+        Args:
+            devices: 켤 디바이스 시리얼 목록 ("*"면 전부, 기본값: env의 CHIPI_FAST_PATH_DEVICES, 쉼표 구분)
+            templates: 문장 틀 (기본값: DEFAULT_TEMPLATES)
+            max_chars: 정규화 후 이보다 긴 발화는 LLM으로 (기본값: env의 CHIPI_FAST_PATH_MAX_CHARS 또는 12)
+            ai_names: 문장 틀 말투가 맞는 페르소나
+        """
+        if devices is None:
+            devices = [d.strip() for d in os.getenv("CHIPI_FAST_PATH_DEVICES", "").split(",") if d.strip()]
+        self.devices = set(devices)
+        self.templates = templates or DEFAULT_TEMPLATES
+        self.max_chars = max_chars or int(os.getenv("CHIPI_FAST_PATH_MAX_CHARS", "12"))
+        self.ai_names = set(ai_names)
+        self._markers = [normalize(marker) for marker in COMPOUND_MARKERS]
+        self._last = {}  # (의도, 상황) -> 마지막으로 고른 문장 (연속으로 같은 말을 하지 않도록)
+
+    def enabled_for(self, device_serial):
+        """이 디바이스에서 빠른 응답을 쓰는지"""
+        return bool(device_serial) and ("*" in self.devices or device_serial in self.devices)
+
+    def _pick(self, key, choices):
+        """가중치대로 하나 고르기 (바로 전에 고른 문장은 다른 후보가 있으면 제외)"""
+        last = self._last.get(key)
+        candidates = [(weight, text) for weight, text in choices if text != last] or choices
+        text = random.choices([text for _, text in candidates], weights=[weight for weight, _ in candidates])[0]
+        self._last[key] = text
+        return text
+
+    def _question_intent(self, text, ai_name, sensor_data, plant_status):
+        """빠른 응답으로 답할 질문이면 그 의도(temperature/humidity), 아니면 None"""
+        if ai_name not in self.ai_names or not sensor_data or not plant_status:
+            return None
+        if plant_status.get("status") == "unknown":
+            return None
+
+        norm = normalize(text or "")
+        if not norm or len(norm.replace(" ", "")) > self.max_chars:
+            return None
+        if any(marker in norm for marker in self._markers):
+            return None
+        # 센서 값을 묻는 말일 때만 ("온도 좀 올려줘", "나 추워", "습도 신경 쓸게"는 LLM으로)
+        if not is_question(text):
+            return None
+
+        # 온도나 습도 하나만 물어야 함 (둘 다 묻거나 물 주기 등이 섞이면 LLM으로)
+        intents = match_intents(text)
+        if len(intents) != 1:
+            return None
+        intent = next(iter(intents))
+        if intent not in _INTENT_ISSUES or sensor_data.get(intent) is None:
+            return None
+        return intent
+
+    def handles(self, text, ai_name, sensor_data, plant_status):
+        """respond()가 응답을 만들 발화인지 (문장은 고르지 않음, 인자는 respond()와 같음)"""
+        return self._question_intent(text, ai_name, sensor_data, plant_status) is not None
+
+    def respond(self, text, ai_name, sensor_data, plant_status):
+        """
+        빠른 응답 만들기
+
+        Args:
+            text: 사용자 발화
+            ai_name: AI 페르소나 이름
+            sensor_data: 최신 센서 데이터 (temperature, humidity)
+            plant_status: get_plant_status() 결과 (issues 사용)
+
+        Returns:
+            str: 응답 문장 또는 None (LLM으로 처리할 것)
+        """
+        intent = self._question_intent(text, ai_name, sensor_data, plant_status)
+        if intent is None:
+            return None
+
+        issues = plant_status.get("issues") or []
+        state = next((_ISSUE_STATES[issue] for issue in issues if issue in _INTENT_ISSUES[intent]), "good")
+        reply = self._pick((intent, state), self.templates[intent][state]).format(
+            value=_format_value(sensor_data[intent]))
+
+        # 묻지 않은 쪽 문제도 한마디
+        for issue in issues:
+            if issue not in _INTENT_ISSUES[intent] and issue in self.templates["hint"]:
+                reply += " " + self._pick(("hint", issue), self.templates["hint"][issue])
+                break
+
+        logger.debug(f"⚡ 빠른 응답 ({intent}/{state}): {reply}")
+        return reply
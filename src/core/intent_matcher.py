@@ -0,0 +1,123 @@
+import re
+
+# 의도별 키워드 사전 (키워드 안의 공백은 있어도 없어도 매칭, 그 밖에는 단어 경계를 넘어 매칭하지 않음)
+DEFAULT_INTENTS = {
+    "exit": ["종료", "그만", "꺼져"],
+    "sad": ["죽고", "자살", "끝내고", "절망", "극도로 힘들", "살기 싫", "뛰어내리"],
+    "water": ["물 줄게", "물 줘", "물을 줄게", "물을 줘"],
+    "temperature": ["온도", "따뜻", "더워", "추워"],
+    "humidity": ["습도", "건조", "말라"],
+    "greeting": ["안녕", "반가워", "좋은 아침", "잘 잤"],
+}
+
+# 무언가를 묻는 표현 (is_question에서 사용)
+QUESTION_WORDS = ["어때", "몇 도", "몇 퍼", "얼마", "알려 줘", "말해 줘", "궁금"]
+# 묻는 말 어미 (문장 끝)
+QUESTION_ENDINGS = ("니", "냐", "나요", "까", "까요", "죠", "어때요")
+
+# 한글/영문/숫자 외의 공백·문장부호
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    """
+    키워드 비교용 정규화 (공백/문장부호를 공백 하나로, 소문자)
+    단어 경계는 남겨둠 - 지우면 "그 만화"가 "그만"(종료)으로 잡힘
+
+    Args:
+        text: 원문
+
+    Returns:
+        str: 정규화된 텍스트
+    """
+    return _NON_WORD.sub(" ", text).strip().lower()
+
+
+class IntentMatcher:
+    """모든 의도 키워드를 정규식 하나로 컴파일해 발화를 한 번만 훑어서 의도를 찾음"""
+
+    def __init__(self, lexicons):
+        """
+        초기화
+
+        Args:
+            lexicons: {의도 이름: [키워드, ...]}
+        """
+        self.lexicons = lexicons
+        self._group_intents = {}
+
+        alternatives = []
+        keywords = []
+        for intent, words in lexicons.items():
+            for word in words:
+                norm = normalize(word)
+                if norm:
+                    keywords.append((norm, intent))
+
+        # 긴 키워드 먼저 (같은 위치에서 "극도로 힘들"이 "극도로"보다 우선)
+        keywords.sort(key=lambda item: len(item[0]), reverse=True)
+        for i, (norm, intent) in enumerate(keywords):
+            group = f"k{i}"
+            self._group_intents[group] = intent
+            # 키워드 안의 공백 자리만 띄어 써도/붙여 써도 매칭 ("물 줄게" = "물줄게")
+            body = r"\s?".join(re.escape(part) for part in norm.split(" "))
+            alternatives.append(f"(?P<{group}>{body})")
+
+        # 전방 탐색으로 감싸서 위치마다 검사 (겹치는 키워드도 놓치지 않음)
+        self._pattern = re.compile(f"(?=(?:{'|'.join(alternatives)}))") if alternatives else None
+
+    def match(self, text):
+        """
+        발화에 들어있는 의도를 모두 찾기
+
+        Args:
+            text: 사용자 발화
+
+        Returns:
+            set: 의도 이름 집합
+        """
+        if not text or self._pattern is None:
+            return set()
+
+        intents = set()
+        for m in self._pattern.finditer(normalize(text)):
+            intents.add(self._group_intents[m.lastgroup])
+        return intents
+
+
+# 시작할 때 한 번만 컴파일
+DEFAULT_MATCHER = IntentMatcher(DEFAULT_INTENTS)
+QUESTION_MATCHER = IntentMatcher({"question": QUESTION_WORDS})
+
+
+def match_intents(text):
+    """
+    기본 키워드 사전으로 의도 찾기
+
+    Args:
+        text: 사용자 발화
+
+    Returns:
+        set: 의도 이름 집합 (exit, sad, water, temperature, humidity, greeting)
+    """
+    return DEFAULT_MATCHER.match(text)
+
+
+def is_question(text):
+    """
+    묻는 말인지 (물음표, "어때"/"몇 도" 같은 표현, 묻는 어미)
+    "온도 좀 올려줘", "나 추워"처럼 키워드만 들어있는 부탁/혼잣말과 구분할 때 사용
+
+    Args:
+        text: 사용자 발화
+
+    Returns:
+        bool
+    """
+    if not text:
+        return False
+    if text.rstrip().endswith("?"):
+        return True
+    if QUESTION_MATCHER.match(text):
+        return True
+    return normalize(text).endswith(QUESTION_ENDINGS)
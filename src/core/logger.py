@@ -0,0 +1,45 @@
+import os
+import sys
+import logging
+import threading
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _configure():
+    """chipi 로거 한 번만 설정 (CHIPI_LOG_LEVEL: DEBUG / INFO / WARNING / ERROR)"""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+
+        level_name = os.getenv("CHIPI_LOG_LEVEL", "INFO").upper()
+        level = getattr(logging, level_name, None)
+        if not isinstance(level, int):
+            level = logging.INFO
+
+        # 기존 print 출력과 같은 모양 (메시지만, 이모지 그대로)
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        root = logging.getLogger("chipi")
+        root.addHandler(handler)
+        root.setLevel(level)
+        root.propagate = False
+        _configured = True
+
+
+def get_logger(name):
+    """
+    모듈별 로거 (print 대신 사용 - 레벨 아래 메시지는 포맷/출력 비용 없이 버려짐)
+    자세한 진행 로그는 debug, 평소 보이던 진행 상황은 info, 문제는 warning/error
+
+    Args:
+        name: 모듈 이름 (예: "brain", "tts.superton")
+
+    Returns:
+        logging.Logger
+    """
+    _configure()
+    return logging.getLogger(f"chipi.{name}")
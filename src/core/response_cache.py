@@ -0,0 +1,214 @@
+import os
+import sys
+import random
+import threading
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.intent_matcher import is_question, match_intents, normalize
+from src.core.logger import get_logger
+from src.database.ttl_cache import TTLCache
+
+logger = get_logger("response_cache")
+
+# 센서 값만 보고 답할 수 있는 짧은 질문만 캐시 (물 주기/슬픔/종료 등은 그때그때 LLM으로)
+CACHEABLE_INTENTS = ("greeting", "temperature", "humidity")
+
+
+def _ngrams(text, n=2):
+    """글자 n-gram 집합 (n보다 짧으면 전체를 하나로)"""
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def ngram_similarity(a, b, n=2):
+    """
+    정규화된 두 발화의 글자 n-gram 자카드 유사도
+
+    Args:
+        a: 정규화된 발화
+        b: 정규화된 발화
+        n: n-gram 길이
+
+    Returns:
+        float: 0 ~ 1
+    """
+    if not a or not b:
+        return 0.0
+    grams_a, grams_b = _ngrams(a, n), _ngrams(b, n)
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+class _ReplyPool:
+    def __init__(self):
+        self.replies = []      # 같은 질문에 대한 서로 다른 응답 (최대 variety개)
+        self.examples = set()  # 이 키로 들어온 정규화된 발화 (유사도 비교용)
+        self.last = None       # 마지막으로 돌려준 응답 (연속으로 같은 말을 하지 않도록)
+
+
+class ResponseCache:
+    """자주 묻는 짧은 질문(인사/온도/습도)의 응답 캐시
+    키는 (의도, 페르소나, 센서 값 구간, 식물 상태) - 센서 값이 구간을 벗어나거나 상태가 바뀌면 다른 키라서 새로 생성
+    키마다 응답을 variety개까지 모은 뒤부터 LLM 없이 그중 하나를 골라 답함 (같은 말만 반복하지 않도록)
+    모인 응답은 ttl이 지나면 통째로 버리고 다시 모음
+    """
+
+    def __init__(self, ttl=None, variety=None, max_chars=None, similarity=None, max_entries=256,
+                 temperature_step=None, humidity_step=None):
+        """
+        초기화
+
+        Args:
+            ttl: 응답 묶음 만료 시간 (초, 기본값: env의 CHIPI_RESPONSE_CACHE_TTL_SEC 또는 600)
+            variety: 키마다 모을 응답 수 (기본값: env의 CHIPI_RESPONSE_CACHE_VARIETY 또는 3)
+            max_chars: 정규화 후 이보다 긴 발화는 캐시하지 않음 (기본값: env의 CHIPI_RESPONSE_CACHE_MAX_CHARS 또는 10)
+            similarity: 키워드가 없는 발화도 이 값 이상 비슷한(글자 2-gram) 예전 발화의 키로 처리
+                        (기본값: env의 CHIPI_RESPONSE_CACHE_SIMILARITY 또는 0 = 사용 안 함)
+            max_entries: 최대 키 수
+            temperature_step: 온도 구간 크기 (도, 기본값: env의 CHIPI_RESPONSE_CACHE_TEMP_STEP 또는 1)
+            humidity_step: 습도 구간 크기 (%, 기본값: env의 CHIPI_RESPONSE_CACHE_HUMIDITY_STEP 또는 5)
+        """
+        self.variety = max(1, variety or int(os.getenv("CHIPI_RESPONSE_CACHE_VARIETY", "3")))
+        self.max_chars = max_chars or int(os.getenv("CHIPI_RESPONSE_CACHE_MAX_CHARS", "10"))
+        self.similarity = (similarity if similarity is not None
+                           else float(os.getenv("CHIPI_RESPONSE_CACHE_SIMILARITY", "0")))
+        self.temperature_step = temperature_step or float(os.getenv("CHIPI_RESPONSE_CACHE_TEMP_STEP", "1"))
+        self.humidity_step = humidity_step or float(os.getenv("CHIPI_RESPONSE_CACHE_HUMIDITY_STEP", "5"))
+
+        self._pools = TTLCache(maxsize=max_entries,
+                               ttl=ttl or float(os.getenv("CHIPI_RESPONSE_CACHE_TTL_SEC", "600")))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _bucket(self, intent, sensor_data):
+        """의도에 해당하는 센서 값 구간 (응답에 센서 값이 들어가는 의도만, 값이 없으면 캐시하지 않음)"""
+        if intent == "greeting":
+            return ()
+
+        field, step = ("temperature", self.temperature_step) if intent == "temperature" \
+            else ("humidity", self.humidity_step)
+        value = sensor_data.get(field) if sensor_data else None
+        if value is None:
+            return None
+        return (field, int(float(value) // step))
+
+    def _key(self, intent, ai_name, sensor_data, plant_status):
+        bucket = self._bucket(intent, sensor_data)
+        if bucket is None:
+            return None
+        # 응답에 식물 상태("목말라" 등)가 섞여 나오므로 상태가 바뀌면 다른 키
+        issues = tuple(sorted(plant_status.get("issues") or [])) if plant_status else ()
+        return (intent, ai_name, bucket, issues)
+
+    def _similar_key(self, text, ai_name, sensor_data, plant_status):
+        """키워드로 의도를 못 찾은 발화를 예전에 캐시한 발화와 비교해 가장 비슷한 키 찾기 (self._lock 안에서 호출)"""
+        best_key, best_score = None, self.similarity
+        for intent in CACHEABLE_INTENTS:
+            key = self._key(intent, ai_name, sensor_data, plant_status)
+            pool = self._pools.get(key) if key else None
+            if pool is None:
+                continue
+            for example in pool.examples:
+                score = ngram_similarity(text, example)
+                if score >= best_score:
+                    best_key, best_score = key, score
+        return best_key
+
+    def _resolve_key(self, text, norm, ai_name, sensor_data, plant_status):
+        """발화의 캐시 키 (캐시할 수 없는 발화면 None, self._lock 안에서 호출)"""
+        if not norm or len(norm.replace(" ", "")) > self.max_chars:
+            return None
+
+        intents = match_intents(text)
+        if len(intents) > 1 or (intents and not intents <= set(CACHEABLE_INTENTS)):
+            # 여러 의도가 섞였거나 캐시하지 않는 의도
+            return None
+
+        if intents:
+            key = self._key(next(iter(intents)), ai_name, sensor_data, plant_status)
+        elif self.similarity > 0:
+            key = self._similar_key(norm, ai_name, sensor_data, plant_status)
+        else:
+            key = None
+        # 센서 질문은 묻는 말일 때만 ("온도 좀 올려줘", "나 추워"에 온도 답을 하지 않도록)
+        if key is not None and key[0] != "greeting" and not is_question(text):
+            return None
+        return key
+
+    def would_hit(self, text, ai_name, sensor_data=None, plant_status=None):
+        """lookup()이 모아둔 응답을 돌려줄 발화인지 (통계/마지막 응답은 바꾸지 않음, 인자는 lookup()과 같음)"""
+        with self._lock:
+            key = self._resolve_key(text, normalize(text or ""), ai_name, sensor_data, plant_status)
+            pool = self._pools.get(key) if key else None
+            return pool is not None and len(pool.replies) >= self.variety
+
+    def lookup(self, text, ai_name, sensor_data=None, plant_status=None):
+        """
+        캐시 조회
+
+        Args:
+            text: 사용자 발화
+            ai_name: AI 페르소나 이름
+            sensor_data: 이번 턴 센서 데이터 (temperature, humidity)
+            plant_status: get_plant_status() 결과 (issues를 키에 포함)
+
+        Returns:
+            (key, reply): key는 캐시할 수 없는 발화면 None, reply는 아직 모인 응답이 부족하면 None
+        """
+        norm = normalize(text or "")
+        with self._lock:
+            key = self._resolve_key(text, norm, ai_name, sensor_data, plant_status)
+            if key is None:
+                return None, None
+
+            pool = self._pools.get(key)
+            if pool is None or len(pool.replies) < self.variety:
+                self.misses += 1
+                return key, None
+
+            choices = [reply for reply in pool.replies if reply != pool.last] or pool.replies
+            reply = random.choice(choices)
+            pool.last = reply
+            pool.examples.add(norm)
+            self.hits += 1
+
+        logger.debug(f"💬 응답 캐시 적중: {key}")
+        return key, reply
+
+    def store(self, key, text, reply):
+        """
+        LLM 응답을 캐시에 추가
+
+        Args:
+            key: lookup()이 돌려준 키
+            text: 사용자 발화
+            reply: LLM 응답
+        """
+        if key is None or not reply:
+            return
+
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _ReplyPool()
+                self._pools.set(key, pool)
+            if reply not in pool.replies and len(pool.replies) < self.variety:
+                pool.replies.append(reply)
+            pool.examples.add(normalize(text))
+            pool.last = reply
+
+    def clear(self):
+        """전체 삭제"""
+        self._pools.clear()
+
+    def stats(self):
+        """
+        캐시 통계
+
+        Returns:
+            dict: {hits, misses, keys}
+        """
+        return {"hits": self.hits, "misses": self.misses, "keys": self._pools.stats()["size"]}
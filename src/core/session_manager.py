@@ -0,0 +1,195 @@
+import os
+import re
+import sys
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.chipi_brain import ChipiBrain, create_llm_client
+from src.core.logger import get_logger
+from src.database.db_manager import DatabaseManager
+
+logger = get_logger("sessions")
+
+
+class DeviceSession:
+    """디바이스 하나의 대화 상태 (같은 디바이스의 요청은 lock으로 한 번에 하나씩 처리)"""
+
+    def __init__(self, serial, brain):
+        self.serial = serial
+        self.brain = brain
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.closed = False  # 내려진 세션 (가져온 직후 내려졌으면 다시 가져와야 함)
+
+
+class SessionManager:
+    """여러 디바이스의 ChipiBrain을 관리 (LLM 클라이언트/DB 풀/스레드는 공유, 대화 히스토리는 디바이스별 파일)
+    활성 세션 수가 max_sessions를 넘거나 오래 쉬면 가장 오래 안 쓴 세션부터 디스크에 저장하고 내림
+    내린 세션은 다음 요청 때 파일에서 다시 불러옴
+    """
+
+    def __init__(self, max_sessions=None, idle_timeout=None, memory_dir=None, client=None, db_manager=None):
+        """
+        초기화
+
+        Args:
+            max_sessions: 메모리에 올려둘 최대 세션 수 (기본값: env의 CHIPI_MAX_SESSIONS 또는 32)
+            idle_timeout: 이 시간(초) 동안 요청이 없던 세션은 내림 (기본값: env의 CHIPI_SESSION_IDLE_SEC 또는 600)
+            memory_dir: 디바이스별 대화 히스토리 폴더 (기본값: env의 CHIPI_MEMORY_DIR 또는 .sessions)
+            client: 공유할 AzureOpenAI 클라이언트 (기본값: 새로 생성)
+            db_manager: 공유할 DatabaseManager (기본값: 커넥션 풀 모드로 새로 연결, 실패하면 DB 없이 동작)
+        """
+        self.max_sessions = max_sessions or int(os.getenv("CHIPI_MAX_SESSIONS", "32"))
+        self.idle_timeout = idle_timeout or float(os.getenv("CHIPI_SESSION_IDLE_SEC", "600"))
+        self.memory_dir = memory_dir or os.getenv("CHIPI_MEMORY_DIR") or os.path.join(PROJECT_ROOT, ".sessions")
+        os.makedirs(self.memory_dir, exist_ok=True)
+
+        self.client = client or create_llm_client()
+        self._owns_db = db_manager is None
+        if db_manager is None:
+            try:
+                # 여러 디바이스가 동시에 조회하므로 풀 모드 (연결 수는 DB_POOL_MAX까지)
+                db_manager = DatabaseManager(pooled=True)
+                db_manager.connect()
+            except Exception as e:
+                logger.warning(f"⚠️  데이터베이스 연결 실패 (DB 컨텍스트 없이 동작): {e}")
+                db_manager = None
+        self.db_manager = db_manager
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("CHIPI_PREFETCH_WORKERS", "4")),
+            thread_name_prefix="chipi-prefetch",
+        )
+
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # serial -> DeviceSession (앞쪽이 가장 오래 안 쓴 세션)
+        self.loads = 0
+        self.evictions = 0
+
+    def memory_path(self, serial):
+        """디바이스별 대화 히스토리 파일 경로 (시리얼에서 파일 이름에 쓸 수 없는 문자는 _로)"""
+        safe_name = re.sub(r"[^0-9A-Za-z_.-]", "_", serial)
+        return os.path.join(self.memory_dir, f"{safe_name}.jsonl")
+
+    def get(self, serial):
+        """
+        디바이스 세션 가져오기 (메모리에 없으면 파일에서 불러옴)
+
+        Args:
+            serial: 디바이스 시리얼
+
+        Returns:
+            DeviceSession
+        """
+        if not serial:
+            raise ValueError("❌ 디바이스 시리얼이 없습니다.")
+
+        with self._lock:
+            session = self._sessions.get(serial)
+            if session is None:
+                # DB 연결에 실패했으면 세션마다 다시 연결을 시도하지 않음 (False)
+                # 사용자 정보는 항상 디바이스 소유자 기준 (USER_EMAIL은 기기 한 대용이라 쓰지 않음)
+                brain = ChipiBrain(client=self.client, db_manager=self.db_manager or False,
+                                   executor=self.executor, memory_file=self.memory_path(serial),
+                                   user_email=None)
+                session = self._sessions[serial] = DeviceSession(serial, brain)
+                self.loads += 1
+                logger.debug(f"📂 세션 불러옴: {serial} (활성 {len(self._sessions)}개)")
+            else:
+                self._sessions.move_to_end(serial)
+            session.last_used = time.monotonic()
+
+            evicted = self._pop_evictable()
+
+        # 저장(파일 쓰기)은 관리자 lock 밖에서
+        for old in evicted:
+            self._close_session(old)
+        return session
+
+    def _pop_evictable(self):
+        """내릴 세션을 목록에서 빼서 반환 (처리 중인 세션은 건너뜀, self._lock 안에서 호출)"""
+        now = time.monotonic()
+        evicted = []
+        for serial, session in list(self._sessions.items()):
+            over_capacity = len(self._sessions) > self.max_sessions
+            idle = now - session.last_used > self.idle_timeout
+            if not over_capacity and not idle:
+                # 나머지는 더 최근에 쓴 세션
+                break
+            if session.lock.locked():
+                continue
+            del self._sessions[serial]
+            evicted.append(session)
+        return evicted
+
+    def _close_session(self, session):
+        # 처리 중인 요청이 끝난 뒤에 저장
+        with session.lock:
+            session.brain.close()
+            session.closed = True
+        with self._lock:
+            self.evictions += 1
+        logger.debug(f"💾 세션 내림: {session.serial}")
+
+    def chat(self, serial, text, ai_name="chipi"):
+        """
+        디바이스 대화 한 턴 (같은 디바이스 요청은 순서대로, 다른 디바이스는 동시에 처리)
+
+        Args:
+            serial: 디바이스 시리얼
+            text: 사용자 발화
+            ai_name: AI 페르소나 이름
+
+        Returns:
+            str: 치피 응답
+        """
+        while True:
+            session = self.get(serial)
+            with session.lock:
+                if session.closed:
+                    continue
+                session.brain.add_msg(text)
+                reply = session.brain.wait_run(ai_name=ai_name, device_serial=serial)
+                session.last_used = time.monotonic()
+                return reply
+
+    def evict_idle(self):
+        """오래 쉰 세션 내리기 (주기적으로 호출)"""
+        with self._lock:
+            evicted = self._pop_evictable()
+        for session in evicted:
+            self._close_session(session)
+        return len(evicted)
+
+    def stats(self):
+        """
+        세션 통계
+
+        Returns:
+            dict: {active, max_sessions, loads, evictions}
+        """
+        with self._lock:
+            active = len(self._sessions)
+        return {
+            "active": active,
+            "max_sessions": self.max_sessions,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        """모든 세션 저장 후 공유 자원 종료"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            self._close_session(session)
+
+        self.executor.shutdown(wait=False)
+        if self.db_manager and self._owns_db:
+            self.db_manager.close()
@@ -0,0 +1,232 @@
+import os
+import re
+import sys
+import time
+import difflib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.logger import get_logger
+from src.core.tracing import tracer
+
+logger = get_logger("speculation")
+
+# 비교할 때 무시할 문자 (공백/문장부호 - STT 최종 결과에서 붙거나 바뀌는 경우가 많음)
+_IGNORED = re.compile(r"[\s.,!?~…·'\"“”‘’()\[\]-]+")
+
+# 한 글자만 달라도 뜻이 반대가 되는 부정 표현 ("좋아" / "안 좋아", "갔어" / "못 갔어", "없어" / "있어")
+NEGATORS = set("안못않없")
+
+
+def normalize_text(text):
+    """비교용 정규화 (공백/문장부호 제거, 소문자)"""
+    return _IGNORED.sub("", text or "").lower()
+
+
+def edit_distance(a, b):
+    """레벤슈타인 거리 (글자 단위)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def _negation_changed(a, b):
+    """두 발화 사이에서 부정 표현 글자가 더해지거나 빠지거나 바뀌었는지"""
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal" and NEGATORS & set(a[i1:i2] + b[j1:j2]):
+            return True
+    return False
+
+
+def transcripts_match(draft_text, final_text, max_edit_ratio):
+    """
+    미리 응답을 만든 중간 결과와 최종 인식 결과가 같은 말인지
+    (편집 거리가 작아도 "안/못/않/없"이 달라지면 반대 뜻이라 다른 말로 봄)
+
+    Args:
+        draft_text: 미리 응답을 만들 때 쓴 중간 인식 결과
+        final_text: 최종 인식 결과
+        max_edit_ratio: 정규화 후 편집 거리가 긴 쪽 글자 수의 이 비율 이하면 같은 말로 봄
+
+    Returns:
+        bool
+    """
+    a, b = normalize_text(draft_text), normalize_text(final_text)
+    if not a or not b:
+        return False
+    if a == b:
+        return True
+    if _negation_changed(a, b):
+        return False
+    return edit_distance(a, b) <= max_edit_ratio * max(len(a), len(b))
+
+
+class _Draft:
+    def __init__(self, text, future, cancel, history_version, started_at):
+        self.text = text
+        self.future = future
+        self.cancel = cancel
+        self.history_version = history_version
+        self.started_at = started_at
+
+
+class SpeculativeResponder:
+    """중간 인식 결과(recognizing)가 잠시 바뀌지 않으면 최종 결과를 기다리지 않고 LLM 응답을 미리 생성
+    최종 결과가 같은 말이면 미리 만든 응답을 쓰고, 다르면 버리고 평소처럼 다시 요청
+    (발화 끝 침묵 판정 시간 동안 LLM이 먼저 돌아서 체감 응답 시간이 줄어듦)
+    """
+
+    def __init__(self, brain, ai_name="chipi", device_serial=None, stable_ms=None, max_edit_ratio=None,
+                 min_chars=4):
+        """
+        초기화
+
+        Args:
+            brain: ChipiBrain
+            ai_name: AI 페르소나 이름
+            device_serial: 디바이스 시리얼 (DB 컨텍스트용)
+            stable_ms: 중간 결과가 이 시간(ms) 동안 그대로면 미리 요청 (기본값: env의 CHIPI_SPECULATE_STABLE_MS 또는 300)
+            max_edit_ratio: 최종 결과와 이 비율 이하로만 다르면 미리 만든 응답 사용
+                            (기본값: env의 CHIPI_SPECULATE_MAX_EDIT_RATIO 또는 0.15)
+            min_chars: 정규화 후 이보다 짧은 중간 결과로는 미리 요청하지 않음
+        """
+        self.brain = brain
+        self.ai_name = ai_name
+        self.device_serial = device_serial
+        self.stable_sec = (stable_ms or int(os.getenv("CHIPI_SPECULATE_STABLE_MS", "300"))) / 1000
+        self.max_edit_ratio = (max_edit_ratio if max_edit_ratio is not None
+                               else float(os.getenv("CHIPI_SPECULATE_MAX_EDIT_RATIO", "0.15")))
+        self.min_chars = min_chars
+
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chipi-speculate")
+        self._lock = threading.Lock()
+        self._partial = ""
+        self._version = 0    # 중간 결과가 바뀔 때마다 증가 (이전 타이머 무효화)
+        self._draft = None   # 진행 중이거나 끝난 미리 요청
+
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+
+    def attach(self, session):
+        """인식 세션의 중간 결과를 받도록 연결 (RecognitionSession.on_partial)"""
+        if session is not None:
+            session.on_partial = self.on_partial
+
+    def on_partial(self, text):
+        """중간 인식 결과 (인식 스레드에서 호출)"""
+        if len(normalize_text(text)) < self.min_chars:
+            return
+
+        with self._lock:
+            if text == self._partial:
+                return
+            self._partial = text
+            self._version += 1
+            version = self._version
+
+        timer = threading.Timer(self.stable_sec, self._on_stable, args=(version,))
+        timer.daemon = True
+        timer.start()
+
+    def _on_stable(self, version):
+        with self._lock:
+            if version != self._version:
+                return
+            text = self._partial
+
+            if self._draft is not None:
+                # 이미 같은 말로 미리 요청 중이면 그대로 둠
+                if transcripts_match(self._draft.text, text, self.max_edit_ratio):
+                    return
+                self._draft.cancel.set()
+
+            cancel = threading.Event()
+            future = self._executor.submit(self.brain.draft_run, text, self.ai_name, self.device_serial, cancel)
+            self._draft = _Draft(text, future, cancel, self.brain.history_version, time.perf_counter())
+            self.started += 1
+        logger.debug(f"🔮 미리 응답 생성 시작: \"{text}\"")
+
+    def resolve(self, final_text):
+        """
+        최종 인식 결과로 미리 만든 응답 확정
+
+        Args:
+            final_text: 최종 인식된 사용자 발화
+
+        Returns:
+            str: 미리 만든 응답 (이미 히스토리에 추가/저장됨) 또는 None (평소처럼 요청할 것)
+        """
+        with self._lock:
+            draft, self._draft = self._draft, None
+            self._partial = ""
+            self._version += 1
+
+        if draft is None:
+            return None
+
+        if not transcripts_match(draft.text, final_text, self.max_edit_ratio):
+            draft.cancel.set()
+            self.misses += 1
+            logger.debug(f"🔮 미리 응답 버림: \"{draft.text}\" ≠ \"{final_text}\"")
+            return None
+
+        # 같은 말이면 미리 보낸 요청이 끝나기를 기다림 (이미 진행된 만큼 새로 요청하는 것보다 빠름)
+        with tracer.span("llm.speculative_wait"):
+            reply = draft.future.result()
+
+        if not reply or not self.brain.commit_draft(final_text, reply, draft.history_version):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.debug(f"🔮 미리 만든 응답 사용 (요청 시작 후 {time.perf_counter() - draft.started_at:.2f}초)")
+        return reply
+
+    def reset(self):
+        """진행 중인 미리 요청 취소 (재생이 시작되는 등 이번 발화가 더 이상 유효하지 않을 때)"""
+        with self._lock:
+            draft, self._draft = self._draft, None
+            self._partial = ""
+            self._version += 1
+        if draft is not None:
+            draft.cancel.set()
+
+    def stats(self):
+        """
+        미리 요청 통계
+
+        Returns:
+            dict: {started, hits, misses}
+        """
+        return {"started": self.started, "hits": self.hits, "misses": self.misses}
+
+
+def create_speculation(brain, session, ai_name="chipi", device_serial=None):
+    """
+    CHIPI_SPECULATE=1이고 인식 세션이 있으면 SpeculativeResponder를 만들어 연결
+
+    Args:
+        brain: ChipiBrain
+        session: RecognitionSession (engine_registry.get_listener(), 없으면 None)
+        ai_name: AI 페르소나 이름
+        device_serial: 디바이스 시리얼
+
+    Returns:
+        SpeculativeResponder 또는 None
+    """
+    if os.getenv("CHIPI_SPECULATE", "0") != "1" or session is None:
+        return None
+    speculation = SpeculativeResponder(brain, ai_name=ai_name, device_serial=device_serial)
+    speculation.attach(session)
+    return speculation
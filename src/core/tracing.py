@@ -0,0 +1,264 @@
+import os
+import json
+import math
+import time
+import threading
+import functools
+import itertools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+from src.core.logger import get_logger
+
+# 지금 진행 중인 턴 ID (스레드/asyncio 태스크마다 따로 - 여러 디바이스 턴이 동시에 돌아도 섞이지 않음)
+_current_turn = contextvars.ContextVar("chipi_turn", default=None)
+
+
+class LatencyHistogram:
+    """로그 간격 버킷 히스토그램 (샘플 수와 상관없이 메모리 고정, 백분위수는 버킷 상한으로 근사)"""
+
+    # 버킷 경계: 0.1ms부터 1.15배씩 (약 ±7% 오차), 마지막 버킷은 그 이상 전부
+    BASE = 0.0001
+    FACTOR = 1.15
+    BUCKETS = 120  # 0.1ms * 1.15^120 ≈ 190초
+
+    def __init__(self):
+        self.counts = [0] * (self.BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, seconds):
+        if seconds <= self.BASE:
+            return 0
+        index = int(math.ceil(math.log(seconds / self.BASE, self.FACTOR)))
+        return min(index, self.BUCKETS)
+
+    def _upper(self, index):
+        return self.BASE * (self.FACTOR ** index)
+
+    def record(self, seconds):
+        self.counts[self._bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, p):
+        """
+        백분위수 (초, 샘플이 없으면 None)
+
+        Args:
+            p: 0 ~ 100
+        """
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                # 버킷 상한이 실제 최댓값보다 크면 최댓값으로
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 2),
+            "min_ms": round(self.min * 1000, 2),
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p95_ms": round(self.percentile(95) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class Tracer:
+    """음성 루프 단계별 구간(span) 측정 - 턴 ID를 붙여 기록하고 단계별 p50/p95/p99로 집계"""
+
+    def __init__(self, enabled=None, keep_spans=None):
+        """
+        초기화
+
+        Args:
+            enabled: False면 측정하지 않음 (기본값: env의 CHIPI_TRACE, 기본 켜짐)
+            keep_spans: JSON 덤프용으로 기억할 최근 span 수 (기본값: env의 CHIPI_TRACE_KEEP 또는 2000)
+        """
+        if enabled is None:
+            enabled = os.getenv("CHIPI_TRACE", "1") != "0"
+        self.enabled = enabled
+
+        self._turns = itertools.count(1)
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._spans = deque(maxlen=keep_spans or int(os.getenv("CHIPI_TRACE_KEEP", "2000")))
+        self._epoch = time.perf_counter()
+
+    @property
+    def turn_id(self):
+        """이 스레드(asyncio 태스크)에서 진행 중인 턴 ID (없으면 None)"""
+        return _current_turn.get()
+
+    def start_turn(self, turn_id=None, device=None):
+        """
+        새 대화 턴 시작 (이 스레드/태스크에서 이후 기록하는 span에 이 턴 ID가 붙음)
+
+        Args:
+            turn_id: 직접 지정할 턴 ID (기본값: 1부터 증가하는 번호)
+            device: 디바이스 시리얼 (주면 턴 ID 앞에 붙임, 예: "SN123-7")
+
+        Returns:
+            턴 ID
+        """
+        if turn_id is None:
+            turn_id = next(self._turns)
+            if device:
+                turn_id = f"{device}-{turn_id}"
+        _current_turn.set(turn_id)
+        return turn_id
+
+    def bind(self, fn):
+        """
+        지금 턴을 이어받아 실행하도록 감싼 함수 (다른 스레드/executor로 넘기는 작업용)
+        새 스레드는 턴 ID가 비어 있으므로, 넘기는 쪽 스레드에서 감싸야 함
+
+        Args:
+            fn: 감쌀 함수
+
+        Returns:
+            callable: fn과 같은 인자를 받는 함수
+        """
+        context = contextvars.copy_context()
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            # 같은 Context는 여러 스레드에서 동시에 실행할 수 없으므로 호출마다 복사
+            return context.copy().run(fn, *args, **kwargs)
+        return run
+
+    def record(self, name, seconds, turn_id=None, **attrs):
+        """
+        이미 잰 구간 기록 (첫 토큰까지 시간처럼 with 블록으로 감싸기 어려운 경우)
+
+        Args:
+            name: 단계 이름 (예: "llm.first_token")
+            seconds: 걸린 시간 (초)
+            turn_id: 턴 ID (기본값: 현재 턴)
+            attrs: 같이 남길 값 (엔진 이름, 캐시 적중 여부 등)
+        """
+        if not self.enabled:
+            return
+        span = {
+            "turn": self.turn_id if turn_id is None else turn_id,
+            "name": name,
+            "end_ms": round((time.perf_counter() - self._epoch) * 1000, 2),
+            "duration_ms": round(seconds * 1000, 2),
+        }
+        if attrs:
+            span["attrs"] = attrs
+
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+            self._spans.append(span)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+        with 블록 구간 측정 (monotonic 시계, 예외가 나도 기록)
+
+        Args:
+            name: 단계 이름 (예: "stt.listen", "llm.create", "tts.generate")
+            attrs: 같이 남길 값
+
+        Yields:
+            dict: 블록 안에서 값을 추가할 수 있는 attrs (예: attrs["cached"] = True)
+        """
+        if not self.enabled:
+            yield attrs
+            return
+
+        turn_id = self.turn_id
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["error"] = type(e).__name__
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, turn_id=turn_id, **attrs)
+
+    def summary(self):
+        """
+        단계별 집계
+
+        Returns:
+            dict: {단계 이름: {count, mean_ms, min_ms, p50_ms, p95_ms, p99_ms, max_ms}}
+        """
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def spans(self, turn_id=None):
+        """최근 span 목록 (turn_id를 주면 그 턴만)"""
+        with self._lock:
+            spans = list(self._spans)
+        if turn_id is not None:
+            spans = [span for span in spans if span["turn"] == turn_id]
+        return spans
+
+    def dump(self, path):
+        """
+        집계와 최근 span을 JSON 파일로 저장
+
+        Args:
+            path: 저장할 파일 경로
+        """
+        data = {"summary": self.summary(), "spans": self.spans()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def report(self):
+        """단계별 집계를 표로 만든 문자열"""
+        lines = [f"{'단계':<20} {'횟수':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"]
+        for name, stats in self.summary().items():
+            if not stats["count"]:
+                continue
+            lines.append(f"{name:<20} {stats['count']:>6} {stats['p50_ms']:>7.0f}ms {stats['p95_ms']:>7.0f}ms "
+                         f"{stats['p99_ms']:>7.0f}ms {stats['max_ms']:>7.0f}ms")
+        return "\n".join(lines)
+
+    def finish(self, path=None):
+        """
+        종료 시 단계별 집계를 로그로 남기고, 경로가 있으면 JSON으로도 저장
+
+        Args:
+            path: 저장할 파일 경로 (기본값: env의 CHIPI_TRACE_FILE, 없으면 저장하지 않음)
+        """
+        if not self.enabled or not self.summary():
+            return
+        logger = get_logger("trace")
+        logger.info("\n⏱️  단계별 지연 시간\n" + self.report())
+
+        path = path or os.getenv("CHIPI_TRACE_FILE")
+        if path:
+            try:
+                self.dump(path)
+                logger.info(f"💾 트레이스 저장: {path}")
+            except OSError as e:
+                logger.error(f"❌ 트레이스 저장 오류: {e}")
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._spans.clear()
+
+
+# 프로세스 전체에서 공유하는 트레이서
+tracer = Tracer()
@@ -0,0 +1,249 @@
+import os
+import sys
+import time
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.intent_matcher import match_intents
+from src.core.logger import get_logger
+from src.core.tracing import tracer
+from src.tts.playback import stop_playback
+from src.tts.speech_pipeline import iter_sentences, to_sentences
+
+logger = get_logger("loop")
+
+_END = object()
+
+
+class VoiceLoop:
+    """듣기 → 생각하기 → 합성 → 재생을 asyncio 태스크로 나눠서 동시에 진행하는 대화 루프
+
+    - 듣기는 전용 스레드에서 계속 돌고, 인식된 문장은 발화 큐로 들어옴 (응답 중에도 입력 처리가 멈추지 않음)
+    - 한 턴 안에서는 LLM 문장 → 합성 → 재생이 크기 제한 큐로 이어짐 (앞 단계가 너무 앞서 나가지 않음)
+    - 응답 중에 새 발화가 들어오거나 사용자가 끼어들면 진행 중인 턴을 취소
+    - 블로킹 SDK 호출(STT/LLM/TTS/재생)은 단계별 전용 스레드에서 실행
+    """
+
+    def __init__(self, brain, tts, device_serial=None, ai_name="chipi", voice_params=None,
+                 queue_size=None, prefetch=1, speculation=None):
+        """
+        초기화
+
+        Args:
+            brain: ChipiBrain
+            tts: TTSEngine (engine_registry.get_engine())
+            device_serial: 디바이스 시리얼 (DB 컨텍스트용)
+            ai_name: AI 페르소나 이름
+            voice_params: (사용자 발화, 의도 목록) -> 음성 파라미터 dict 함수 (인사말은 (None, set())으로 호출)
+            queue_size: LLM 문장 큐 / 발화 큐 크기 (기본값: env의 CHIPI_LOOP_QUEUE_SIZE 또는 4)
+            prefetch: 재생 대기열에 미리 합성해 둘 문장 수
+            speculation: SpeculativeResponder (있으면 중간 인식 결과로 미리 만든 응답을 먼저 확인)
+        """
+        self.brain = brain
+        self.tts = tts
+        self.device_serial = device_serial
+        self.ai_name = ai_name
+        self.voice_params = voice_params or (lambda text, intents: {})
+        self.queue_size = queue_size or int(os.getenv("CHIPI_LOOP_QUEUE_SIZE", "4"))
+        self.prefetch = max(1, prefetch)
+        self.speculation = speculation
+
+        # 단계별 스레드 하나씩: LLM(ChipiBrain은 스레드 안전하지 않으므로 턴이 겹치지 않게), 합성, 재생(믹서는 하나)
+        self._llm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chipi-llm")
+        self._tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chipi-tts")
+        self._play_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chipi-play")
+
+        self._loop = None
+        self._utterances = None
+        self._closed = threading.Event()
+
+    # ------------------------------------------
+    # 듣기 (전용 스레드 → 발화 큐)
+    # ------------------------------------------
+    def _listen_forever(self):
+        while not self._closed.is_set():
+            # DB 컨텍스트를 미리 조회 (듣는 동안 백그라운드에서 진행)
+            if self.device_serial:
+                self.brain.prefetch_context(self.device_serial)
+
+            start = time.monotonic()
+            with tracer.span("stt.listen"):
+                text = self.tts.listen()
+
+            if text:
+                self._loop.call_soon_threadsafe(self._push_utterance, text)
+            elif time.monotonic() - start < 0.05:
+                # 입력이 바로 끝나는 경우(EOF 등) 헛돌지 않도록
+                time.sleep(0.1)
+
+    def _push_utterance(self, text):
+        # 큐가 가득 차면 가장 오래된 발화를 버림 (응답이 밀려도 최근 말을 우선)
+        if self._utterances.full():
+            dropped = self._utterances.get_nowait()
+            logger.warning(f"⚠️  발화가 밀려서 버림: {dropped}")
+        self._utterances.put_nowait(text)
+
+    # ------------------------------------------
+    # 한 턴: LLM 문장 → 합성 → 재생
+    # ------------------------------------------
+    def _put_threadsafe(self, queue, item, stop):
+        """다른 스레드에서 asyncio 큐에 넣기 (큐가 가득 차면 자리가 날 때까지 대기, 취소되면 False)"""
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), self._loop)
+        while True:
+            try:
+                future.result(timeout=0.1)
+                return True
+            except FutureTimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+            except Exception:
+                return False
+
+    def _generate(self, text, sentences, stop):
+        """LLM 스레드: 응답 스트림을 문장 단위로 잘라 문장 큐에 넣음 (취소되면 스트림을 닫아 생성도 멈춤)"""
+        pieces = stream = None
+        try:
+            reply = self.speculation.resolve(text) if self.speculation else None
+            if reply is not None:
+                # 중간 인식 결과로 미리 만든 응답 (히스토리에는 이미 저장됨)
+                stream = to_sentences(reply)
+            else:
+                self.brain.add_msg(text)
+                pieces = self.brain.stream_run(ai_name=self.ai_name, device_serial=self.device_serial)
+                stream = iter_sentences(pieces)
+
+            for sentence in stream:
+                if stop.is_set() or not self._put_threadsafe(sentences, sentence, stop):
+                    return
+        finally:
+            # LLM 오류로 끝나도 끝 표시는 넣어야 합성/재생 단계가 끝나고 턴이 마무리됨 (취소된 턴은 제외)
+            if not stop.is_set():
+                self._put_threadsafe(sentences, _END, stop)
+            # 끝까지 읽지 않았으면 GeneratorExit로 중단 (ChipiBrain이 말한 부분까지 저장)
+            if stream is not None:
+                stream.close()
+            if pieces is not None:
+                pieces.close()
+
+    async def _synthesize_stage(self, sentences, audio, params):
+        while True:
+            sentence = await sentences.get()
+            if sentence is _END:
+                await audio.put(_END)
+                return
+            audio_data = await self._loop.run_in_executor(
+                self._tts_executor, tracer.bind(functools.partial(self.tts.synthesize, sentence, **params)))
+            if audio_data:
+                await audio.put((sentence, audio_data))
+
+    async def _play_stage(self, audio, spoken):
+        """재생 단계 (사용자가 끼어들어 재생을 멈췄으면 True)"""
+        while True:
+            item = await audio.get()
+            if item is _END:
+                return False
+            sentence, audio_data = item
+            interrupted = await self._loop.run_in_executor(self._play_executor, tracer.bind(self.tts.play), audio_data)
+            spoken.append(sentence)
+            if interrupted:
+                return True
+
+    async def _turn(self, text, intents):
+        tracer.start_turn()
+        params = self.voice_params(text, intents)
+        sentences = asyncio.Queue(maxsize=self.queue_size)
+        audio = asyncio.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        spoken = []
+
+        logger.info("🧠 생각하는 중...")
+        # 단계별 스레드에서도 이 턴 ID로 기록되도록 tracer.bind로 감싸서 넘김
+        llm = self._loop.run_in_executor(self._llm_executor, tracer.bind(self._generate), text, sentences, stop)
+        llm.add_done_callback(self._log_failure)
+        synthesize = asyncio.create_task(self._synthesize_stage(sentences, audio, params))
+        play = asyncio.create_task(self._play_stage(audio, spoken))
+
+        start = time.perf_counter()
+        try:
+            if await play:
+                logger.info("✋ 끼어들기 감지, 남은 응답 취소")
+        except asyncio.CancelledError:
+            logger.info("✋ 응답 취소")
+            stop_playback()
+            raise
+        finally:
+            stop.set()
+            synthesize.cancel()
+            play.cancel()
+            await asyncio.gather(synthesize, play, return_exceptions=True)
+            tracer.record("turn.speak", time.perf_counter() - start, engine=self.tts.name)
+
+        if spoken:
+            logger.info(f"🤖 치피: {' '.join(spoken)}")
+        else:
+            await self.speak("미안, 다시 말해줄래?", **params)
+
+    def _log_failure(self, future):
+        # 기다리는 쪽이 없는 태스크/스레드 작업의 예외는 여기서 로그로 남김
+        if not future.cancelled() and future.exception():
+            logger.error(f"❌ 대화 루프 오류: {future.exception()}")
+
+    async def speak(self, text, **params):
+        """
+        한 문장 합성 후 재생 (합성/재생은 각 단계 스레드에서)
+
+        Returns:
+            bool: 사용자가 끼어들어 재생을 멈췄으면 True
+        """
+        audio_data = await self._loop.run_in_executor(
+            self._tts_executor, tracer.bind(functools.partial(self.tts.synthesize, text, **params)))
+        if not audio_data:
+            return False
+        return await self._loop.run_in_executor(self._play_executor, tracer.bind(self.tts.play), audio_data)
+
+    async def run(self, greeting=None, farewell="안녕!"):
+        """
+        대화 루프 실행 (종료 의도가 인식될 때까지)
+
+        Args:
+            greeting: 시작 인사 (None이면 생략)
+            farewell: 종료할 때 할 말
+        """
+        self._loop = asyncio.get_running_loop()
+        self._utterances = asyncio.Queue(maxsize=self.queue_size)
+
+        if greeting:
+            await self.speak(greeting, **self.voice_params(None, set()))
+
+        threading.Thread(target=self._listen_forever, name="chipi-stt", daemon=True).start()
+
+        turn = None
+        try:
+            while True:
+                text = await self._utterances.get()
+
+                # 응답 중에 새로 말하면 이전 응답은 취소하고 새 발화에 답함
+                if turn is not None and not turn.done():
+                    turn.cancel()
+                    await asyncio.gather(turn, return_exceptions=True)
+
+                intents = match_intents(text)
+                if "exit" in intents:
+                    await self.speak(farewell, **self.voice_params(text, intents))
+                    break
+
+                turn = asyncio.create_task(self._turn(text, intents))
+                turn.add_done_callback(self._log_failure)
+        finally:
+            self._closed.set()
+            if turn is not None and not turn.done():
+                turn.cancel()
+                await asyncio.gather(turn, return_exceptions=True)
+            for executor in (self._llm_executor, self._tts_executor, self._play_executor):
+                executor.shutdown(wait=False)
@@ -1,12 +1,36 @@
 import os
+import sys
+import time
+import threading
+from datetime import datetime, timedelta
+from contextlib import contextmanager
 import psycopg2
+from psycopg2 import pool as pg_pool
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.logger import get_logger
+from src.database.ttl_cache import TTLCache
+
+logger = get_logger("db")
+
+# 센서 데이터 측정 주기 (get_latest_sensor_data 참고)
+SENSOR_PERIOD_SEC = 30 * 60
+
 class DatabaseManager:
     """PostgreSQL 데이터베이스 연결 및 조회"""
 
-    def __init__(self):
+    def __init__(self, pooled=None, min_connections=None, max_connections=None):
+        """
+        초기화
+
+        Args:
+            pooled: True면 스레드 안전 커넥션 풀 사용 (기본값: env의 DB_POOLED)
+            min_connections: 풀 최소 연결 수 (기본값: env의 DB_POOL_MIN 또는 1)
+            max_connections: 풀 최대 연결 수 (기본값: env의 DB_POOL_MAX 또는 10)
+        """
         load_dotenv(encoding='utf-8')
 
         # 데이터베이스 연결 정보
@@ -19,28 +43,216 @@ class DatabaseManager:
         if not self.host:
             raise ValueError("DB_HOST가 설정되지 않았습니다.")
 
+        if pooled is None:
+            pooled = os.environ.get("DB_POOLED", "").lower() in ("1", "true", "yes")
+        self.pooled = pooled
+        self.min_connections = min_connections or int(os.environ.get("DB_POOL_MIN", "1"))
+        self.max_connections = max_connections or int(os.environ.get("DB_POOL_MAX", "10"))
+
+        # 풀이 다 쓰이면 이 시간(초)까지 반납을 기다림 (ThreadedConnectionPool은 기다리지 않고 바로 PoolError)
+        self.pool_wait = float(os.environ.get("DB_POOL_WAIT_SEC", "10"))
+
+        # 이 시간(초) 이상 쉬었던 연결은 쓰기 전에 SELECT 1로 살아있는지 확인
+        self.health_check_interval = float(os.environ.get("DB_HEALTH_CHECK_SEC", "30"))
+
+        # 사용자/디바이스 정보는 거의 바뀌지 않으므로 길게, 센서 데이터는 측정 주기에 맞춰 캐시
+        cache_size = int(os.environ.get("DB_CACHE_SIZE", "1024"))
+        self._identity_cache = TTLCache(maxsize=cache_size, ttl=float(os.environ.get("DB_CACHE_TTL_SEC", "600")))
+        self._sensor_cache = TTLCache(maxsize=cache_size, ttl=SENSOR_PERIOD_SEC)
+        self.sensor_cache_min_ttl = float(os.environ.get("DB_SENSOR_CACHE_MIN_SEC", "30"))
+
         self.conn = None
+        self.pool = None
+        self._pool_slots = None        # 풀 모드에서 빌린 연결 수 제한 (풀 크기만큼, 다 쓰이면 대기)
+        self._lock = threading.Lock()  # 단일 연결 모드에서 스레드 간 쿼리 직렬화
+        self._last_used = {}           # id(conn) -> 마지막 사용 시각
+
+    def _connect_params(self):
+        return dict(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            user=self.user,
+            password=self.password,
+        )
 
     def connect(self):
-        """데이터베이스 연결"""
+        """데이터베이스 연결 (pooled 모드면 커넥션 풀 생성)"""
         try:
-            self.conn = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-            )
-            print("✓ PostgreSQL 연결 성공")
+            if self.pooled:
+                self.pool = pg_pool.ThreadedConnectionPool(
+                    self.min_connections, self.max_connections, **self._connect_params()
+                )
+                self._pool_slots = threading.BoundedSemaphore(self.max_connections)
+                logger.info(f"✓ PostgreSQL 연결 풀 생성 성공 (최대 {self.max_connections}개)")
+            else:
+                self.conn = psycopg2.connect(**self._connect_params())
+                self._last_used[id(self.conn)] = time.monotonic()
+                logger.info("✓ PostgreSQL 연결 성공")
         except Exception as e:
-            print(f"❌ 데이터베이스 연결 오류: {e}")
+            logger.error(f"❌ 데이터베이스 연결 오류: {e}")
             raise
 
     def close(self):
         """데이터베이스 연결 종료"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+            logger.info("✓ PostgreSQL 연결 풀 종료")
         if self.conn:
             self.conn.close()
-            print("✓ PostgreSQL 연결 종료")
+            self.conn = None
+            logger.info("✓ PostgreSQL 연결 종료")
+
+    def _is_healthy(self, conn):
+        """연결 상태 확인 (한동안 안 쓴 연결만 실제로 ping)"""
+        if conn.closed:
+            return False
+
+        last_used = self._last_used.get(id(conn), 0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT 1")
+            finally:
+                cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _acquire(self):
+        """쿼리용 연결 빌리기 (끊긴 연결은 버리고 다시 연결)"""
+        if self.pool:
+            # 빈 연결이 생길 때까지 대기 (getconn은 풀이 다 쓰이면 바로 실패하므로 먼저 자리를 잡음)
+            if not self._pool_slots.acquire(timeout=self.pool_wait):
+                raise psycopg2.OperationalError(f"DB 연결 대기 시간 초과 ({self.pool_wait:g}초)")
+            try:
+                for _ in range(self.max_connections + 1):
+                    conn = self.pool.getconn()
+                    if self._is_healthy(conn):
+                        return conn
+                    logger.warning("⚠️  끊긴 DB 연결 발견 → 폐기 후 재연결")
+                    self._last_used.pop(id(conn), None)
+                    self.pool.putconn(conn, close=True)
+                raise psycopg2.OperationalError("사용 가능한 DB 연결이 없습니다.")
+            except Exception:
+                self._pool_slots.release()
+                raise
+
+        self._lock.acquire()
+        try:
+            if self.conn is None or not self._is_healthy(self.conn):
+                if self.conn is not None:
+                    logger.warning("⚠️  DB 연결 끊김 → 재연결")
+                    self._last_used.pop(id(self.conn), None)
+                    try:
+                        self.conn.close()
+                    except Exception:
+                        pass
+                self.conn = psycopg2.connect(**self._connect_params())
+                self._last_used[id(self.conn)] = time.monotonic()
+            return self.conn
+        except Exception:
+            self._lock.release()
+            raise
+
+    def _release(self, conn, broken=False):
+        """빌린 연결 반납 (broken이면 폐기)"""
+        if broken:
+            self._last_used.pop(id(conn), None)
+        else:
+            self._last_used[id(conn)] = time.monotonic()
+
+        if self.pool:
+            try:
+                self.pool.putconn(conn, close=broken or bool(conn.closed))
+            finally:
+                self._pool_slots.release()
+            return
+
+        if broken:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            self.conn = None
+        self._lock.release()
+
+    @contextmanager
+    def _cursor(self):
+        """
+        연결을 빌려 커서를 열고, 끝나면 트랜잭션을 정리한 뒤 반납
+        (오류가 나면 항상 rollback - 다음 쿼리가 aborted 상태에 걸리지 않도록)
+        """
+        conn = self._acquire()
+        broken = False
+        try:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            try:
+                yield cur
+            finally:
+                cur.close()
+            # 조회만 하므로 트랜잭션을 바로 닫아 idle in transaction 방지
+            conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        except Exception:
+            try:
+                conn.rollback()  # 트랜잭션 초기화
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self._release(conn, broken)
+
+    def _sensor_ttl(self, sensor_data):
+        """
+        센서 캐시 만료 시간: 다음 측정(30분 주기) 예정 시각까지
+        (측정이 밀렸으면 최소 시간만 캐시해서 새 데이터를 빨리 반영)
+        """
+        measured_at = sensor_data.get('updated_at') or sensor_data.get('created_at')
+        if not isinstance(measured_at, datetime):
+            return self.sensor_cache_min_ttl
+
+        now = datetime.now(measured_at.tzinfo) if measured_at.tzinfo else datetime.now()
+        remaining = (measured_at + timedelta(seconds=SENSOR_PERIOD_SEC) - now).total_seconds()
+        return min(SENSOR_PERIOD_SEC, max(self.sensor_cache_min_ttl, remaining))
+
+    def invalidate_user(self, email=None, serial=None):
+        """
+        사용자 정보가 바뀌었을 때 캐시 무효화
+
+        Args:
+            email: 바뀐 사용자 이메일
+            serial: 바뀐 사용자의 디바이스 시리얼
+        """
+        if email:
+            self._identity_cache.invalidate(("user_email", email))
+        if serial:
+            self._identity_cache.invalidate(("user_serial", serial))
+        self._identity_cache.invalidate_where(
+            lambda key: key[0] == "turn" and ((serial and key[1] == serial) or (email and key[2] == email))
+        )
+
+    def invalidate_device(self, serial):
+        """디바이스 정보(소유자 변경 등)가 바뀌었을 때 캐시 무효화"""
+        self._identity_cache.invalidate(("device", serial))
+        self._identity_cache.invalidate(("user_serial", serial))
+        self._identity_cache.invalidate_where(lambda key: key[0] == "turn" and key[1] == serial)
+
+    def invalidate_sensor(self, serial):
+        """새 센서 데이터가 들어왔을 때 캐시 무효화"""
+        self._sensor_cache.invalidate(serial)
+
+    def clear_cache(self):
+        """모든 조회 캐시 비우기"""
+        self._identity_cache.clear()
+        self._sensor_cache.clear()
 
     def get_user_by_email(self, email):
         """
@@ -52,22 +264,26 @@ class DatabaseManager:
         Returns:
             dict: 사용자 정보 (id, name, email, etc.)
         """
-        try:
-            cur = self.conn.cursor(cursor_factory=RealDictCursor)
+        cache_key = ("user_email", email)
+        cached = self._identity_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-            try:
+        try:
+            with self._cursor() as cur:
                 cur.execute(
                     "SELECT * FROM users WHERE email = %s",
                     (email,)
                 )
                 user = cur.fetchone()
-                return dict(user) if user else None
-            finally:
-                cur.close()
+
+            user = dict(user) if user else None
+            if user:
+                self._identity_cache.set(cache_key, user)
+            return user
 
         except Exception as e:
-            print(f"❌ 이메일로 사용자 조회 오류: {e}")
-            self.conn.rollback()
+            logger.error(f"❌ 이메일로 사용자 조회 오류: {e}")
             return None
 
     def get_user_by_device_serial(self, serial):
@@ -80,10 +296,13 @@ class DatabaseManager:
         Returns:
             dict: 사용자 정보 (id, name, email, etc.)
         """
-        try:
-            cur = self.conn.cursor(cursor_factory=RealDictCursor)
+        cache_key = ("user_serial", serial)
+        cached = self._identity_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-            try:
+        try:
+            with self._cursor() as cur:
                 # 디바이스에서 user_id 조회
                 cur.execute(
                     "SELECT user_id FROM devices WHERE serial = %s",
@@ -92,7 +311,7 @@ class DatabaseManager:
                 device = cur.fetchone()
 
                 if not device:
-                    print(f"⚠️  시리얼 '{serial}'에 해당하는 디바이스를 찾을 수 없습니다.")
+                    logger.warning(f"⚠️  시리얼 '{serial}'에 해당하는 디바이스를 찾을 수 없습니다.")
                     return None
 
                 user_id = device['user_id']
@@ -104,13 +323,13 @@ class DatabaseManager:
                 )
                 user = cur.fetchone()
 
-                return dict(user) if user else None
-            finally:
-                cur.close()
+            user = dict(user) if user else None
+            if user:
+                self._identity_cache.set(cache_key, user)
+            return user
 
         except Exception as e:
-            print(f"❌ 사용자 조회 오류: {e}")
-            self.conn.rollback()  # 트랜잭션 초기화
+            logger.error(f"❌ 사용자 조회 오류: {e}")
             return None
 
     def get_device_info(self, serial):
@@ -123,20 +342,26 @@ class DatabaseManager:
         Returns:
             dict: 디바이스 정보
         """
-        try:
-            cur = self.conn.cursor(cursor_factory=RealDictCursor)
+        cache_key = ("device", serial)
+        cached = self._identity_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-            cur.execute(
-                "SELECT * FROM devices WHERE serial = %s",
-                (serial,)
-            )
-            device = cur.fetchone()
-            cur.close()
+        try:
+            with self._cursor() as cur:
+                cur.execute(
+                    "SELECT * FROM devices WHERE serial = %s",
+                    (serial,)
+                )
+                device = cur.fetchone()
 
-            return dict(device) if device else None
+            device = dict(device) if device else None
+            if device:
+                self._identity_cache.set(cache_key, device)
+            return device
 
         except Exception as e:
-            print(f"❌ 디바이스 조회 오류: {e}")
+            logger.error(f"❌ 디바이스 조회 오류: {e}")
             return None
 
     def get_latest_sensor_data(self, device_id, limit=1):
@@ -151,24 +376,22 @@ class DatabaseManager:
             list: 센서 데이터 리스트
         """
         try:
-            cur = self.conn.cursor(cursor_factory=RealDictCursor)
-
-            cur.execute(
-                """
-                SELECT * FROM sensor_data
-                WHERE device_id = %s
-                ORDER BY created_at DESC
-                LIMIT %s
-                """,
-                (device_id, limit)
-            )
-            data = cur.fetchall()
-            cur.close()
-
-            return [dict(row) for row in data] if data else []
+            with self._cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT * FROM sensor_data
+                    WHERE device_id = %s
+                    ORDER BY created_at DESC
+                    LIMIT %s
+                    """,
+                    (device_id, limit)
+                )
+                data = cur.fetchall()
+
+                return [dict(row) for row in data] if data else []
 
         except Exception as e:
-            print(f"❌ 센서 데이터 조회 오류: {e}")
+            logger.error(f"❌ 센서 데이터 조회 오류: {e}")
             return []
 
     def get_sensor_data_by_serial(self, serial):
@@ -182,10 +405,12 @@ class DatabaseManager:
         Returns:
             dict: 최신 센서 데이터 (temperature, humidity 포함)
         """
-        try:
-            cur = self.conn.cursor(cursor_factory=RealDictCursor)
+        cached = self._sensor_cache.get(serial)
+        if cached is not None:
+            return cached
 
-            try:
+        try:
+            with self._cursor() as cur:
                 # sensor_data 테이블에서 직접 serial로 최신 데이터 조회 (updated_at 기준)
                 cur.execute(
                     """
@@ -198,20 +423,17 @@ class DatabaseManager:
                 )
                 data = cur.fetchone()
 
-                if data:
-                    print(f"✓ 센서 데이터 조회 성공: {dict(data)}")
-                    return dict(data)
-                else:
-                    print(f"⚠️  센서 데이터 없음 (시리얼: {serial})")
-                    return None
-            finally:
-                cur.close()
+            if data:
+                data = dict(data)
+                logger.debug(f"✓ 센서 데이터 조회 성공: {data}")
+                self._sensor_cache.set(serial, data, ttl=self._sensor_ttl(data))
+                return data
+            else:
+                logger.warning(f"⚠️  센서 데이터 없음 (시리얼: {serial})")
+                return None
 
         except Exception as e:
-            print(f"❌ 센서 데이터 조회 오류: {e}")
-            self.conn.rollback()  # 트랜잭션 초기화
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ 센서 데이터 조회 오류: {e}")
             return None
 
     def get_recent_logs(self, user_id, limit=5):
@@ -226,24 +448,22 @@ class DatabaseManager:
             list: 로그 리스트
         """
         try:
-            cur = self.conn.cursor(cursor_factory=RealDictCursor)
-
-            cur.execute(
-                """
-                SELECT * FROM logs
-                WHERE user_id = %s
-                ORDER BY created_at DESC
-                LIMIT %s
-                """,
-                (user_id, limit)
-            )
-            logs = cur.fetchall()
-            cur.close()
-
-            return [dict(row) for row in logs] if logs else []
+            with self._cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT * FROM logs
+                    WHERE user_id = %s
+                    ORDER BY created_at DESC
+                    LIMIT %s
+                    """,
+                    (user_id, limit)
+                )
+                logs = cur.fetchall()
+
+                return [dict(row) for row in logs] if logs else []
 
         except Exception as e:
-            print(f"❌ 로그 조회 오류: {e}")
+            logger.error(f"❌ 로그 조회 오류: {e}")
             return []
 
     def get_user_kits(self, user_id):
@@ -257,19 +477,17 @@ class DatabaseManager:
             list: 키트 정보 리스트
         """
         try:
-            cur = self.conn.cursor(cursor_factory=RealDictCursor)
-
-            cur.execute(
-                "SELECT * FROM kits WHERE user_id = %s",
-                (user_id,)
-            )
-            kits = cur.fetchall()
-            cur.close()
+            with self._cursor() as cur:
+                cur.execute(
+                    "SELECT * FROM kits WHERE user_id = %s",
+                    (user_id,)
+                )
+                kits = cur.fetchall()
 
-            return [dict(kit) for kit in kits] if kits else []
+                return [dict(kit) for kit in kits] if kits else []
 
         except Exception as e:
-            print(f"❌ 키트 조회 오류: {e}")
+            logger.error(f"❌ 키트 조회 오류: {e}")
             return []
 
     def get_plant_status(self, temperature, humidity):
@@ -317,7 +535,7 @@ class DatabaseManager:
             }
 
         except Exception as e:
-            print(f"❌ 식물 상태 판단 오류: {e}")
+            logger.error(f"❌ 식물 상태 판단 오류: {e}")
             return {
                 "status": "unknown",
                 "condition_status": "unknown",
@@ -325,10 +543,132 @@ class DatabaseManager:
                 "issues": []
             }
 
+    def get_turn_context(self, device_serial, user_email=None):
+        """
+        한 턴에 필요한 사용자/디바이스/최신 센서 데이터를 쿼리 한 번으로 조회
+
+        Args:
+            device_serial: 디바이스 시리얼 번호
+            user_email: 사용자 이메일 (있으면 디바이스 소유자보다 우선)
+
+        Returns:
+            dict: {user, device, sensor} (없는 항목은 None) 또는 조회 실패 시 None
+        """
+        # 둘 다 캐시에 있으면 DB를 전혀 거치지 않음
+        identity_key = ("turn", device_serial, user_email)
+        identity = self._identity_cache.get(identity_key)
+        sensor = self._sensor_cache.get(device_serial)
+        if identity is not None and sensor is not None:
+            return {"user": identity["user"], "device": identity["device"], "sensor": sensor}
+
+        try:
+            with self._cursor() as cur:
+                # LEFT JOIN이라 디바이스가 없어도 sensor_data는 시리얼로 조회됨
+                cur.execute(
+                    """
+                    SELECT
+                        row_to_json(d) AS device,
+                        row_to_json(ue) AS email_user,
+                        row_to_json(u) AS device_user,
+                        row_to_json(s) AS sensor
+                    FROM (SELECT %s::text AS serial) AS k
+                    LEFT JOIN devices d ON d.serial = k.serial
+                    LEFT JOIN users u ON u.id = d.user_id
+                    LEFT JOIN users ue ON ue.email = %s
+                    LEFT JOIN LATERAL (
+                        SELECT * FROM sensor_data
+                        WHERE serial = k.serial
+                        ORDER BY updated_at DESC
+                        LIMIT 1
+                    ) s ON TRUE
+                    """,
+                    (device_serial, user_email)
+                )
+                row = cur.fetchone()
+
+            sensor = row['sensor']
+            if sensor:
+                # JSON으로 받은 시각 문자열을 datetime으로 복원
+                for key in ("created_at", "updated_at"):
+                    if isinstance(sensor.get(key), str):
+                        try:
+                            sensor[key] = datetime.fromisoformat(sensor[key])
+                        except ValueError:
+                            pass
+
+            user = row['email_user'] or row['device_user']
+            if user or row['device']:
+                self._identity_cache.set(identity_key, {"user": user, "device": row['device']})
+            if sensor:
+                self._sensor_cache.set(device_serial, sensor, ttl=self._sensor_ttl(sensor))
+
+            return {
+                "user": user,
+                "device": row['device'],
+                "sensor": sensor,
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 컨텍스트 조회 오류: {e}")
+            return None
+
+    def format_context(self, turn_context, only_temperature=False, only_humidity=False):
+        """
+        get_turn_context() 결과로 AI에 전달할 컨텍스트 문자열 생성
+
+        Args:
+            turn_context: get_turn_context() 반환값
+            only_temperature: True면 온도만 포함
+            only_humidity: True면 습도만 포함
+
+        Returns:
+            str: 컨텍스트 문자열
+        """
+        sensor_data = turn_context.get("sensor") if turn_context else None
+
+        # 컨텍스트 생성
+        context = "## 현재 센서 데이터\n"
+
+        if sensor_data:
+            temperature = sensor_data.get('temperature', 'N/A')
+            humidity = sensor_data.get('humidity', 'N/A')
+            measured_time = sensor_data.get('created_at', 'N/A')
+
+            # datetime 객체를 문자열로 변환
+            if hasattr(measured_time, 'strftime'):
+                measured_time = measured_time.strftime('%Y-%m-%d %H:%M:%S')
+
+            # 온도만 표시
+            if only_temperature:
+                context += f"- 온도: {temperature}도\n"
+            # 습도만 표시
+            elif only_humidity:
+                context += f"- 습도: {humidity}%\n"
+            # 둘 다 표시 (기본)
+            else:
+                context += f"- 온도: {temperature}도\n"
+                context += f"- 습도: {humidity}%\n"
+
+            context += f"- 측정시간: {measured_time}\n"
+
+            # 식물 상태 판단 (온도와 습도 둘 다 필요할 때만)
+            if not only_temperature and not only_humidity and temperature not in (None, 'N/A') and humidity not in (None, 'N/A'):
+                plant_status = self.get_plant_status(float(temperature), float(humidity))
+                context += f"\n## 현재 치피 상태\n"
+                context += f"- 조건: {plant_status['condition_status']}\n"
+                if plant_status['issues']:
+                    context += f"- 문제: {', '.join(plant_status['issues'])}\n"
+                context += f"- 상태 메시지: {plant_status['message']}\n"
+
+        else:
+            context += "- 현재 센서 데이터를 불러올 수 없습니다.\n"
+
+        return context
+
     def build_context(self, device_serial, only_temperature=False, only_humidity=False):
         """
         디바이스 시리얼을 기반으로 AI에 전달할 컨텍스트 생성
-        (sensor_data 테이블에서 직접 조회)
+        (get_turn_context()로 사용자/디바이스/센서 데이터를 한 번에 조회)
 
         Args:
             device_serial: 디바이스 시리얼 번호
@@ -339,71 +679,23 @@ class DatabaseManager:
             tuple: (context: str, user_name: str or None) - 컨텍스트 문자열과 사용자 이름
         """
         try:
-            user_name = None
-
-            # 1. 환경 변수에서 USER_EMAIL 가져오기
-            user_email = os.environ.get("USER_EMAIL")
-
-            # 2. 이메일로 먼저 조회 시도
-            if user_email:
-                user = self.get_user_by_email(user_email)
-                user_name = user.get('name') if user else None
-                if user_name:
-                    print(f"✓ 사용자 조회 성공 (이메일): {user_name}")
-
-            # 3. 이메일로 못 찾으면 시리얼로 조회
-            if not user_name:
-                user = self.get_user_by_device_serial(device_serial)
-                user_name = user.get('name') if user else None
-                if user_name:
-                    print(f"✓ 사용자 조회 성공 (시리얼): {user_name}")
-
-            # 4. 못 찾으면 None 설정 (시스템 프롬프트에서 기본값 '주인님' 사용)
-            if not user_name:
-                print(f"⚠️  사용자 정보를 찾을 수 없습니다. 기본값 'user' 사용")
-
-            # 최신 센서 데이터 직접 조회 (시리얼 기반)
-            sensor_data = self.get_sensor_data_by_serial(device_serial)
-
-            # 컨텍스트 생성
-            context = "## 현재 센서 데이터\n"
-
-            if sensor_data:
-                temperature = sensor_data.get('temperature', 'N/A')
-                humidity = sensor_data.get('humidity', 'N/A')
-                measured_time = sensor_data.get('created_at', 'N/A')
-
-                # datetime 객체를 문자열로 변환
-                if hasattr(measured_time, 'strftime'):
-                    measured_time = measured_time.strftime('%Y-%m-%d %H:%M:%S')
-
-                # 온도만 표시
-                if only_temperature:
-                    context += f"- 온도: {temperature}도\n"
-                # 습도만 표시
-                elif only_humidity:
-                    context += f"- 습도: {humidity}%\n"
-                # 둘 다 표시 (기본)
-                else:
-                    context += f"- 온도: {temperature}도\n"
-                    context += f"- 습도: {humidity}%\n"
-
-                context += f"- 측정시간: {measured_time}\n"
-
-                # 식물 상태 판단 (온도와 습도 둘 다 필요할 때만)
-                if not only_temperature and not only_humidity and temperature != 'N/A' and humidity != 'N/A':
-                    plant_status = self.get_plant_status(float(temperature), float(humidity))
-                    context += f"\n## 현재 치피 상태\n"
-                    context += f"- 조건: {plant_status['condition_status']}\n"
-                    if plant_status['issues']:
-                        context += f"- 문제: {', '.join(plant_status['issues'])}\n"
-                    context += f"- 상태 메시지: {plant_status['message']}\n"
+            # 환경 변수의 USER_EMAIL이 있으면 이메일 사용자 우선, 없으면 디바이스 소유자
+            turn_context = self.get_turn_context(device_serial, os.environ.get("USER_EMAIL"))
+            if turn_context is None:
+                return "", None
+
+            user = turn_context["user"]
+            user_name = user.get('name') if user else None
 
+            # 못 찾으면 None 설정 (시스템 프롬프트에서 기본값 '주인님' 사용)
+            if user_name:
+                logger.debug(f"✓ 사용자 조회 성공: {user_name}")
             else:
-                context += "- 현재 센서 데이터를 불러올 수 없습니다.\n"
+                logger.warning(f"⚠️  사용자 정보를 찾을 수 없습니다. 기본값 'user' 사용")
 
+            context = self.format_context(turn_context, only_temperature, only_humidity)
             return context, user_name
 
         except Exception as e:
-            print(f"❌ 컨텍스트 생성 오류: {e}")
+            logger.error(f"❌ 컨텍스트 생성 오류: {e}")
             return "", None
@@ -0,0 +1,97 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """키별 만료 시간이 있는 크기 제한 캐시 (스레드 안전, 가득 차면 오래 안 쓴 항목부터 삭제)"""
+
+    def __init__(self, maxsize=1024, ttl=600):
+        """
+        초기화
+
+        Args:
+            maxsize: 최대 항목 수
+            ttl: 기본 만료 시간 (초)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (만료 시각, 값)
+
+    def get(self, key, default=None):
+        """
+        캐시 조회
+
+        Args:
+            key: 키
+            default: 없거나 만료됐을 때 반환할 값
+
+        Returns:
+            캐시된 값 또는 default
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        캐시 저장
+
+        Args:
+            key: 키
+            value: 값
+            ttl: 이 항목의 만료 시간 (초, 기본값: self.ttl)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        """항목 하나 삭제"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        """
+        조건에 맞는 키를 모두 삭제
+
+        Args:
+            predicate: key -> bool 함수
+        """
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        캐시 통계
+
+        Returns:
+            dict: {hits, misses, size}
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
@@ -1,12 +1,22 @@
 import os
 import sys
+
+# 경로 설정 (src 폴더에서 실행되므로 상위 폴더 추가)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from dotenv import load_dotenv
-from chipi_brain import ChipiBrain 
-from tts_engine import AzureTTS
+from src.core.chipi_brain import ChipiBrain
+from src.core.intent_matcher import match_intents
+from src.core.logger import get_logger
+from src.core.speculation import create_speculation
+from src.core.tracing import tracer
+from src.tts.engine_registry import get_engine, get_listener
 
 # 한글 출력 깨짐 방지
 sys.stdout.reconfigure(encoding='utf-8')
 
+logger = get_logger("main")
+
 def main():
     load_dotenv()
     
@@ -18,12 +28,17 @@ def main():
     
     try:
         print("🧠 두뇌(LLM) 연결 중...", end=" ", flush=True)
-        brain = ChipiBrain()
+        # 이 기기 하나만 쓰는 경우라 USER_EMAIL이 있으면 그 사용자 정보로 대화
+        brain = ChipiBrain(user_email=os.environ.get("USER_EMAIL"))
         print("✅ 완료")
 
+        # TTS_ENGINE으로 엔진 선택 (azure / superton / stub, 기본값: azure)
         print("👄 입/귀(TTS) 연결 중...", end=" ", flush=True)
-        tts = AzureTTS()
-        print("✅ 완료")
+        tts = get_engine(os.environ.get("TTS_ENGINE", "azure"))
+        print(f"✅ 완료 ({tts.name})")
+
+        # CHIPI_SPECULATE=1이면 중간 인식 결과로 LLM 응답을 미리 생성 (Azure STT 세션이 있을 때만)
+        speculation = create_speculation(brain, get_listener(), ai_name='chipi', device_serial=device_serial)
         
         chipi_params = {
             "voice": "ko-KR-SeoHyeonNeural",
@@ -33,39 +48,51 @@ def main():
             "rate": 30
         }
 
-        tts.speak("준비됐어! 말 걸어줘!", chipi_params)
+        tts.speak("준비됐어! 말 걸어줘!", **chipi_params)
 
         while True:
+            # 이번 턴의 단계별 시간(STT/DB/LLM/TTS/재생)을 같은 턴 ID로 기록
+            tracer.start_turn()
+
+            # DB 컨텍스트를 미리 조회 (듣는 동안 백그라운드에서 진행)
+            brain.prefetch_context(device_serial)
+
             # 1. 듣기
-            user_text = tts.listen()
+            with tracer.span("stt.listen"):
+                user_text = tts.listen()
             
             if not user_text:
                 continue 
 
             # 종료 체크
-            if any(word in user_text for word in ["종료", "그만", "꺼져"]):
-                tts.speak("안녕!", chipi_params)
+            if "exit" in match_intents(user_text):
+                if speculation:
+                    speculation.reset()
+                tts.speak("안녕!", **chipi_params)
                 break
 
-            # 2. 생각하기
-            print("🧠 생각하는 중...", end=" ", flush=True)
-            brain.add_msg(user_text)
-            ai_response = brain.wait_run(ai_name='chipi', device_serial=device_serial)
-            print("✅ 완료", flush=True)
+            # 2. 생각하기 + 3. 말하기
+            # LLM 토큰 스트림을 바로 TTS 파이프라인에 연결 (첫 문장이 완성되면 바로 재생)
+            logger.info("🧠 생각하는 중...")
+            reply_stream = speculation.resolve(user_text) if speculation else None
+            if reply_stream is None:
+                brain.add_msg(user_text)
+                reply_stream = brain.stream_run(ai_name='chipi', device_serial=device_serial)
+            with tracer.span("turn.speak", engine=tts.name):
+                ai_response = tts.speak_stream(reply_stream, **chipi_params)
             
             if not ai_response:
-                tts.speak("미안, 다시 말해줄래?", chipi_params)
+                tts.speak("미안, 다시 말해줄래?", **chipi_params)
                 continue
 
-            # 3. 말하기
-            # print(f"🤖 답변: {ai_response}") # 로그 너무 길면 주석 처리
-            tts.speak(ai_response, chipi_params)
-
     except Exception as e:
         print(f"\n❌ 오류: {e}")
         import traceback
         traceback.print_exc()
         input("종료하려면 엔터...")
+    finally:
+        # 단계별 p50/p95/p99 출력 (CHIPI_TRACE_FILE이 있으면 JSON으로도 저장)
+        tracer.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
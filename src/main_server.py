@@ -0,0 +1,135 @@
+import os
+import sys
+import json
+import base64
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 경로 설정 (src 폴더에서 실행되므로 상위 폴더 추가)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from src.core.logger import get_logger
+from src.core.session_manager import SessionManager
+from src.core.tracing import tracer
+from src.tts.engine_registry import get_engine
+from src.tts.playback import guess_format
+
+logger = get_logger("server")
+
+
+class ChipiRequestHandler(BaseHTTPRequestHandler):
+    """여러 디바이스의 대화 요청 처리
+
+    POST /chat   {"serial", "text", "ai_name"(선택), "audio"(선택, true면 음성도 합성)}
+                 → {"reply", "audio"(base64), "format"}
+    GET  /health → 세션/단계별 지연 시간 통계
+    """
+
+    # ThreadingHTTPServer가 요청마다 스레드를 만들므로 세션 관리자/TTS 엔진은 클래스에서 공유
+    sessions = None
+    tts_engine = None
+    tts_params = {}
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, {"sessions": self.sessions.stats(), "latency": tracer.summary()})
+
+    def do_POST(self):
+        if self.path != "/chat":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "JSON 형식이 아닙니다."})
+            return
+
+        serial = (request.get("serial") or "").strip()
+        text = (request.get("text") or "").strip()
+        if not serial or not text:
+            self._send_json(400, {"error": "serial과 text가 필요합니다."})
+            return
+
+        # 요청마다 이 스레드의 턴을 새로 시작 (다른 디바이스 요청과 span이 섞이지 않도록)
+        tracer.start_turn(device=serial)
+        try:
+            with tracer.span("server.chat"):
+                reply = self.sessions.chat(serial, text, ai_name=request.get("ai_name") or "chipi")
+            response = {"reply": reply}
+
+            if request.get("audio"):
+                audio_data = self.tts_engine.synthesize(reply, **self.tts_params)
+                if audio_data:
+                    response["audio"] = base64.b64encode(audio_data).decode("ascii")
+                    # 엔진 이름이 아니라 실제 데이터로 판단 (hedged 엔진은 요청마다 azure/superton 중 먼저 끝난 쪽)
+                    response["format"] = guess_format(audio_data)
+        except Exception as e:
+            logger.exception(f"❌ [{serial}] 요청 처리 오류: {e}")
+            self._send_json(500, {"error": "응답 생성 실패"})
+            return
+
+        self._send_json(200, response)
+
+    def log_message(self, format, *args):
+        # 요청마다 찍히는 접근 로그는 DEBUG에서만
+        logger.debug(f"🌐 {self.address_string()} {format % args}")
+
+
+def _evict_idle_loop(sessions, interval, stop):
+    """오래 쉰 세션을 주기적으로 디스크에 저장하고 내림"""
+    while not stop.wait(interval):
+        try:
+            evicted = sessions.evict_idle()
+            if evicted:
+                logger.info(f"💾 쉬고 있는 세션 {evicted}개 내림 ({sessions.stats()['active']}개 활성)")
+        except Exception as e:
+            logger.error(f"❌ 세션 정리 오류: {e}")
+
+
+def main():
+    load_dotenv()
+
+    host = os.environ.get("CHIPI_SERVER_HOST", "0.0.0.0")
+    port = int(os.environ.get("CHIPI_SERVER_PORT", "8080"))
+
+    print("\n============== 🌱 치피(Chipi) 멀티 디바이스 서버 시작 ==============")
+
+    # LLM 클라이언트/DB 풀/TTS 엔진은 모든 디바이스가 공유, 대화 히스토리만 디바이스별
+    sessions = SessionManager()
+    ChipiRequestHandler.sessions = sessions
+    ChipiRequestHandler.tts_engine = get_engine(os.environ.get("TTS_ENGINE", "superton"))
+    ChipiRequestHandler.tts_params = {"language": "ko", "style": "neutral", "voice": "ko-KR-SeoHyeonNeural"}
+
+    stop = threading.Event()
+    threading.Thread(target=_evict_idle_loop, args=(sessions, 30, stop), daemon=True).start()
+
+    server = ThreadingHTTPServer((host, port), ChipiRequestHandler)
+    server.daemon_threads = True
+    print(f"✅ http://{host}:{port} 대기 중 (최대 활성 세션 {sessions.max_sessions}개)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        sessions.close()
+        tracer.finish()
+
+
+if __name__ == "__main__":
+    main()
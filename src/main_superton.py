@@ -1,17 +1,24 @@
 import os
 import sys
+import asyncio
 
 # 경로 설정 (src 폴더에서 실행되므로 상위 폴더 추가)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 from src.core.chipi_brain import ChipiBrain
-from src.tts.superton_tts import SupertonTTS
+from src.core.logger import get_logger
+from src.core.speculation import create_speculation
+from src.core.tracing import tracer
+from src.core.voice_loop import VoiceLoop
+from src.tts.engine_registry import get_engine, get_listener
 
 
 # 한글 출력 깨짐 방지
 sys.stdout.reconfigure(encoding='utf-8')
 
+logger = get_logger("main")
+
 def main():
     load_dotenv('config/.env')
 
@@ -23,62 +30,42 @@ def main():
 
     try:
         print("🧠 두뇌(LLM) 연결 중...", end=" ", flush=True)
-        brain = ChipiBrain()
+        # 이 기기 하나만 쓰는 경우라 USER_EMAIL이 있으면 그 사용자 정보로 대화
+        brain = ChipiBrain(user_email=os.environ.get("USER_EMAIL"))
         print("✅ 완료")
 
-        print("🎤 음성(SuperTone TTS) 연결 중...", end=" ", flush=True)
-        tts = SupertonTTS()
-        print("✅ 완료\n")
-
-        # 시작 인사
-        tts.speak("준비됐어! 말 걸어줘!", language="ko", style="neutral")
-
-        # 슬픈 톤을 사용할 키워드 목록
-        sad_keywords = ["죽고", "자살", "끝내고", "절망", "극도로 힘들", "살기싫", "뛰어내리"]
-
-        while True:
-            # 1. 마이크로 입력 받기
-            user_text = tts.listen()
-
-            if not user_text:
-                continue
-
-            # 종료 체크
-            if any(word in user_text for word in ["종료", "그만", "꺼져"]):
-                tts.speak("안녕!", language="ko", style="neutral")
-                break
+        # TTS_ENGINE으로 엔진 선택 (superton / azure / stub, 기본값: superton)
+        print("🎤 음성(TTS) 연결 중...", end=" ", flush=True)
+        tts = get_engine(os.environ.get("TTS_ENGINE", "superton"))
+        print(f"✅ 완료 ({tts.name})\n")
 
+        def voice_params(user_text, intents):
             # 슬픈 톤 키워드 감지 (공백/문장부호 무관)
-            is_sad_topic = any(keyword in user_text for keyword in sad_keywords)
-            print(f"🔍 슬픈 토픽 감지: {is_sad_topic}", flush=True)
-
-            # 2. 생각하기
-            print("🧠 생각하는 중...", end=" ", flush=True)
-            brain.add_msg(user_text)
-            ai_response = brain.wait_run(ai_name='chipi', device_serial=device_serial)
-            print("✅ 완료", flush=True)
-
-            if not ai_response:
-                response_style = "sad" if is_sad_topic else "neutral"
-                pitch_shift = -10 if is_sad_topic else 0
-                tts.speak("미안, 다시 말해줄래?", language="ko", style=response_style, pitch_shift=pitch_shift)
-                continue
-
-            # 3. 답변 출력 및 음성 재생
-            print(f"🤖 치피: {ai_response}")
+            is_sad_topic = "sad" in intents
+            logger.debug(f"🔍 슬픈 토픽 감지: {is_sad_topic}")
 
             # 슬픈 키워드가 있으면 슬픈 톤으로, 없으면 중립 톤으로 재생
             response_style = "sad" if is_sad_topic else "neutral"
             # 슬픈 톤일 때는 피치를 낮춤 (-20: 최저)
             pitch_shift = -10 if is_sad_topic else 0
-            print(f"🎤 응답 톤: {response_style}, 피치: {pitch_shift}", flush=True)
-            tts.speak(ai_response, language="ko", style=response_style, pitch_shift=pitch_shift)
+            logger.debug(f"🎤 응답 톤: {response_style}, 피치: {pitch_shift}")
+            return {"language": "ko", "style": response_style, "pitch_shift": pitch_shift}
+
+        # 듣기/LLM/합성/재생을 asyncio 태스크로 나눠서 진행 (응답 중에도 계속 듣고, 새로 말하면 이전 응답 취소)
+        # CHIPI_SPECULATE=1이면 중간 인식 결과로 LLM 응답을 미리 생성 (Azure STT 세션이 있을 때만)
+        speculation = create_speculation(brain, get_listener(), device_serial=device_serial)
+        voice_loop = VoiceLoop(brain, tts, device_serial=device_serial, voice_params=voice_params,
+                               speculation=speculation)
+        asyncio.run(voice_loop.run(greeting="준비됐어! 말 걸어줘!", farewell="안녕!"))
 
     except Exception as e:
         print(f"\n❌ 오류: {e}")
         import traceback
         traceback.print_exc()
         input("종료하려면 엔터...")
+    finally:
+        # 단계별 p50/p95/p99 출력 (CHIPI_TRACE_FILE이 있으면 JSON으로도 저장)
+        tracer.finish()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,297 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import aiohttp
+from dotenv import load_dotenv
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.logger import get_logger
+from src.tts.audio_cache import AudioCache
+
+load_dotenv()
+
+logger = get_logger("tts.superton")
+
+# 재시도할 HTTP 상태 코드 (요청 한도 초과 / 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 연결 시간 초과만 재시도 (aiohttp 3.10+에서 구분됨, 그 전 버전은 모든 시간 초과를 재시도하지 않음)
+CONNECT_TIMEOUT_ERRORS = getattr(aiohttp, "ConnectionTimeoutError", ())
+
+
+class AsyncTokenBucket:
+    """API 쿼터에 맞춰 초당 요청 수를 제한하는 토큰 버킷"""
+
+    def __init__(self, rate, capacity=None):
+        """
+        초기화
+
+        Args:
+            rate: 초당 채워지는 토큰 수 (= 허용 요청 수/초)
+            capacity: 버킷 크기 (순간 최대 요청 수, 기본값: rate)
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 하나를 쓸 수 있을 때까지 대기"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncSupertonTTS:
+    """SuperTone API 비동기(asyncio) 클라이언트 - 하나의 이벤트 루프에서 동시 합성"""
+
+    def __init__(self, voice_id=None, api_key=None, cache_dir=None, use_cache=True,
+                 max_concurrency=None, rate_per_sec=None, burst=None, max_retries=None):
+        """
+        초기화
+
+        Args:
+            voice_id: 음성 ID (기본값: env의 SUPERTON_VOICE_ID)
+            api_key: API 키 (기본값: env의 SUPERTON_API_KEY)
+            cache_dir: 음성 캐시 폴더 (기본값: env의 SUPERTON_CACHE_DIR 또는 .cache/superton)
+            use_cache: False면 캐시를 쓰지 않고 매번 API 호출
+            max_concurrency: 동시에 진행할 최대 요청 수 (기본값: env의 SUPERTON_MAX_CONCURRENCY 또는 16)
+            rate_per_sec: 초당 최대 요청 수 (기본값: env의 SUPERTON_RATE_PER_SEC 또는 5)
+            burst: 순간 최대 요청 수 (기본값: env의 SUPERTON_RATE_BURST 또는 rate_per_sec)
+            max_retries: 429/5xx/연결 오류 시 재시도 횟수 (기본값: env의 SUPERTON_MAX_RETRIES 또는 2)
+        """
+        self.api_key = api_key or os.getenv("SUPERTON_API_KEY")
+        self.voice_id = voice_id or os.getenv("SUPERTON_VOICE_ID")
+        self.model = "sona_speech_1"
+
+        if not self.api_key:
+            raise ValueError("❌ SUPERTON_API_KEY가 설정되지 않았습니다.")
+
+        # 동기 SupertonTTS와 같은 디스크 캐시를 공유
+        if use_cache:
+            cache_dir = cache_dir or os.getenv("SUPERTON_CACHE_DIR") or os.path.join(PROJECT_ROOT, ".cache", "superton")
+            max_mb = int(os.getenv("SUPERTON_CACHE_MAX_MB", "200"))
+            self.cache = AudioCache(cache_dir, max_bytes=max_mb * 1024 * 1024)
+        else:
+            self.cache = None
+
+        self.max_concurrency = max_concurrency or int(os.getenv("SUPERTON_MAX_CONCURRENCY", "16"))
+        rate_per_sec = rate_per_sec or float(os.getenv("SUPERTON_RATE_PER_SEC", "5"))
+        burst = burst or float(os.getenv("SUPERTON_RATE_BURST", "0")) or None
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("SUPERTON_MAX_RETRIES", "2"))
+        self.connect_timeout = float(os.getenv("SUPERTON_CONNECT_TIMEOUT", "3.05"))
+        self.read_timeout = float(os.getenv("SUPERTON_READ_TIMEOUT", "30"))
+        self.backoff_base = 0.5
+        self.backoff_max = 8.0
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate_limiter = AsyncTokenBucket(rate_per_sec, burst)
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        """이벤트 루프 안에서 keep-alive 세션을 한 번만 생성"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"x-sup-api-key": self.api_key},
+            )
+        return self._session
+
+    async def close(self):
+        """HTTP 세션 종료"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def _backoff_delay(self, attempt, retry_after=None):
+        """재시도 대기 시간 (Retry-After 헤더 우선, 없으면 full jitter 지수 백오프)"""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _request(self, method, url, read_timeout=None, **kwargs):
+        """
+        동시 요청 수/초당 요청 수 제한을 지키면서 요청하고, 429/5xx/연결 오류는 재시도
+
+        Args:
+            method: "GET" 또는 "POST"
+            url: 요청 URL
+            read_timeout: 응답 대기 시간 (기본값: self.read_timeout)
+            kwargs: aiohttp에 그대로 전달할 인자
+
+        Returns:
+            tuple: (상태 코드, 응답 바이트)
+        """
+        timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout,
+                                        sock_read=read_timeout or self.read_timeout)
+        session = self._get_session()
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            async with self._semaphore:
+                await self._rate_limiter.acquire()
+                try:
+                    async with session.request(method, url, timeout=timeout, **kwargs) as response:
+                        body = await response.read()
+                        if response.status not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                            return response.status, body
+                        reason = f"상태 {response.status}"
+                        retry_after = response.headers.get("Retry-After")
+                except (aiohttp.ServerTimeoutError, asyncio.TimeoutError) as e:
+                    # 응답 대기(sock_read) 시간 초과는 재시도하지 않음 (동기 SupertonTTS의 ReadTimeout과 같음)
+                    # ServerTimeoutError는 ClientConnectionError의 하위 클래스라 아래보다 먼저 처리
+                    if not isinstance(e, CONNECT_TIMEOUT_ERRORS) or attempt == self.max_retries:
+                        raise
+                    reason = "연결 시간 초과"
+                except aiohttp.ClientConnectionError:
+                    if attempt == self.max_retries:
+                        raise
+                    reason = "연결 오류"
+
+            # 대기하는 동안에는 슬롯을 다른 요청에 양보
+            delay = self._backoff_delay(attempt, retry_after)
+            logger.warning(f"   ⚠️  {reason} → {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def generate(self, text, language="ko", style="neutral", output_format="wav",
+                       pitch_shift=0, speed=1, pitch_variance=1):
+        """
+        SuperTone API를 사용하여 음성 생성 (SupertonTTS.generate와 동일한 인자)
+
+        Returns:
+            음성 바이트 데이터 또는 None
+        """
+        cache_key = None
+        if self.cache:
+            cache_key = AudioCache.make_key(
+                text=text, voice_id=self.voice_id, language=language, style=style,
+                model=self.model, output_format=output_format, pitch_shift=pitch_shift,
+                speed=speed, pitch_variance=pitch_variance,
+            )
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached:
+                return cached
+
+        url = f"https://supertoneapi.com/v1/text-to-speech/{self.voice_id}"
+
+        payload = {
+            "text": text,
+            "language": language,
+            "style": style,
+            "model": self.model,
+            "output_format": output_format,
+            "voice_settings": {
+                "pitch_shift": pitch_shift,
+                "pitch_variance": pitch_variance,
+                "speed": speed
+            }
+        }
+
+        try:
+            status, body = await self._request("POST", url, json=payload)
+
+            if status == 200:
+                if cache_key:
+                    await asyncio.to_thread(self.cache.put, cache_key, body)
+                return body
+            else:
+                logger.error(f"❌ 음성 생성 오류 (상태: {status}): {text[:20]}...")
+                return None
+
+        except asyncio.TimeoutError:
+            logger.error(f"❌ 요청 시간 초과 ({self.read_timeout:g}초): {text[:20]}...")
+            return None
+        except Exception as e:
+            logger.error(f"❌ 오류: {e}")
+            return None
+
+    async def save(self, text, filename="output.wav", language="ko", style="neutral", output_format="wav",
+                   pitch_shift=0, speed=1, pitch_variance=1):
+        """
+        텍스트를 음성 파일로 저장 (SupertonTTS.save와 동일한 인자)
+
+        Returns:
+            저장된 파일 경로 또는 None
+        """
+        audio_data = await self.generate(text, language, style, output_format,
+                                         pitch_shift=pitch_shift, speed=speed,
+                                         pitch_variance=pitch_variance)
+
+        if audio_data:
+            try:
+                current_dir = os.path.dirname(os.path.abspath(__file__))
+                filepath = os.path.join(current_dir, filename)
+
+                def write():
+                    with open(filepath, "wb") as f:
+                        f.write(audio_data)
+
+                await asyncio.to_thread(write)
+                logger.info(f"💾 저장 완료: {filepath}")
+                return filepath
+
+            except Exception as e:
+                logger.error(f"❌ 파일 저장 오류: {e}")
+                return None
+
+        return None
+
+    async def list_voices(self):
+        """
+        사용 가능한 모든 음성 목록 조회
+
+        Returns:
+            음성 목록 또는 None
+        """
+        url = "https://supertoneapi.com/v1/voices"
+
+        try:
+            status, body = await self._request("GET", url, read_timeout=10)
+
+            if status == 200:
+                return json.loads(body)
+            else:
+                logger.error(f"❌ 음성 목록 조회 오류 (상태: {status})")
+                return None
+
+        except Exception as e:
+            logger.error(f"❌ 오류: {e}")
+            return None
+
+
+# 🧪 동시 합성 테스트
+# ==========================================================
+if __name__ == "__main__":
+    async def demo():
+        async with AsyncSupertonTTS() as tts:
+            texts = ["안녕!", "준비됐어! 말 걸어줘!", "미안, 다시 말해줄래?"]
+            start = time.perf_counter()
+            results = await asyncio.gather(*(tts.generate(t) for t in texts))
+            elapsed = time.perf_counter() - start
+            for text, audio in zip(texts, results):
+                print(f"   {text}: {len(audio) if audio else 0} bytes")
+            print(f"✅ {len(texts)}개 동시 합성 완료 ({elapsed:.2f}초)")
+            if tts.cache:
+                print(f"📦 캐시 통계: {tts.cache.stats()}")
+
+    asyncio.run(demo())
@@ -0,0 +1,156 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from src.core.logger import get_logger
+
+logger = get_logger("tts.cache")
+
+
+class AudioCache:
+    """합성된 음성을 디스크에 저장해 두는 콘텐츠 주소 기반 캐시 (LRU)"""
+
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024):
+        """
+        초기화
+
+        Args:
+            cache_dir: 캐시 파일을 저장할 폴더
+            max_bytes: 캐시 최대 용량 (바이트, 초과 시 오래 안 쓴 파일부터 삭제)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> 파일 크기 (앞쪽일수록 오래 안 씀)
+        self._total_bytes = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(**params):
+        """
+        합성 파라미터로 캐시 키 생성
+
+        Args:
+            params: text, voice_id, language, style, model, output_format,
+                    pitch_shift, speed, pitch_variance 등
+
+        Returns:
+            str: sha256 해시 문자열
+        """
+        raw = json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _load_index(self):
+        """기존 캐시 파일을 마지막 사용 시각 순으로 인덱스에 등록"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".bin"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, name[:-4], st.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        self._evict()
+
+    def get(self, key):
+        """
+        캐시 조회
+
+        Args:
+            key: make_key()로 만든 키
+
+        Returns:
+            음성 바이트 데이터 또는 None
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+                # 마지막 사용 시각 갱신 (재시작 후에도 LRU 순서 유지)
+                os.utime(self._path(key), None)
+            except OSError:
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        """
+        캐시에 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 깨진 파일이 남지 않음)
+
+        Args:
+            key: make_key()로 만든 키
+            data: 음성 바이트 데이터
+        """
+        if not data or len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, self._path(key))
+            except OSError as e:
+                logger.warning(f"⚠️  캐시 저장 오류: {e}")
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                return
+
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        """최대 용량을 넘으면 가장 오래 안 쓴 항목부터 삭제"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        """
+        캐시 통계
+
+        Returns:
+            dict: {hits, misses, entries, bytes}
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
@@ -0,0 +1,257 @@
+import os
+import sys
+import csv
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+# 매니페스트에서 파라미터가 아닌 열
+RESERVED_FIELDS = {"text", "output", "engine", "params"}
+
+
+def _parse_value(value):
+    """CSV 값은 문자열이므로 숫자/불리언/JSON이면 변환 ("20" -> 20, "1.5" -> 1.5)"""
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def load_manifest(path):
+    """
+    매니페스트 읽기 (CSV 또는 JSONL)
+    필수: text, output / 선택: engine, params(JSON), 그 밖의 열은 모두 음성 파라미터로 사용
+
+    Args:
+        path: 매니페스트 파일 경로 (.csv / .jsonl)
+
+    Returns:
+        list: [{"text", "output", "engine", "params"}, ...] (output은 매니페스트 폴더 기준 절대 경로)
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    rows = []
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip() or line.lstrip().startswith("#"):
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError as e:
+                    raise ValueError(f"❌ 매니페스트 {line_no}번째 줄 JSON 오류: {e}")
+
+    items = []
+    for i, row in enumerate(rows, 1):
+        text = (row.get("text") or "").strip()
+        output = (row.get("output") or "").strip()
+        if not text or not output:
+            raise ValueError(f"❌ 매니페스트 {i}번째 항목에 text/output이 없습니다.")
+
+        params = _parse_value(row.get("params") or {})
+        if not isinstance(params, dict):
+            raise ValueError(f"❌ 매니페스트 {i}번째 항목의 params는 JSON 객체여야 합니다.")
+        params = dict(params)
+        for key, value in row.items():
+            if key not in RESERVED_FIELDS and value not in (None, ""):
+                params[key] = _parse_value(value)
+
+        items.append({
+            "text": text,
+            "output": os.path.normpath(os.path.join(base_dir, output)),
+            "engine": (row.get("engine") or "").strip() or None,
+            "params": params,
+        })
+
+    return items
+
+
+def item_hash(engine, text, params):
+    """합성 결과를 결정하는 값(엔진/텍스트/파라미터)의 해시 - 바뀌면 다시 합성"""
+    raw = json.dumps({"engine": engine, "text": text, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path, data):
+    """임시 파일에 쓴 뒤 교체 (중간에 끊겨도 깨진 파일이 남지 않음)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class BatchSynthesizer:
+    """매니페스트의 문장들을 여러 스레드로 동시에 합성해서 파일로 저장 (이미 최신인 파일은 건너뜀)"""
+
+    def __init__(self, default_engine="superton", workers=None, synthesizers=None):
+        """
+        초기화
+
+        Args:
+            default_engine: 매니페스트에 engine이 없을 때 쓸 엔진 ("superton" 또는 "azure")
+            workers: 동시 합성 수 (기본값: env의 TTS_BATCH_WORKERS 또는 4)
+            synthesizers: {엔진 이름: (text, params) -> 바이트 함수} (테스트용으로 직접 넘길 수 있음)
+        """
+        self.default_engine = default_engine
+        self.workers = workers or int(os.getenv("TTS_BATCH_WORKERS", "4"))
+        self._synthesizers = dict(synthesizers or {})
+        self._lock = threading.Lock()
+
+    def _create_synthesizer(self, engine):
+        """엔진 인스턴스를 만들고 (text, params) -> 바이트 함수로 감쌈"""
+        if engine == "superton":
+            from src.tts.superton_tts import SupertonTTS
+            tts = SupertonTTS()
+            return lambda text, params: tts.generate(text, **params)
+        if engine == "azure":
+            from src.tts.tts_engine import AzureTTS
+            tts = AzureTTS()
+            return lambda text, params: tts.synthesize(text, params)
+        raise ValueError(f"❌ 알 수 없는 엔진: {engine}")
+
+    def _get_synthesizer(self, engine):
+        # 엔진은 처음 쓸 때 한 번만 만들고 모든 스레드가 공유
+        with self._lock:
+            if engine not in self._synthesizers:
+                self._synthesizers[engine] = self._create_synthesizer(engine)
+            return self._synthesizers[engine]
+
+    def _params_for(self, engine, item):
+        params = dict(item["params"])
+        # SuperTone은 출력 형식을 고를 수 있으므로 확장자에 맞춤 (Azure는 MP3 고정)
+        if engine == "superton" and "output_format" not in params:
+            ext = os.path.splitext(item["output"])[1].lower().lstrip(".")
+            params["output_format"] = ext if ext in ("wav", "mp3") else "wav"
+        return params
+
+    def _synthesize_item(self, item, engine, params):
+        start = time.perf_counter()
+        audio_data = self._get_synthesizer(engine)(item["text"], params)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        if not audio_data:
+            return {"status": "failed", "latency_ms": round(latency_ms, 1), "bytes": 0,
+                    "error": "합성 결과 없음"}
+
+        _write_atomic(item["output"], audio_data)
+        return {"status": "ok", "latency_ms": round(latency_ms, 1), "bytes": len(audio_data)}
+
+    def run(self, items, state_path=None, force=False):
+        """
+        항목들을 합성해서 저장
+
+        Args:
+            items: load_manifest() 결과
+            state_path: 항목별 해시를 기록할 파일 (출력 파일이 있고 해시가 같으면 건너뜀)
+            force: True면 최신 여부와 상관없이 모두 다시 합성
+
+        Returns:
+            dict: 요약 {"total", "ok", "skipped", "failed", "elapsed_sec", "items": [...]}
+        """
+        state = {}
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  상태 파일 읽기 오류 (모두 다시 합성): {e}")
+
+        results = [None] * len(items)
+        pending = []
+        for i, item in enumerate(items):
+            engine = item["engine"] or self.default_engine
+            params = self._params_for(engine, item)
+            digest = item_hash(engine, item["text"], params)
+            base = {"text": item["text"], "output": item["output"], "engine": engine}
+
+            if not force and state.get(item["output"]) == digest and os.path.exists(item["output"]):
+                results[i] = dict(base, status="skipped", latency_ms=0.0,
+                                  bytes=os.path.getsize(item["output"]))
+            else:
+                pending.append((i, item, engine, params, digest, base))
+
+        print(f"📦 배치 합성: 전체 {len(items)}개 중 {len(pending)}개 합성, "
+              f"{len(items) - len(pending)}개 최신 (동시 {self.workers}개)", flush=True)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._synthesize_item, item, engine, params): (i, item, digest, base)
+                       for i, item, engine, params, digest, base in pending}
+
+            for future in as_completed(futures):
+                i, item, digest, base = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"status": "failed", "latency_ms": 0.0, "bytes": 0, "error": str(e)}
+
+                results[i] = dict(base, **result)
+                if result["status"] == "ok":
+                    state[item["output"]] = digest
+                else:
+                    state.pop(item["output"], None)
+                    print(f"❌ 합성 실패: {item['output']} ({result.get('error')})", flush=True)
+
+        if state_path:
+            _write_atomic(state_path, json.dumps(state, ensure_ascii=False, indent=2).encode("utf-8"))
+
+        summary = {
+            "total": len(items),
+            "ok": sum(1 for r in results if r["status"] == "ok"),
+            "skipped": sum(1 for r in results if r["status"] == "skipped"),
+            "failed": sum(1 for r in results if r["status"] == "failed"),
+            "elapsed_sec": round(time.perf_counter() - start, 3),
+            "items": results,
+        }
+        print(f"✅ 배치 합성 완료: 성공 {summary['ok']}, 건너뜀 {summary['skipped']}, "
+              f"실패 {summary['failed']} ({summary['elapsed_sec']:.2f}초)", flush=True)
+        return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="문장 목록(매니페스트)을 한 번에 음성 파일로 합성")
+    parser.add_argument("manifest", help="CSV 또는 JSONL 매니페스트 (text, output, engine, params)")
+    parser.add_argument("--engine", default="superton", choices=["superton", "azure"],
+                        help="매니페스트에 engine이 없을 때 쓸 엔진 (기본값: superton)")
+    parser.add_argument("--workers", type=int, default=None, help="동시 합성 수 (기본값: 4)")
+    parser.add_argument("--summary", default=None, help="요약 JSON 경로 (기본값: <매니페스트>.summary.json)")
+    parser.add_argument("--state", default=None, help="상태 파일 경로 (기본값: <매니페스트>.state.json)")
+    parser.add_argument("--force", action="store_true", help="최신 파일도 모두 다시 합성")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    items = load_manifest(args.manifest)
+    batch = BatchSynthesizer(default_engine=args.engine, workers=args.workers)
+    summary = batch.run(items, state_path=args.state or args.manifest + ".state.json", force=args.force)
+
+    summary_path = args.summary or args.manifest + ".summary.json"
+    _write_atomic(summary_path, json.dumps(summary, ensure_ascii=False, indent=2).encode("utf-8"))
+    print(f"💾 요약 저장: {summary_path}")
+
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+import io
+import os
+import sys
+import math
+import wave
+import array
+import threading
+from abc import ABC, abstractmethod
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.logger import get_logger
+from src.tts.playback import play_audio_bytes
+from src.tts.speech_pipeline import SpeechPipeline, to_sentences
+
+logger = get_logger("tts.engine")
+
+
+class TTSEngine(ABC):
+    """모든 TTS 엔진의 공통 인터페이스 (synthesize → 바이트, play, speak, speak_stream, listen)
+    하위 클래스는 synthesize()만 구현하면 됨 (구현하지 않으면 엔진을 만들 때 TypeError)
+    """
+
+    name = None
+    # 이 엔진이 받는 음성 파라미터 (다른 엔진용 파라미터가 섞여 와도 무시, None이면 모두 전달)
+    PARAMS = None
+
+    @abstractmethod
+    def synthesize(self, text, **params):
+        """
+        텍스트를 음성 바이트로 합성
+
+        Args:
+            text: 말할 텍스트
+            params: 엔진별 음성 파라미터
+
+        Returns:
+            음성 바이트 데이터 (WAV/MP3) 또는 None
+        """
+
+    def _filter_params(self, params):
+        if self.PARAMS is None:
+            return params
+        return {key: value for key, value in params.items() if key in self.PARAMS}
+
+    def play(self, audio_data):
+        """
+        음성 바이트 재생 (형식은 헤더로 판단, 재생이 끝날 때까지 대기)
+
+        Returns:
+            bool: 사용자가 끼어들어 재생을 멈췄으면 True
+        """
+        listener = _listener
+        try:
+            if listener is None:
+                return play_audio_bytes(audio_data)
+            with listener.playback() as interrupt:
+                interrupted = play_audio_bytes(audio_data, interrupt=interrupt)
+            if interrupted:
+                logger.info("✋ 끼어들기 감지, 재생 중단")
+            return interrupted
+        except Exception as e:
+            logger.error(f"❌ 재생 오류: {e}")
+            return False
+
+    def speak(self, text, **params):
+        audio_data = self.synthesize(text, **params)
+        if audio_data:
+            self.play(audio_data)
+
+    def speak_stream(self, text_or_stream, **params):
+        """문장 단위로 합성/재생 (문장 N 재생 중에 문장 N+1 합성)
+
+        Returns:
+            str: 실제로 말한 전체 텍스트
+        """
+        spoken = []
+        SpeechPipeline(lambda sentence: self.synthesize(sentence, **params), self.play).run(
+            to_sentences(text_or_stream, spoken))
+        return " ".join(spoken)
+
+    def listen(self, timeout=None):
+        """
+        사용자 발화 듣기 (엔진을 바꿔도 마이크 세션은 하나를 공유)
+        Azure Speech 설정이 없으면 키보드 입력으로 대신함 (오프라인 테스트용)
+
+        Returns:
+            인식된 텍스트 또는 None
+        """
+        listener = get_listener()
+        if listener is None:
+            try:
+                return input("\n⌨️  입력: ").strip() or None
+            except EOFError:
+                return None
+
+        logger.info("\n👂 듣는 중...")
+        text = listener.listen(timeout)
+        if text:
+            logger.info(f"✅ 인식됨: \"{text}\"")
+            return text
+
+        logger.debug("🔕 (침묵)")
+        return None
+
+
+class SupertonEngine(TTSEngine):
+    """SuperTone API 엔진 (SupertonTTS.generate 사용)"""
+
+    name = "superton"
+    PARAMS = {"language", "style", "output_format", "pitch_shift", "speed", "pitch_variance"}
+
+    def __init__(self):
+        from src.tts.superton_tts import SupertonTTS
+        self.tts = SupertonTTS()
+
+    def synthesize(self, text, **params):
+        return self.tts.generate(text, **self._filter_params(params))
+
+
+class AzureEngine(TTSEngine):
+    """Azure Speech 엔진 (SSML, AzureTTS.synthesize 사용)"""
+
+    name = "azure"
+    PARAMS = {"voice", "style", "style_degree", "pitch", "rate"}
+
+    def __init__(self):
+        from src.tts.tts_engine import AzureTTS
+        self.tts = AzureTTS()
+
+    def synthesize(self, text, **params):
+        return self.tts.synthesize(text, self._filter_params(params))
+
+
+class StubEngine(TTSEngine):
+    """네트워크 없이 동작하는 테스트용 엔진 (글자 수에 비례한 길이의 삐 소리 WAV 생성)"""
+
+    name = "stub"
+
+    def __init__(self, sample_rate=16000, sec_per_char=0.06, frequency=440.0):
+        """
+        초기화
+
+        Args:
+            sample_rate: WAV 샘플레이트
+            sec_per_char: 글자당 길이 (초)
+            frequency: 소리 높이 (Hz, pitch/pitch_shift 파라미터로 조금씩 바뀜)
+        """
+        self.sample_rate = sample_rate
+        self.sec_per_char = sec_per_char
+        self.frequency = frequency
+
+    def synthesize(self, text, **params):
+        duration = min(max(len(text) * self.sec_per_char, 0.2), 3.0)
+        shift = params.get("pitch_shift", params.get("pitch", 0)) or 0
+        frequency = self.frequency * (2 ** (shift / 100))
+
+        count = int(self.sample_rate * duration)
+        step = 2 * math.pi * frequency / self.sample_rate
+        samples = array.array("h", (int(8000 * math.sin(step * i)) for i in range(count)))
+        if sys.byteorder == "big":
+            samples.byteswap()
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(self.sample_rate)
+            f.writeframes(samples.tobytes())
+
+        logger.debug(f"🔊 [stub] {text[:20]}... ({duration:.1f}초)")
+        return buffer.getvalue()
+
+
+def _hedged_engine():
+    # hedging 모듈이 이 모듈을 import하므로 실제로 쓸 때 가져옴
+    from src.tts.hedging import HedgedSynthesizer
+    return HedgedSynthesizer()
+
+
+_factories = {
+    "superton": SupertonEngine,
+    "azure": AzureEngine,
+    "stub": StubEngine,
+    "hedged": _hedged_engine,  # 주 엔진이 늦거나 실패하면 예비 엔진 사용 (TTS_HEDGE_PRIMARY/BACKUP)
+}
+_instances = {}
+_registry_lock = threading.Lock()
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def register_engine(name, factory):
+    """
+    엔진 등록 (같은 이름이 있으면 교체, 이미 만든 인스턴스는 버림)
+
+    Args:
+        name: 엔진 이름
+        factory: 인자 없이 호출하면 TTSEngine을 만드는 함수/클래스
+    """
+    with _registry_lock:
+        _factories[name] = factory
+        _instances.pop(name, None)
+
+
+def available_engines():
+    """등록된 엔진 이름 목록"""
+    with _registry_lock:
+        return sorted(_factories)
+
+
+def get_engine(name=None):
+    """
+    엔진 가져오기 (처음 요청할 때 한 번만 만들고 이후에는 같은 인스턴스 재사용)
+
+    Args:
+        name: 엔진 이름 (기본값: env의 TTS_ENGINE 또는 "superton")
+
+    Returns:
+        TTSEngine
+    """
+    name = name or os.getenv("TTS_ENGINE", "superton")
+    with _registry_lock:
+        engine = _instances.get(name)
+        if engine is None:
+            factory = _factories.get(name)
+            if factory is None:
+                raise ValueError(f"❌ 알 수 없는 TTS 엔진: {name} (사용 가능: {', '.join(sorted(_factories))})")
+            engine = factory()
+            _instances[name] = engine
+        return engine
+
+
+def get_listener():
+    """
+    모든 엔진이 함께 쓰는 음성 인식 세션 (Azure Speech 설정이 없으면 None)
+
+    Returns:
+        RecognitionSession 또는 None
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            speech_key = os.getenv("AZURE_SPEECH_KEY")
+            service_region = os.getenv("AZURE_SPEECH_REGION")
+            if not speech_key or not service_region:
+                return None
+
+            import azure.cognitiveservices.speech as speechsdk
+            from src.tts.speech_session import create_recognizer
+
+            speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=service_region)
+            speech_config.speech_recognition_language = "ko-KR"
+            _listener = create_recognizer(speech_config)
+        return _listener
@@ -0,0 +1,238 @@
+import os
+import sys
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.logger import get_logger
+from src.core.tracing import tracer
+from src.tts.engine_registry import TTSEngine, get_engine
+
+logger = get_logger("tts.hedging")
+
+
+class CircuitBreaker:
+    """연속으로 실패하는 엔진은 잠시 쓰지 않고 건너뜀 (일정 시간 뒤 한 번 시험해 보고 복구)"""
+
+    def __init__(self, failure_threshold=None, reset_timeout=None):
+        """
+        초기화
+
+        Args:
+            failure_threshold: 이만큼 연속 실패하면 차단 (기본값: env의 TTS_BREAKER_FAILURES 또는 3)
+            reset_timeout: 차단 후 이 시간(초)이 지나면 요청 하나를 시험 삼아 허용
+                           (기본값: env의 TTS_BREAKER_RESET_SEC 또는 30)
+        """
+        self.failure_threshold = failure_threshold or int(os.getenv("TTS_BREAKER_FAILURES", "3"))
+        self.reset_timeout = reset_timeout or float(os.getenv("TTS_BREAKER_RESET_SEC", "30"))
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        """"closed"(정상), "open"(차단), "half_open"(시험 중)"""
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        """
+        지금 이 엔진으로 요청해도 되는지
+
+        Returns:
+            bool: 정상이거나 시험 요청 차례면 True
+        """
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                # 시험 요청이 실패해도 다시 차단 (차단 시간 새로 시작)
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """최근 응답 시간으로 백분위수 계산 (헤지 요청을 언제 보낼지 결정)"""
+
+    def __init__(self, window=100):
+        """
+        초기화
+
+        Args:
+            window: 기억할 최근 응답 수
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, p):
+        """
+        백분위수 (샘플이 없으면 None)
+
+        Args:
+            p: 0 ~ 100
+
+        Returns:
+            float (초) 또는 None
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, round(p / 100 * (len(samples) - 1))))
+        return samples[index]
+
+
+class HedgedSynthesizer(TTSEngine):
+    """주 엔진에 먼저 요청하고, 평소(p95)보다 늦어지면 예비 엔진에도 요청해서 먼저 온 음성을 사용
+    차단된(circuit open) 엔진은 아예 건너뜀
+    """
+
+    name = "hedged"
+
+    def __init__(self, primary=None, backup=None, min_delay=None, max_delay=None, percentile=95):
+        """
+        초기화
+
+        Args:
+            primary: 주 엔진 이름 (기본값: env의 TTS_HEDGE_PRIMARY 또는 "superton")
+            backup: 예비 엔진 이름 (기본값: env의 TTS_HEDGE_BACKUP 또는 "azure")
+            min_delay: 헤지 요청 최소 대기 시간 (초, 기본값: env의 TTS_HEDGE_MIN_DELAY_MS 또는 300ms)
+            max_delay: 헤지 요청 최대 대기 시간 (초, 기본값: env의 TTS_HEDGE_MAX_DELAY_MS 또는 3000ms)
+                       응답 기록이 부족할 때도 이 값을 사용
+            percentile: 이 백분위수 응답 시간이 지나면 헤지 요청
+        """
+        self.primary = primary or os.getenv("TTS_HEDGE_PRIMARY", "superton")
+        self.backup = backup or os.getenv("TTS_HEDGE_BACKUP", "azure")
+        self.min_delay = min_delay if min_delay is not None else int(os.getenv("TTS_HEDGE_MIN_DELAY_MS", "300")) / 1000
+        self.max_delay = max_delay if max_delay is not None else int(os.getenv("TTS_HEDGE_MAX_DELAY_MS", "3000")) / 1000
+        self.percentile = percentile
+
+        self.breakers = {self.primary: CircuitBreaker(), self.backup: CircuitBreaker()}
+        self.latency = {self.primary: LatencyTracker(), self.backup: LatencyTracker()}
+        self.hedged = 0       # 헤지 요청을 보낸 횟수
+        self.backup_wins = 0  # 예비 엔진 음성을 쓴 횟수
+
+        # 진 쪽 요청은 끊을 수 없으므로 끝날 때까지 돌도록 넉넉하게
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts-hedge")
+
+    def hedge_delay(self):
+        """주 엔진의 p95 응답 시간 (min_delay ~ max_delay 사이로 제한)"""
+        tracker = self.latency[self.primary]
+        if len(tracker) < 5:
+            return self.max_delay
+        return min(self.max_delay, max(self.min_delay, tracker.percentile(self.percentile)))
+
+    def _call(self, name, text, params):
+        """엔진 하나로 합성하고 결과를 차단기/응답 시간에 기록"""
+        start = time.perf_counter()
+        try:
+            audio_data = get_engine(name).synthesize(text, **params)
+        except Exception as e:
+            logger.error(f"❌ [{name}] 합성 오류: {e}")
+            audio_data = None
+
+        if audio_data:
+            self.breakers[name].record_success()
+            self.latency[name].record(time.perf_counter() - start)
+        else:
+            self.breakers[name].record_failure()
+            if self.breakers[name].state == "open":
+                logger.warning(f"⚠️  [{name}] 연속 실패로 잠시 사용 중지")
+        return audio_data
+
+    def _start_backup(self, futures, first, text, params, reason):
+        """예비 엔진에도 요청 (차단기가 허락할 때만, 시험 요청 차례를 헛되이 쓰지 않도록 필요할 때 확인)"""
+        second = self.backup if first == self.primary else None
+        if second is None or not self.breakers[second].allow():
+            return None
+        logger.info(f"{reason} [{second}]로 요청")
+        future = self._executor.submit(tracer.bind(self._call), second, text, params)
+        futures[future] = second
+        return future
+
+    def synthesize(self, text, **params):
+        if self.breakers[self.primary].allow():
+            first = self.primary
+        elif self.breakers[self.backup].allow():
+            first = self.backup
+        else:
+            logger.error("❌ 사용 가능한 TTS 엔진이 없습니다.")
+            return None
+
+        futures = {self._executor.submit(tracer.bind(self._call), first, text, params): first}
+
+        done, _ = wait(futures, timeout=self.hedge_delay())
+        if not done and self._start_backup(futures, first, text, params, f"⏱️  [{first}] 응답 지연,"):
+            # 주 엔진이 평소보다 늦음 → 예비 엔진 요청도 보내고 먼저 오는 쪽 사용
+            self.hedged += 1
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                audio_data = future.result()
+                if audio_data:
+                    # 진 쪽은 시작 전이면 취소, 이미 요청 중이면 결과만 버림
+                    for loser in pending:
+                        loser.cancel()
+                    if futures[future] != self.primary:
+                        self.backup_wins += 1
+                    return audio_data
+
+            # 주 엔진이 빨리 실패했으면 헤지 시간까지 기다리지 않고 바로 예비 엔진으로
+            if not pending and len(futures) == 1:
+                future = self._start_backup(futures, first, text, params, f"🔁 [{first}] 실패,")
+                if future:
+                    pending = {future}
+
+        return None
+
+    def stats(self):
+        """
+        헤지 통계
+
+        Returns:
+            dict: {hedged, backup_wins, hedge_delay, breakers: {엔진: 상태}}
+        """
+        return {
+            "hedged": self.hedged,
+            "backup_wins": self.backup_wins,
+            "hedge_delay": self.hedge_delay(),
+            "breakers": {name: breaker.state for name, breaker in self.breakers.items()},
+        }
@@ -1,3 +1,4 @@
+import io
 import os
 import time
 import azure.cognitiveservices.speech as speechsdk
@@ -46,10 +47,6 @@ class AzureTTS:
             f'</prosody></mstts:express-as></voice></speak>'
         )
 
-        # 절대 경로로 파일명 설정
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        temp_filename = os.path.join(current_dir, "temp_output.mp3")
-
         # 4. Azure 합성기 생성 (스피커 사용 X -> 데이터만 받음)
         synthesizer = speechsdk.SpeechSynthesizer(speech_config=self.speech_config, audio_config=None)
 
@@ -59,14 +56,12 @@ class AzureTTS:
         result = synthesizer.speak_ssml_async(ssml_string).get()
 
         if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-            # 6. 받은 데이터를 직접 파일로 저장 (오류 원천 차단)
-            audio_data = result.audio_data
-            with open(temp_filename, "wb") as f:
-                f.write(audio_data)
+            # 6. 받은 데이터를 파일 없이 메모리 버퍼로 바로 재생
+            audio_buffer = io.BytesIO(result.audio_data)
             
             # 7. Pygame으로 재생
             try:
-                pygame.mixer.music.load(temp_filename)
+                pygame.mixer.music.load(audio_buffer, "mp3")
                 pygame.mixer.music.play()
                 while pygame.mixer.music.get_busy():
                     pygame.time.Clock().tick(10)
@@ -74,13 +69,6 @@ class AzureTTS:
             except Exception as e:
                 print(f"❌ 재생 오류: {e}")
 
-            # 파일 정리
-            try:
-                if os.path.exists(temp_filename):
-                    os.remove(temp_filename)
-            except:
-                pass
-
         elif result.reason == speechsdk.ResultReason.Canceled:
             details = result.cancellation_details
             print(f"❌ [Azure 오류] {details.error_details}")
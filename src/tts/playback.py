@@ -0,0 +1,81 @@
+import io
+import threading
+import pygame
+
+from src.core.tracing import tracer
+
+# pygame.mixer.music는 프로세스에 하나뿐이므로 재생은 한 번에 하나씩
+_play_lock = threading.Lock()
+_mixer_lock = threading.Lock()
+
+
+def ensure_mixer():
+    """믹서는 처음 재생할 때 한 번만 초기화 (엔진마다 init하지 않음, 재생 안 하는 배치/서버는 오디오 장치 불필요)"""
+    if pygame.mixer.get_init():
+        return
+    with _mixer_lock:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+
+def guess_format(audio_data):
+    """
+    바이트 헤더로 음성 형식 추정
+
+    Args:
+        audio_data: 음성 바이트 데이터
+
+    Returns:
+        str: "wav", "mp3", "ogg" 또는 "" (알 수 없음)
+    """
+    if audio_data[:4] == b"RIFF":
+        return "wav"
+    if audio_data[:4] == b"OggS":
+        return "ogg"
+    if audio_data[:3] == b"ID3" or (len(audio_data) > 1 and audio_data[0] == 0xFF and audio_data[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return ""
+
+
+def play_audio_bytes(audio_data, namehint=None, interrupt=None):
+    """
+    음성 바이트 데이터를 파일 없이 메모리에서 바로 재생 (재생이 끝날 때까지 대기)
+
+    Args:
+        audio_data: 음성 바이트 데이터 (WAV/MP3/OGG)
+        namehint: 형식 힌트 ("wav", "mp3" 등, 기본값: 헤더로 추정)
+        interrupt: threading.Event (set되면 1/30초 안에 재생을 멈춤, 끼어들기용)
+
+    Returns:
+        bool: 끝까지 재생하지 못하고 중간에 멈췄으면 True
+    """
+    if namehint is None:
+        namehint = guess_format(audio_data)
+
+    ensure_mixer()
+
+    interrupted = False
+    with _play_lock, tracer.span("tts.playback", format=namehint) as attrs:
+        # BytesIO는 unload() 전까지 살아 있어야 함 (믹서가 스트리밍으로 읽음)
+        buffer = io.BytesIO(audio_data)
+        pygame.mixer.music.load(buffer, namehint)
+        pygame.mixer.music.play()
+
+        clock = pygame.time.Clock()
+        while pygame.mixer.music.get_busy():
+            if interrupt is not None and interrupt.is_set():
+                pygame.mixer.music.stop()
+                interrupted = True
+                attrs["interrupted"] = True
+                break
+            clock.tick(30)
+
+        pygame.mixer.music.unload()
+
+    return interrupted
+
+
+def stop_playback():
+    """다른 스레드에서 재생 중인 음성을 바로 멈춤 (재생 중이던 play_audio_bytes는 곧 반환됨)"""
+    if pygame.mixer.get_init():
+        pygame.mixer.music.stop()
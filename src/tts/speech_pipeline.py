@@ -0,0 +1,168 @@
+import re
+import queue
+import threading
+
+from src.core.logger import get_logger
+from src.core.tracing import tracer
+
+logger = get_logger("tts.pipeline")
+
+# 문장 끝 판단: 마침표/물음표/느낌표/말줄임표/물결 + 닫는 따옴표·괄호, 또는 줄바꿈
+_SENTENCE_END = re.compile(r'([.!?。…~]+["\'”’)\]]*)(\s+|$)|\n+')
+
+# 너무 짧은 조각("응!")은 다음 문장과 합쳐서 합성 요청 수를 줄임
+MIN_CHUNK_CHARS = 8
+
+_END = object()
+
+
+def split_sentences(text, min_chars=MIN_CHUNK_CHARS):
+    """
+    텍스트를 한국어 문장 단위로 분리
+
+    Args:
+        text: 전체 텍스트
+        min_chars: 이보다 짧은 문장은 다음 문장과 합침
+
+    Returns:
+        list: 문장 리스트
+    """
+    sentences = []
+    buffer = ""
+    pos = 0
+
+    for match in _SENTENCE_END.finditer(text):
+        buffer += text[pos:match.end(1) if match.group(1) else match.start()]
+        pos = match.end()
+        if len(buffer.strip()) >= min_chars:
+            sentences.append(buffer.strip())
+            buffer = ""
+        elif buffer.strip():
+            buffer += " "
+
+    buffer += text[pos:]
+    if buffer.strip():
+        sentences.append(buffer.strip())
+
+    return sentences
+
+
+def iter_sentences(pieces, min_chars=MIN_CHUNK_CHARS):
+    """
+    LLM 토큰 스트림을 받아 문장이 완성될 때마다 반환 (제너레이터)
+
+    Args:
+        pieces: 텍스트 조각 iterable (예: ChipiBrain.stream_run())
+        min_chars: 이보다 짧은 문장은 다음 문장과 합침
+
+    Yields:
+        str: 완성된 문장
+    """
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        cut = 0
+
+        for match in _SENTENCE_END.finditer(buffer):
+            # 버퍼 끝에 걸친 구두점은 뒤에 글자가 더 붙을 수 있으므로 다음 조각까지 대기
+            if match.end() >= len(buffer):
+                break
+            end = match.end(1) if match.group(1) else match.start()
+            sentence = buffer[cut:end].strip()
+            if len(sentence) >= min_chars:
+                yield sentence
+                cut = match.end()
+
+        buffer = buffer[cut:]
+
+    for sentence in split_sentences(buffer, min_chars):
+        yield sentence
+
+
+def to_sentences(text_or_pieces, spoken=None):
+    """
+    문자열이면 문장 분리, 스트림이면 문장이 완성되는 대로 반환
+
+    Args:
+        text_or_pieces: 전체 텍스트(str) 또는 텍스트 조각 iterable
+        spoken: 리스트를 넘기면 반환한 문장을 차례로 기록
+
+    Yields:
+        str: 문장
+    """
+    if isinstance(text_or_pieces, str):
+        sentences = split_sentences(text_or_pieces)
+    else:
+        sentences = iter_sentences(text_or_pieces)
+
+    for sentence in sentences:
+        if spoken is not None:
+            spoken.append(sentence)
+        yield sentence
+
+
+class SpeechPipeline:
+    """문장 N을 재생하는 동안 문장 N+1을 합성하는 파이프라인"""
+
+    def __init__(self, synthesize, play, prefetch=1):
+        """
+        초기화
+
+        Args:
+            synthesize: 문장 -> 음성 바이트 (실패 시 None) 함수
+            play: 음성 바이트를 재생하는 함수 (재생이 끝날 때까지 블록,
+                  True를 반환하면 사용자가 끼어든 것으로 보고 남은 문장 취소)
+            prefetch: 재생 대기열에 미리 합성해 둘 문장 수
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self.prefetch = max(1, prefetch)
+        self._stop = threading.Event()
+
+    def stop(self):
+        """남은 문장 합성/재생 취소"""
+        self._stop.set()
+
+    def _produce(self, sentences, audio_queue):
+        try:
+            for sentence in sentences:
+                if self._stop.is_set():
+                    break
+                audio_data = self.synthesize(sentence)
+                if audio_data:
+                    audio_queue.put(audio_data)
+        except Exception as e:
+            logger.error(f"❌ 파이프라인 합성 오류: {e}")
+        finally:
+            # 취소됐으면 남은 스트림을 닫아서 LLM 응답 생성도 멈춤 (생산자 스레드에서만 닫을 수 있음)
+            if self._stop.is_set() and hasattr(sentences, "close"):
+                try:
+                    sentences.close()
+                except Exception as e:
+                    logger.warning(f"⚠️  스트림 종료 오류: {e}")
+            audio_queue.put(_END)
+
+    def run(self, sentences):
+        """
+        문장들을 순서대로 합성하면서 재생 (재생이 모두 끝나면 반환)
+
+        Args:
+            sentences: 문장 iterable (리스트 또는 제너레이터)
+        """
+        self._stop.clear()
+        audio_queue = queue.Queue(maxsize=self.prefetch)
+
+        # 합성/LLM 스트림 span도 호출한 쪽 턴 ID로 기록
+        producer = threading.Thread(target=tracer.bind(self._produce), args=(sentences, audio_queue), daemon=True)
+        producer.start()
+
+        while True:
+            audio_data = audio_queue.get()
+            if audio_data is _END:
+                break
+            if self._stop.is_set():
+                continue  # 생산자가 끝날 수 있도록 대기열만 비움
+            if self.play(audio_data):
+                self.stop()
+
+        producer.join()
@@ -0,0 +1,419 @@
+import os
+import time
+import queue
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import azure.cognitiveservices.speech as speechsdk
+
+from src.core.logger import get_logger
+
+logger = get_logger("stt")
+
+try:
+    import sounddevice as sd
+    from src.tts.vad import EnergyVAD, VADGate
+except ImportError:
+    sd = None
+
+
+class RecognitionSession(ABC):
+    """인식된 문장 큐와 재생 중 음소거/끼어들기 처리 (마이크를 어떻게 읽는지는 하위 클래스의 start/stop에서 구현)"""
+
+    def __init__(self, speech_config, mute_tail_sec=0.7, barge_in=None):
+        """
+        초기화
+
+        Args:
+            speech_config: speechsdk.SpeechConfig (인식 언어 설정 포함)
+            mute_tail_sec: 재생이 끝난 뒤에도 이 시간 동안 들어온 인식 결과는 버림
+                           (문장 끝 판정이 늦게 와서 치피 목소리가 섞이는 것 방지)
+            barge_in: True면 재생 중에도 계속 듣고, 사용자가 말하기 시작하면 재생을 끊음
+                      (기본값: env의 CHIPI_BARGE_IN, 스피커 소리가 마이크로 들어가지 않는
+                       헤드셋/에코 제거 마이크에서만 켤 것)
+        """
+        self.speech_config = speech_config
+        self.mute_tail_sec = mute_tail_sec
+
+        if barge_in is None:
+            barge_in = os.getenv("CHIPI_BARGE_IN", "0") == "1"
+        self.barge_in = barge_in
+        self.speech_detected = threading.Event()  # 사용자가 말하기 시작하면 set (재생 중단 신호)
+        self.on_partial = None  # 중간 인식 결과를 받을 함수 (text) -> None (미리 응답 생성용, 인식 스레드에서 호출)
+
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._running = False
+        self._mute_count = 0
+        self._muted_until = 0.0
+
+    @abstractmethod
+    def start(self):
+        """마이크와 인식을 시작 (이미 실행 중이면 무시, 성공하면 self._running = True)"""
+
+    @abstractmethod
+    def stop(self):
+        """인식 종료 및 리소스 해제 (실행 중이 아니어도 호출될 수 있음)"""
+
+    def _is_muted(self):
+        return self._mute_count > 0 or time.monotonic() < self._muted_until
+
+    @contextmanager
+    def muted(self):
+        """이 블록 동안(치피가 말하는 동안) 인식된 문장은 버림"""
+        with self._lock:
+            self._mute_count += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._mute_count -= 1
+                self._muted_until = time.monotonic() + self.mute_tail_sec
+            self.clear()
+
+    @contextmanager
+    def playback(self):
+        """
+        치피 음성을 재생하는 동안 감싸는 블록
+
+        Yields:
+            끼어들기 모드면 사용자 발화 감지 Event (play_audio_bytes의 interrupt로 넘김),
+            아니면 None (재생하는 동안 인식 결과를 버림)
+        """
+        if self.barge_in:
+            yield self.speech_detected
+        else:
+            with self.muted():
+                yield None
+
+    def _emit_partial(self, text):
+        callback = self.on_partial
+        if callback is None or not text or self._is_muted():
+            return
+        try:
+            callback(text)
+        except Exception as e:
+            logger.warning(f"⚠️  중간 인식 결과 처리 오류: {e}")
+
+    def clear(self):
+        """쌓여 있던 인식 결과 버리기"""
+        while True:
+            try:
+                self._results.get_nowait()
+            except queue.Empty:
+                return
+
+    def listen(self, timeout=None):
+        """
+        다음 인식 문장 꺼내기 (세션이 끊겼으면 다시 연결)
+
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 말할 때까지 대기)
+
+        Returns:
+            인식된 텍스트 또는 None (시간 초과 / 연결 끊김)
+        """
+        if not self._running:
+            self.stop()
+            self.start()
+
+        try:
+            text = self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        # 이 발화는 처리 시작 - 다음 응답 재생 중에 새로 말하면 다시 set됨
+        self.speech_detected.clear()
+        return text
+
+
+class ContinuousRecognizer(RecognitionSession):
+    """마이크와 서비스 연결을 한 번만 열어두고 계속 인식하는 세션 (인식된 문장은 큐에 쌓임)"""
+
+    def __init__(self, speech_config, segmentation_silence_ms=1000, mute_tail_sec=0.7,
+                 barge_in=None, barge_in_min_chars=None):
+        """
+        초기화
+
+        Args:
+            speech_config: speechsdk.SpeechConfig (인식 언어 설정 포함)
+            segmentation_silence_ms: 말이 끝났다고 판단할 침묵 시간 (ms)
+            mute_tail_sec: RecognitionSession 참고
+            barge_in: RecognitionSession 참고
+            barge_in_min_chars: 중간 인식 결과가 이 글자 수 이상이어야 끼어들기로 판단
+                                (기본값: env의 CHIPI_BARGE_IN_MIN_CHARS 또는 2, 잡음 무시용)
+        """
+        super().__init__(speech_config, mute_tail_sec, barge_in)
+        self.segmentation_silence_ms = segmentation_silence_ms
+        self.barge_in_min_chars = barge_in_min_chars or int(os.getenv("CHIPI_BARGE_IN_MIN_CHARS", "2"))
+
+        self.audio_config = None
+        self.recognizer = None
+        self.connection = None
+
+    def start(self):
+        """마이크를 열고 서비스에 미리 연결한 뒤 연속 인식 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._running:
+                return
+
+            self.audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
+            self.recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config,
+                                                         audio_config=self.audio_config)
+            self.recognizer.properties.set_property_by_name("Speech_SegmentationSilenceTimeoutMs",
+                                                            str(self.segmentation_silence_ms))
+
+            self.recognizer.recognizing.connect(self._on_recognizing)
+            self.recognizer.recognized.connect(self._on_recognized)
+            self.recognizer.canceled.connect(self._on_canceled)
+            self.recognizer.session_stopped.connect(self._on_session_stopped)
+
+            # 첫 발화 전에 서비스 연결을 미리 열어둠 (첫 턴 지연 제거)
+            self.connection = speechsdk.Connection.from_recognizer(self.recognizer)
+            self.connection.open(True)
+
+            self.recognizer.start_continuous_recognition_async().get()
+            self._running = True
+            logger.info("🎙️  연속 음성 인식 시작")
+
+    def stop(self):
+        """연속 인식 종료 및 리소스 해제"""
+        with self._lock:
+            recognizer, connection = self.recognizer, self.connection
+            self._running = False
+            self.recognizer = None
+            self.audio_config = None
+            self.connection = None
+
+        if recognizer is not None:
+            try:
+                recognizer.stop_continuous_recognition_async().get()
+            except Exception as e:
+                logger.warning(f"⚠️  음성 인식 종료 오류: {e}")
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        # 종료하면서 들어온 깨우기 신호는 버림
+        self.clear()
+
+    def _on_recognizing(self, evt):
+        # 중간 인식 결과가 나오기 시작하면 사용자가 말하는 중
+        text = evt.result.text.strip()
+        if len(text) >= self.barge_in_min_chars:
+            self.speech_detected.set()
+        self._emit_partial(text)
+
+    def _on_recognized(self, evt):
+        if evt.result.reason != speechsdk.ResultReason.RecognizedSpeech:
+            return
+        text = evt.result.text.strip()
+        if text and not self._is_muted():
+            self.speech_detected.set()
+            self._results.put(text)
+
+    def _on_canceled(self, evt):
+        if evt.reason == speechsdk.CancellationReason.Error:
+            logger.error(f"❌ 음성 인식 오류: {evt.error_details}")
+        # 다음 listen()에서 다시 연결하도록 표시하고, 기다리던 listen()은 None으로 깨움
+        self._running = False
+        self._results.put(None)
+
+    def _on_session_stopped(self, evt):
+        self._running = False
+        self._results.put(None)
+
+
+class VADRecognizer(RecognitionSession):
+    """로컬 VAD로 말소리 구간만 Azure로 보내는 세션
+    조용할 때는 오디오를 보내지 않고, 발화 끝도 로컬에서 판정해서 바로 스트림을 닫음 (서버 침묵 대기 없음)
+    """
+
+    def __init__(self, speech_config, sample_rate=16000, block_ms=20, vad=None, pre_roll_ms=300,
+                 mute_tail_sec=0.7, barge_in=None):
+        """
+        초기화
+
+        Args:
+            speech_config: speechsdk.SpeechConfig (인식 언어 설정 포함)
+            sample_rate: 마이크 샘플레이트 (16bit 모노로 녹음)
+            block_ms: 마이크에서 한 번에 읽을 길이 (ms)
+            vad: EnergyVAD (기본값: env 설정으로 생성)
+            pre_roll_ms: 발화 시작 판정 전 오디오를 이만큼 같이 보냄 (첫 음절 잘림 방지)
+            mute_tail_sec: RecognitionSession 참고
+            barge_in: RecognitionSession 참고
+        """
+        if sd is None:
+            raise ImportError("❌ 로컬 VAD에는 numpy와 sounddevice가 필요합니다. (pip install numpy sounddevice)")
+
+        super().__init__(speech_config, mute_tail_sec, barge_in)
+        self.sample_rate = sample_rate
+        self.block_size = int(sample_rate * block_ms / 1000)
+        self.gate = VADGate(vad or EnergyVAD(sample_rate=sample_rate), pre_roll_ms=pre_roll_ms)
+        self.stream_format = speechsdk.audio.AudioStreamFormat(samples_per_second=sample_rate,
+                                                               bits_per_sample=16, channels=1)
+
+        self._stream = None
+        self._thread = None
+        self._next = None  # 다음 발화용으로 미리 연결해 둔 (push 스트림, 인식기, 연결)
+        self._preparing = False  # 다른 스레드에서 _next를 준비하는 중
+        self._next_lock = threading.Lock()
+
+    def _prepare(self, open_connection=True):
+        """
+        발화 하나를 받을 push 스트림/인식기 만들기
+
+        Args:
+            open_connection: 서비스 연결을 미리 열어둘지 (네트워크 왕복만큼 블로킹,
+                             False면 인식을 시작할 때 SDK가 백그라운드에서 연결)
+        """
+        push_stream = speechsdk.audio.PushAudioInputStream(stream_format=self.stream_format)
+        audio_config = speechsdk.audio.AudioConfig(stream=push_stream)
+        recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, audio_config=audio_config)
+        recognizer.recognizing.connect(lambda evt: self._emit_partial(evt.result.text.strip()))
+        connection = speechsdk.Connection.from_recognizer(recognizer)
+        if open_connection:
+            connection.open(False)
+        return push_stream, recognizer, connection
+
+    def _take_prepared(self):
+        """미리 연결해 둔 인식기 꺼내기 (캡처 스레드에서 호출하므로 연결이 준비되지 않았어도 기다리지 않음)"""
+        with self._next_lock:
+            prepared, self._next = self._next, None
+        if prepared is not None:
+            return prepared
+        # 아직 준비 중이거나 준비에 실패함 → 연결은 SDK가 인식 시작할 때 열도록 두고 마이크 읽기는 계속
+        logger.debug("🎙️  미리 연결된 인식기 없음, 연결 없이 인식 시작")
+        return self._prepare(open_connection=False)
+
+    def _prepare_next(self):
+        """다음 발화용 연결 준비 (캡처 스레드 밖에서 호출, 이미 준비됐거나 다른 스레드에서 준비 중이면 무시)"""
+        with self._next_lock:
+            if self._next is not None or self._preparing:
+                return
+            self._preparing = True
+
+        prepared = None
+        try:
+            prepared = self._prepare()
+        except Exception as e:
+            logger.warning(f"⚠️  음성 인식 연결 준비 오류: {e}")
+        finally:
+            with self._next_lock:
+                self._next = prepared
+                self._preparing = False
+
+    def _finish_async(self, future, current):
+        """발화 스트림을 닫고 최종 결과 처리/다음 연결 준비는 별도 스레드에서 (캡처 스레드는 바로 다음 블록을 읽음)"""
+        current[0].close()
+        threading.Thread(target=self._finish, args=(future, current), daemon=True).start()
+
+    def start(self):
+        """마이크 녹음과 VAD 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._running:
+                return
+
+            self._prepare_next()
+            self.gate.reset()
+            self._stream = sd.RawInputStream(samplerate=self.sample_rate, channels=1, dtype="int16",
+                                             blocksize=self.block_size)
+            self._stream.start()
+            self._running = True
+            self._thread = threading.Thread(target=self._capture_loop, args=(self._stream,), daemon=True)
+            self._thread.start()
+            logger.info("🎙️  로컬 VAD 음성 인식 시작")
+
+    def stop(self):
+        """녹음 종료 및 리소스 해제"""
+        with self._lock:
+            self._running = False
+            stream, thread = self._stream, self._thread
+            self._stream = None
+            self._thread = None
+
+        if thread is not None:
+            thread.join(timeout=1.0)
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                logger.warning(f"⚠️  마이크 종료 오류: {e}")
+        self.clear()
+
+    def _capture_loop(self, stream):
+        current = None  # 지금 발화를 받고 있는 (push 스트림, 인식기, 연결)
+        future = None
+
+        try:
+            while self._running:
+                data, _ = stream.read(self.block_size)
+
+                # 치피가 말하는 동안(음소거)에는 마이크 입력을 아예 보지 않음
+                if self._is_muted():
+                    if current is not None:
+                        # 받던 발화는 끝냄 (음소거 중이라 결과는 버려지고, 다음 발화용 연결은 _finish에서 준비)
+                        self._finish_async(future, current)
+                        current = None
+                    self.gate.reset()
+                    continue
+
+                pcm, started, ended = self.gate.feed(bytes(data))
+
+                if started:
+                    self.speech_detected.set()
+                    current = self._take_prepared()
+                    future = current[1].recognize_once_async()
+
+                if pcm and current is not None:
+                    current[0].write(pcm)
+
+                if ended and current is not None:
+                    # 로컬에서 발화 끝 판정 → 스트림을 닫으면 서버가 바로 최종 결과를 돌려줌
+                    self._finish_async(future, current)
+                    current = None
+        except Exception as e:
+            logger.error(f"❌ 마이크 읽기 오류: {e}")
+            self._running = False
+            self._results.put(None)
+
+    def _finish(self, future, current):
+        """최종 인식 결과를 큐에 넣고 다음 발화용 연결 준비"""
+        try:
+            result = future.get()
+            if result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                text = result.text.strip()
+                if text and not self._is_muted():
+                    self._results.put(text)
+            elif result.reason == speechsdk.ResultReason.Canceled:
+                logger.error(f"❌ 음성 인식 오류: {result.cancellation_details.error_details}")
+        except Exception as e:
+            logger.error(f"❌ 음성 인식 오류: {e}")
+        finally:
+            try:
+                current[2].close()
+            except Exception:
+                pass
+
+        if self._running:
+            self._prepare_next()
+
+
+def create_recognizer(speech_config):
+    """
+    env 설정에 맞는 인식 세션 생성
+    CHIPI_LOCAL_VAD=1이면 로컬 VAD 세션, 아니면 연속 인식 세션
+
+    Args:
+        speech_config: speechsdk.SpeechConfig
+
+    Returns:
+        RecognitionSession
+    """
+    if os.getenv("CHIPI_LOCAL_VAD", "0") == "1":
+        if sd is not None:
+            return VADRecognizer(speech_config)
+        logger.warning("⚠️  numpy/sounddevice가 없어 로컬 VAD 없이 연속 인식을 사용합니다.")
+    return ContinuousRecognizer(speech_config)
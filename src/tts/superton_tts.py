@@ -1,30 +1,96 @@
 import os
+import sys
+import time
+import random
+import threading
+from contextlib import nullcontext
 import requests
-import pygame
+from requests.adapters import HTTPAdapter
 import azure.cognitiveservices.speech as speechsdk
 from dotenv import load_dotenv
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.logger import get_logger
+from src.core.tracing import tracer
+from src.tts.audio_cache import AudioCache
+from src.tts.playback import play_audio_bytes
+from src.tts.speech_pipeline import SpeechPipeline, to_sentences
+from src.tts.speech_session import create_recognizer
+
 load_dotenv()
 
+logger = get_logger("tts.superton")
+
+# 재시도할 HTTP 상태 코드 (요청 한도 초과 / 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session(pool_size=None):
+    """
+    SuperTone API용 공유 HTTP 세션 (keep-alive 커넥션 풀)
+    처음 한 번만 TCP/TLS 핸드셰이크를 하고 이후 요청은 연결을 재사용함
+
+    Args:
+        pool_size: 커넥션 풀 크기 (기본값: env의 SUPERTON_POOL_SIZE 또는 10, 첫 호출에만 적용)
+
+    Returns:
+        requests.Session
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            pool_size = pool_size or int(os.getenv("SUPERTON_POOL_SIZE", "10"))
+            session = requests.Session()
+            # 재시도는 SupertonTTS._request에서 직접 처리 (지터 백오프)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount("https://", adapter)
+            _shared_session = session
+        return _shared_session
+
 
 class SupertonTTS:
     """SuperTone API를 사용한 TTS 클래스"""
 
-    def __init__(self, voice_id=None, api_key=None):
+    def __init__(self, voice_id=None, api_key=None, cache_dir=None, use_cache=True,
+                 pool_size=None, max_retries=None):
         """
         초기화
 
         Args:
             voice_id: 음성 ID (기본값: env의 SUPERTON_VOICE_ID)
             api_key: API 키 (기본값: env의 SUPERTON_API_KEY)
+            cache_dir: 음성 캐시 폴더 (기본값: env의 SUPERTON_CACHE_DIR 또는 .cache/superton)
+            use_cache: False면 캐시를 쓰지 않고 매번 API 호출
+            pool_size: HTTP 커넥션 풀 크기 (기본값: env의 SUPERTON_POOL_SIZE 또는 10)
+            max_retries: 429/5xx/연결 오류 시 재시도 횟수 (기본값: env의 SUPERTON_MAX_RETRIES 또는 2)
         """
         self.api_key = api_key or os.getenv("SUPERTON_API_KEY")
         self.voice_id = voice_id or os.getenv("SUPERTON_VOICE_ID")
+        self.model = "sona_speech_1"
 
         if not self.api_key:
             raise ValueError("❌ SUPERTON_API_KEY가 설정되지 않았습니다.")
 
-        pygame.mixer.init()
+        # HTTP 설정: 공유 커넥션 풀 + 연결/응답 타임아웃 분리 + 재시도
+        self.session = get_shared_session(pool_size)
+        self.connect_timeout = float(os.getenv("SUPERTON_CONNECT_TIMEOUT", "3.05"))
+        self.read_timeout = float(os.getenv("SUPERTON_READ_TIMEOUT", "30"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("SUPERTON_MAX_RETRIES", "2"))
+        self.backoff_base = 0.5
+        self.backoff_max = 8.0
+
+        # 자주 쓰는 문장은 디스크 캐시에서 바로 재생 (네트워크/쿼터 절약)
+        if use_cache:
+            cache_dir = cache_dir or os.getenv("SUPERTON_CACHE_DIR") or os.path.join(PROJECT_ROOT, ".cache", "superton")
+            max_mb = int(os.getenv("SUPERTON_CACHE_MAX_MB", "200"))
+            self.cache = AudioCache(cache_dir, max_bytes=max_mb * 1024 * 1024)
+        else:
+            self.cache = None
 
         # Azure Speech 설정 (음성 인식용)
         self.speech_key = os.getenv("AZURE_SPEECH_KEY")
@@ -35,6 +101,49 @@ class SupertonTTS:
             self.speech_config.speech_recognition_language = "ko-KR"
         else:
             self.speech_config = None
+        self.recognition = None  # 첫 listen() 때 인식 세션 시작 (CHIPI_LOCAL_VAD=1이면 로컬 VAD 사용)
+
+    def _backoff_delay(self, attempt, response=None):
+        """재시도 대기 시간 (Retry-After 헤더 우선, 없으면 full jitter 지수 백오프)"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _request(self, method, url, read_timeout=None, **kwargs):
+        """
+        공유 세션으로 요청하고 429/5xx/연결 오류는 지터 백오프로 재시도
+        (응답 대기 시간 초과는 재시도하지 않음 - 이미 오래 기다렸으므로)
+
+        Args:
+            method: "GET" 또는 "POST"
+            url: 요청 URL
+            read_timeout: 응답 대기 시간 (기본값: self.read_timeout)
+            kwargs: requests에 그대로 전달할 인자
+
+        Returns:
+            requests.Response
+        """
+        timeout = (self.connect_timeout, read_timeout or self.read_timeout)
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.ConnectionError:
+                # ConnectTimeout 포함 (ReadTimeout은 여기 해당하지 않음)
+                if attempt == self.max_retries:
+                    raise
+                reason = "연결 오류"
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                reason = f"상태 {response.status_code}"
+
+            delay = self._backoff_delay(attempt, response)
+            logger.warning(f"   ⚠️  {reason} → {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
 
     def generate(self, text, language="ko", style="neutral", output_format="wav",
                  pitch_shift=0, speed=1, pitch_variance=1):
@@ -53,46 +162,89 @@ class SupertonTTS:
         Returns:
             음성 바이트 데이터 또는 None
         """
-        url = f"https://supertoneapi.com/v1/text-to-speech/{self.voice_id}"
-
-        headers = {
-            "x-sup-api-key": self.api_key,
-            "Content-Type": "application/json"
-        }
+        with tracer.span("tts.generate", engine="superton") as attrs:
+            cache_key = None
+            if self.cache:
+                cache_key = AudioCache.make_key(
+                    text=text, voice_id=self.voice_id, language=language, style=style,
+                    model=self.model, output_format=output_format, pitch_shift=pitch_shift,
+                    speed=speed, pitch_variance=pitch_variance,
+                )
+                cached = self.cache.get(cache_key)
+                attrs["cached"] = bool(cached)
+                if cached:
+                    logger.debug(f"🔊 음성 캐시 사용: {text[:20]}...")
+                    return cached
+
+            url = f"https://supertoneapi.com/v1/text-to-speech/{self.voice_id}"
+
+            headers = {
+                "x-sup-api-key": self.api_key,
+                "Content-Type": "application/json"
+            }
 
-        payload = {
-            "text": text,
-            "language": language,
-            "style": style,
-            "model": "sona_speech_1",
-            "output_format": output_format,
-            "voice_settings": {
-                "pitch_shift": pitch_shift,
-                "pitch_variance": pitch_variance,
-                "speed": speed
+            payload = {
+                "text": text,
+                "language": language,
+                "style": style,
+                "model": self.model,
+                "output_format": output_format,
+                "voice_settings": {
+                    "pitch_shift": pitch_shift,
+                    "pitch_variance": pitch_variance,
+                    "speed": speed
+                }
             }
-        }
 
-        try:
-            print(f"🔊 음성 생성 중: {text[:20]}...", end=" ", flush=True)
-            print(f"\n   📤 요청 스타일: {style}", flush=True)
+            try:
+                logger.debug(f"🔊 음성 생성 중: {text[:20]}... (스타일: {style})")
+
+                response = self._request("POST", url, json=payload, headers=headers)
+
+                if response.status_code == 200:
+                    logger.debug(f"✅ 음성 생성 완료: {text[:20]}...")
+                    if cache_key:
+                        self.cache.put(cache_key, response.content)
+                    return response.content
+                else:
+                    attrs["status"] = response.status_code
+                    logger.error(f"❌ 음성 생성 오류 (상태: {response.status_code})")
+                    logger.debug(f"응답: {response.text}")
+                    return None
+
+            except requests.exceptions.Timeout:
+                attrs["error"] = "timeout"
+                logger.error(f"❌ 요청 시간 초과 ({self.read_timeout:g}초)")
+                return None
+            except Exception as e:
+                attrs["error"] = type(e).__name__
+                logger.error(f"❌ 오류: {e}")
+                return None
 
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+    def play(self, audio_data):
+        """
+        음성 바이트 데이터를 임시 파일 없이 메모리에서 재생 (재생이 끝날 때까지 대기)
 
-            if response.status_code == 200:
-                print("✅ 완료", flush=True)
-                return response.content
+        Args:
+            audio_data: WAV 음성 바이트 데이터
+
+        Returns:
+            bool: 사용자가 끼어들어 재생을 멈췄으면 True
+        """
+        try:
+            logger.debug("▶️  재생 중...")
+            # 재생하는 동안 치피 목소리는 인식 결과에서 제외 (끼어들기 모드면 사용자가 말할 때 바로 멈춤)
+            with self.recognition.playback() if self.recognition else nullcontext() as interrupt:
+                interrupted = play_audio_bytes(audio_data, "wav", interrupt=interrupt)
+            if interrupted:
+                logger.info("✋ 끼어들기 감지, 재생 중단")
             else:
-                print(f"❌ 오류 (상태: {response.status_code})", flush=True)
-                print(f"응답: {response.text}")
-                return None
+                logger.debug("✅ 재생 완료")
+            return interrupted
 
-        except requests.exceptions.Timeout:
-            print(f"❌ 요청 시간 초과 (30초)", flush=True)
-            return None
         except Exception as e:
-            print(f"❌ 오류: {e}", flush=True)
-            return None
+            logger.error(f"❌ 재생 오류: {e}")
+            return False
 
     def speak(self, text, language="ko", style="neutral", pitch_shift=0, speed=1, pitch_variance=1):
         """
@@ -111,32 +263,31 @@ class SupertonTTS:
                                    pitch_variance=pitch_variance)
 
         if audio_data:
-            try:
-                # 임시 파일로 저장 후 재생
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                temp_file = os.path.join(current_dir, "temp_superton.wav")
+            self.play(audio_data)
 
-                with open(temp_file, "wb") as f:
-                    f.write(audio_data)
-
-                print("▶️  재생 중...", end=" ", flush=True)
-                pygame.mixer.music.load(temp_file)
-                pygame.mixer.music.play()
-
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(30)
+    def speak_stream(self, text, language="ko", style="neutral", pitch_shift=0, speed=1, pitch_variance=1):
+        """
+        문장 단위로 나눠서 합성/재생 (문장 N 재생 중에 문장 N+1 합성)
 
-                pygame.mixer.music.unload()
-                print("✅ 완료", flush=True)
+        Args:
+            text: 말할 텍스트 또는 텍스트 조각 스트림 (예: ChipiBrain.stream_run())
+            language: 언어 (기본값: "ko")
+            style: 스타일 (기본값: "neutral")
+            pitch_shift: 음높이 조정 (-20 ~ 20, 기본값: 0)
+            speed: 재생 속도 (0.5 ~ 2, 기본값: 1)
+            pitch_variance: 음높이 변동성 (0 ~ 2, 기본값: 1)
 
-                # 임시 파일 삭제
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+        Returns:
+            str: 실제로 말한 전체 텍스트
+        """
+        def synthesize(sentence):
+            return self.generate(sentence, language, style, output_format="wav",
+                                 pitch_shift=pitch_shift, speed=speed,
+                                 pitch_variance=pitch_variance)
 
-            except Exception as e:
-                print(f"❌ 재생 오류: {e}", flush=True)
+        spoken = []
+        SpeechPipeline(synthesize, self.play).run(to_sentences(text, spoken))
+        return " ".join(spoken)
 
     def save(self, text, filename="output.wav", language="ko", style="neutral", output_format="wav",
              pitch_shift=0, speed=1, pitch_variance=1):
@@ -165,53 +316,46 @@ class SupertonTTS:
                 current_dir = os.path.dirname(os.path.abspath(__file__))
                 filepath = os.path.join(current_dir, filename)
 
-                with open(filepath, "wb") as f:
-                    f.write(audio_data)
+                with tracer.span("tts.file_write", bytes=len(audio_data)):
+                    with open(filepath, "wb") as f:
+                        f.write(audio_data)
 
-                print(f"💾 저장 완료: {filepath}")
+                logger.info(f"💾 저장 완료: {filepath}")
                 return filepath
 
             except Exception as e:
-                print(f"❌ 파일 저장 오류: {e}", flush=True)
+                logger.error(f"❌ 파일 저장 오류: {e}")
                 return None
 
         return None
 
-    def listen(self):
+    def listen(self, timeout=None):
         """
         마이크에서 음성 입력받아 텍스트로 변환
+        (연속 인식 세션을 한 번만 열어두고 인식된 문장을 하나씩 꺼냄)
+
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 말할 때까지 대기)
 
         Returns:
             인식된 텍스트 또는 None
         """
         if not self.speech_config:
-            print("❌ Azure Speech 설정이 없습니다.")
+            logger.error("❌ Azure Speech 설정이 없습니다.")
             return None
 
-        audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
-        recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, audio_config=audio_config)
-
-        # 침묵 감지 시간 단축
-        recognizer.properties.set_property_by_name("SpeechServiceConnection_InitialSilenceTimeoutMs", "3000")
-        recognizer.properties.set_property_by_name("Speech_SegmentationSilenceTimeoutMs", "1000")
-
-        print("\n👂 듣는 중...", end=" ", flush=True)
+        if self.recognition is None:
+            self.recognition = create_recognizer(self.speech_config)
 
-        result = recognizer.recognize_once_async().get()
+        logger.info("\n👂 듣는 중...")
 
-        # 리소스 즉시 해제
-        del recognizer
-        del audio_config
+        text = self.recognition.listen(timeout)
+        if text:
+            logger.info(f"✅ 인식됨: \"{text}\"")
+            return text
 
-        if result.reason == speechsdk.ResultReason.RecognizedSpeech:
-            print(f"✅ 인식됨: \"{result.text}\"", flush=True)
-            return result.text
-        elif result.reason == speechsdk.ResultReason.NoMatch:
-            print("🔕 (침묵)", flush=True)
-            return None
-        elif result.reason == speechsdk.ResultReason.Canceled:
-            print("❌ (취소/오류)", flush=True)
-            return None
+        logger.debug("🔕 (침묵)")
+        return None
 
     def list_voices(self):
         """
@@ -227,19 +371,18 @@ class SupertonTTS:
         }
 
         try:
-            print("🎤 음성 목록 조회 중...", end=" ", flush=True)
+            logger.info("🎤 음성 목록 조회 중...")
 
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._request("GET", url, read_timeout=10, headers=headers)
 
             if response.status_code == 200:
-                print("✅ 완료", flush=True)
                 return response.json()
             else:
-                print(f"❌ 오류 (상태: {response.status_code})", flush=True)
+                logger.error(f"❌ 음성 목록 조회 오류 (상태: {response.status_code})")
                 return None
 
         except Exception as e:
-            print(f"❌ 오류: {e}", flush=True)
+            logger.error(f"❌ 오류: {e}")
             return None
 
 
@@ -1,10 +1,21 @@
 import os
+import sys
+from contextlib import nullcontext
 import azure.cognitiveservices.speech as speechsdk
 from dotenv import load_dotenv
-import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.logger import get_logger
+from src.core.tracing import tracer
+from src.tts.playback import play_audio_bytes
+from src.tts.speech_pipeline import SpeechPipeline, to_sentences
+from src.tts.speech_session import create_recognizer
 
 load_dotenv()
 
+logger = get_logger("tts.azure")
+
 class AzureTTS:
     def __init__(self):
         self.speech_key = os.getenv("AZURE_SPEECH_KEY")
@@ -13,18 +24,27 @@ class AzureTTS:
         if not self.speech_key or not self.service_region:
             raise ValueError("❌ .env 파일 확인 필요")
 
-        pygame.mixer.init()
-
         # Speech Config는 한 번만 로드해서 재사용 (속도 향상)
         self.speech_config = speechsdk.SpeechConfig(subscription=self.speech_key, region=self.service_region)
         self.speech_config.set_speech_synthesis_output_format(
             speechsdk.SpeechSynthesisOutputFormat.Audio48Khz192KBitRateMonoMp3
         )
         self.speech_config.speech_recognition_language = "ko-KR"
+        self.recognition = None  # 첫 listen() 때 인식 세션 시작 (CHIPI_LOCAL_VAD=1이면 로컬 VAD 사용)
+
+    def synthesize(self, text, params):
+        """
+        SSML로 음성 합성 후 MP3 바이트 데이터 반환
+
+        Args:
+            text: 말할 텍스트
+            params: 음성 설정 (voice, style, style_degree, pitch, rate)
+
+        Returns:
+            음성 바이트 데이터 또는 None
+        """
+        logger.debug(f"🔊 [TTS] 음성 생성 시작: {text[:15]}...")
 
-    def speak(self, text, params):
-        print(f"🔊 [TTS] 음성 생성 시작: {text[:15]}...", end=" ", flush=True)
-        
         voice = params.get("voice", "ko-KR-SeoHyeonNeural")
         style = params.get("style", "cheerful")
         degree = params.get("style_degree", 2.0)
@@ -40,67 +60,71 @@ class AzureTTS:
             f'</prosody></mstts:express-as></voice></speak>'
         )
 
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        temp_filename = os.path.join(current_dir, "temp_output.mp3")
-
-        # 파일 저장용 합성기 생성
-        synthesizer = speechsdk.SpeechSynthesizer(speech_config=self.speech_config, audio_config=None)
-        
-        # 비동기 실행 (생성)
-        result = synthesizer.speak_ssml_async(ssml_string).get()
-
-        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-            print("✅ 생성 완료 -> 재생 중", flush=True)
-            
-            # 파일 쓰기
-            with open(temp_filename, "wb") as f:
-                f.write(result.audio_data)
-            
-            # 재생
-            try:
-                pygame.mixer.music.load(temp_filename)
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(30) # 체크 주기를 10->30으로 높여 반응성 향상
-                pygame.mixer.music.unload()
-            except Exception as e:
-                print(f"\n❌ 재생 오류: {e}")
-
-            # 파일 삭제 (빠른 정리를 위해 try-except 최소화)
-            try: os.remove(temp_filename)
-            except: pass
-
-        elif result.reason == speechsdk.ResultReason.Canceled:
-            print(f"\n❌ [TTS 실패] {result.cancellation_details.error_details}")
-
-        del synthesizer
-
-    def listen(self):
-        # 듣기 전용 설정
-        audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
-        recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, audio_config=audio_config)
-
-        # [중요] 침묵 감지 시간 단축 (말 끝나면 더 빨리 인식하도록)
-        # 기본값보다 짧게 설정하여 반응 속도를 높임
-        # InitialSilenceTimeout: 말 시작 전 대기 시간
-        # EndSilenceTimeout: 말 끝난 후 대기 시간 (이걸 줄여야 빨리 넘어감)
-        recognizer.properties.set_property_by_name("SpeechServiceConnection_InitialSilenceTimeoutMs", "3000")
-        recognizer.properties.set_property_by_name("Speech_SegmentationSilenceTimeoutMs", "1000")
-
-        print("\n👂 듣는 중...", end=" ", flush=True)
-        
-        result = recognizer.recognize_once_async().get()
+        with tracer.span("tts.synthesize", engine="azure") as attrs:
+            # 파일 저장용 합성기 생성
+            synthesizer = speechsdk.SpeechSynthesizer(speech_config=self.speech_config, audio_config=None)
 
-        # 리소스 즉시 해제 (충돌 방지)
-        del recognizer
-        del audio_config
+            # 비동기 실행 (생성)
+            result = synthesizer.speak_ssml_async(ssml_string).get()
+            del synthesizer
 
-        if result.reason == speechsdk.ResultReason.RecognizedSpeech:
-            print(f"✅ 인식됨: \"{result.text}\"", flush=True)
-            return result.text
-        elif result.reason == speechsdk.ResultReason.NoMatch:
-            print("🔕 (침묵)", flush=True)
+            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+                logger.debug("✅ 생성 완료")
+                return result.audio_data
+            elif result.reason == speechsdk.ResultReason.Canceled:
+                attrs["error"] = "canceled"
+                logger.error(f"❌ [TTS 실패] {result.cancellation_details.error_details}")
             return None
-        elif result.reason == speechsdk.ResultReason.Canceled:
-            print("❌ (취소/오류)", flush=True)
-            return None
\ No newline at end of file
+
+    def play(self, audio_data):
+        """
+        MP3 바이트 데이터를 임시 파일 없이 메모리에서 재생 (재생이 끝날 때까지 대기)
+
+        Args:
+            audio_data: MP3 음성 바이트 데이터
+
+        Returns:
+            bool: 사용자가 끼어들어 재생을 멈췄으면 True
+        """
+        try:
+            # 재생하는 동안 치피 목소리는 인식 결과에서 제외 (끼어들기 모드면 사용자가 말할 때 바로 멈춤)
+            with self.recognition.playback() if self.recognition else nullcontext() as interrupt:
+                interrupted = play_audio_bytes(audio_data, "mp3", interrupt=interrupt)
+            if interrupted:
+                logger.info("✋ 끼어들기 감지, 재생 중단")
+            return interrupted
+        except Exception as e:
+            logger.error(f"❌ 재생 오류: {e}")
+            return False
+
+    def speak(self, text, params):
+        audio_data = self.synthesize(text, params)
+        if audio_data:
+            self.play(audio_data)
+
+    def speak_stream(self, text, params):
+        """문장 단위로 나눠서 합성/재생 (문장 N 재생 중에 문장 N+1 합성)
+        text에는 전체 문자열 또는 ChipiBrain.stream_run() 같은 조각 스트림을 넘길 수 있음
+
+        Returns:
+            str: 실제로 말한 전체 텍스트
+        """
+        spoken = []
+        SpeechPipeline(lambda sentence: self.synthesize(sentence, params), self.play).run(to_sentences(text, spoken))
+        return " ".join(spoken)
+
+    def listen(self, timeout=None):
+        # 연속 인식 세션은 한 번만 열고 계속 재사용 (턴마다 마이크/서비스 연결을 새로 열지 않음)
+        # CHIPI_LOCAL_VAD=1이면 말소리 구간만 보내고 발화 끝도 로컬에서 판정 (서버 침묵 대기 없음)
+        if self.recognition is None:
+            self.recognition = create_recognizer(self.speech_config)
+
+        logger.info("\n👂 듣는 중...")
+
+        text = self.recognition.listen(timeout)
+        if text:
+            logger.info(f"✅ 인식됨: \"{text}\"")
+            return text
+
+        logger.debug("🔕 (침묵)")
+        return None
\ No newline at end of file
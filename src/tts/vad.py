@@ -0,0 +1,258 @@
+import os
+import sys
+import wave
+from collections import deque
+import numpy as np
+
+
+def load_wav(path):
+    """
+    16bit PCM WAV 파일 읽기 (확장자와 상관없이 내용이 WAV면 읽음)
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        tuple: (float32 샘플 배열 [-1, 1], 샘플레이트)
+    """
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"16bit PCM만 지원합니다: {path}")
+        channels = f.getnchannels()
+        sample_rate = f.getframerate()
+        data = f.readframes(f.getnframes())
+
+    samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def to_float(pcm):
+    """16bit PCM 바이트 또는 배열을 float32 [-1, 1] 배열로 변환"""
+    if isinstance(pcm, (bytes, bytearray, memoryview)):
+        return np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    pcm = np.asarray(pcm)
+    if pcm.dtype == np.int16:
+        return pcm.astype(np.float32) / 32768.0
+    return pcm.astype(np.float32, copy=False)
+
+
+class EnergyVAD:
+    """에너지 + 영교차율 기반 음성 구간 검출 (CPU만 사용, 프레임 특징은 NumPy로 한 번에 계산)"""
+
+    def __init__(self, sample_rate=16000, frame_ms=20, margin_db=None, min_db=-50.0,
+                 max_zcr=0.4, min_speech_ms=None, hangover_ms=None, noise_rise_db_per_sec=1.0):
+        """
+        초기화
+
+        Args:
+            sample_rate: 샘플레이트
+            frame_ms: 프레임 길이 (ms)
+            margin_db: 배경 소음보다 이만큼 커야 말소리로 판단 (기본값: env의 CHIPI_VAD_MARGIN_DB 또는 12)
+            min_db: 이보다 작은 소리는 항상 무음 (dBFS, 조용한 방에서 작은 잡음에 반응하지 않도록)
+            max_zcr: 영교차율이 이보다 높으면 잡음(바람/치찰음 계열)으로 봄
+            min_speech_ms: 말소리가 이만큼 이어져야 발화 시작 (기본값: env의 CHIPI_VAD_MIN_SPEECH_MS 또는 100)
+            hangover_ms: 무음이 이만큼 이어져야 발화 끝 (기본값: env의 CHIPI_VAD_HANGOVER_MS 또는 500)
+            noise_rise_db_per_sec: 배경 소음 추정치가 올라가는 속도 (내려가는 건 바로 따라감)
+        """
+        if margin_db is None:
+            margin_db = float(os.getenv("CHIPI_VAD_MARGIN_DB", "12"))
+        if min_speech_ms is None:
+            min_speech_ms = int(os.getenv("CHIPI_VAD_MIN_SPEECH_MS", "100"))
+        if hangover_ms is None:
+            hangover_ms = int(os.getenv("CHIPI_VAD_HANGOVER_MS", "500"))
+
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.max_zcr = max_zcr
+        self.min_speech_frames = max(1, round(min_speech_ms / frame_ms))
+        self.hangover_frames = max(1, round(hangover_ms / frame_ms))
+        self.noise_rise_per_frame = noise_rise_db_per_sec * frame_ms / 1000
+
+        self.reset()
+
+    def reset(self):
+        """상태 초기화 (새 입력을 처음부터 분석할 때)"""
+        self.noise_db = None
+        self.triggered = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._remainder = np.zeros(0, dtype=np.float32)
+
+    def frame_features(self, samples):
+        """
+        프레임별 에너지(dBFS)와 영교차율 계산 (프레임 전체를 한 번에 벡터 연산)
+
+        Args:
+            samples: float32 샘플 배열 (길이는 frame_len의 배수)
+
+        Returns:
+            tuple: (에너지 dB 배열, 영교차율 배열)
+        """
+        frames = samples.reshape(-1, self.frame_len)
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_len - 1)
+        return energy_db, zcr
+
+    def _is_speech(self, energy_db, zcr):
+        # 배경 소음 추정: 작아지면 바로 따라가고, 커지면 천천히 따라감 (말소리에 끌려 올라가지 않도록)
+        if self.noise_db is None or energy_db < self.noise_db:
+            self.noise_db = energy_db
+        else:
+            self.noise_db += self.noise_rise_per_frame
+
+        threshold = max(self.noise_db + self.margin_db, self.min_db)
+        return energy_db > threshold and zcr < self.max_zcr
+
+    def process(self, pcm):
+        """
+        오디오 조각을 프레임 단위로 판정 (남는 샘플은 다음 호출로 넘김)
+
+        Args:
+            pcm: 16bit PCM 바이트 또는 샘플 배열
+
+        Returns:
+            list: 프레임마다 (상태, float32 프레임 샘플)
+                  상태는 "silence", "start"(발화 시작), "speech", "end"(발화 끝)
+        """
+        samples = np.concatenate((self._remainder, to_float(pcm)))
+        usable = len(samples) - len(samples) % self.frame_len
+        self._remainder = samples[usable:]
+        if usable == 0:
+            return []
+
+        frames = samples[:usable].reshape(-1, self.frame_len)
+        energy_db, zcr = self.frame_features(samples[:usable])
+
+        results = []
+        for frame, db, z in zip(frames, energy_db, zcr):
+            speech = self._is_speech(db, z)
+
+            if not self.triggered:
+                self._speech_run = self._speech_run + 1 if speech else 0
+                if self._speech_run >= self.min_speech_frames:
+                    self.triggered = True
+                    self._silence_run = 0
+                    results.append(("start", frame))
+                else:
+                    results.append(("silence", frame))
+            else:
+                self._silence_run = 0 if speech else self._silence_run + 1
+                if self._silence_run >= self.hangover_frames:
+                    self.triggered = False
+                    self._speech_run = 0
+                    results.append(("end", frame))
+                else:
+                    results.append(("speech", frame))
+
+        return results
+
+    def segments(self, samples):
+        """
+        전체 오디오에서 발화 구간 찾기 (스트리밍과 같은 판정 로직 사용)
+
+        Args:
+            samples: 샘플 배열 또는 16bit PCM 바이트
+
+        Returns:
+            list: [(시작 초, 끝 초), ...]
+        """
+        self.reset()
+        frame_sec = self.frame_ms / 1000
+        segments = []
+        start = None
+
+        for i, (state, _) in enumerate(self.process(samples)):
+            if state == "start":
+                start = (i - self.min_speech_frames + 1) * frame_sec
+            elif state == "end":
+                # 무음이 시작된 프레임까지만 발화로 봄
+                segments.append((start, (i - self.hangover_frames + 1) * frame_sec))
+                start = None
+
+        if start is not None:
+            segments.append((start, len(to_float(samples)) / self.sample_rate))
+
+        self.reset()
+        return segments
+
+
+class VADGate:
+    """VAD 판정에 따라 말소리 구간만 인식기로 넘기는 게이트 (발화 앞부분이 잘리지 않게 조금 앞에서부터 넘김)"""
+
+    def __init__(self, vad, pre_roll_ms=300):
+        """
+        초기화
+
+        Args:
+            vad: EnergyVAD
+            pre_roll_ms: 발화 시작 판정 전에 미리 보관해 둘 오디오 길이 (ms)
+        """
+        self.vad = vad
+        pre_roll_frames = max(vad.min_speech_frames, round(pre_roll_ms / vad.frame_ms))
+        self._pre_roll = deque(maxlen=pre_roll_frames)
+
+    def reset(self):
+        self.vad.reset()
+        self._pre_roll.clear()
+
+    def feed(self, pcm):
+        """
+        마이크 오디오 조각 넣기
+
+        Args:
+            pcm: 16bit PCM 바이트
+
+        Returns:
+            tuple: (인식기로 넘길 16bit PCM 바이트, 발화 시작 여부, 발화 끝 여부)
+        """
+        forward = []
+        started = ended = False
+
+        for state, frame in self.vad.process(pcm):
+            if state == "silence":
+                self._pre_roll.append(frame)
+                continue
+
+            if state == "start":
+                started = True
+                forward.extend(self._pre_roll)
+                self._pre_roll.clear()
+            forward.append(frame)
+
+            if state == "end":
+                ended = True
+
+        if not forward:
+            return b"", started, ended
+
+        pcm_out = (np.clip(np.concatenate(forward), -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+        return pcm_out, started, ended
+
+
+if __name__ == "__main__":
+    # 사용법: python src/tts/vad.py [wav 파일 ...] (기본값: voice/ 폴더의 WAV 파일)
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    paths = sys.argv[1:]
+    if not paths:
+        voice_dir = os.path.join(project_root, "voice")
+        for name in sorted(os.listdir(voice_dir)):
+            path = os.path.join(voice_dir, name)
+            with open(path, "rb") as f:
+                if f.read(4) == b"RIFF":
+                    paths.append(path)
+
+    for path in paths:
+        samples, sample_rate = load_wav(path)
+        vad = EnergyVAD(sample_rate=sample_rate)
+        segments = vad.segments(samples)
+        total = len(samples) / sample_rate
+        speech = sum(end - start for start, end in segments)
+        print(f"🎧 {os.path.basename(path)}: {total:.2f}초 중 말소리 {speech:.2f}초 ({len(segments)}구간)")
+        for start, end in segments:
+            print(f"   {start:6.2f} ~ {end:6.2f}초")
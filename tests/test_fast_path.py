@@ -0,0 +1,72 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.fast_path import FastPathResponder
+
+SENSOR = {"temperature": 23.0, "humidity": 55.0}
+GOOD = {"status": "good", "issues": []}
+
+
+@pytest.fixture
+def responder():
+    return FastPathResponder(devices=["S1"])
+
+
+@pytest.mark.parametrize("text", [
+    "온도 어때?",
+    "온도 어때",
+    "온도 몇 도야",
+    "지금 온도 몇도야?",
+    "습도 얼마야",
+    "습도 알려줘",
+    "더워?",
+    "온도 괜찮니",
+])
+def test_answers_sensor_questions(responder, text):
+    reply = responder.respond(text, "chipi", SENSOR, GOOD)
+    assert reply is not None
+    assert "23" in reply or "55" in reply
+
+
+@pytest.mark.parametrize("text", [
+    "온도 좀 올려줘",
+    "온도 좀 올려줄래?",
+    "온도계 사줄게",
+    "나 추워",
+    "습도 신경 쓸게",
+    "온도랑 습도 어때?",
+    "왜 이렇게 더워?",
+    "물 줄게 온도 어때?",
+    "안녕",
+])
+def test_rejects_non_questions_and_compound(responder, text):
+    assert responder.respond(text, "chipi", SENSOR, GOOD) is None
+
+
+def test_uses_plant_status(responder):
+    reply = responder.respond("온도 어때?", "chipi", {"temperature": 15, "humidity": 30},
+                              {"status": "bad", "issues": ["너무 추워", "목이 말라"]})
+    assert reply.startswith(("15도야", "으슬으슬해", "15도라서"))
+    assert "목말라" in reply or "물" in reply
+
+
+def test_device_opt_in_and_persona(responder):
+    assert responder.enabled_for("S1")
+    assert not responder.enabled_for("S2")
+    assert not responder.enabled_for(None)
+    assert FastPathResponder(devices=["*"]).enabled_for("S9")
+    assert responder.respond("온도 어때?", "jarvis_4", SENSOR, GOOD) is None
+
+
+def test_missing_data_falls_back(responder):
+    assert responder.respond("온도 어때?", "chipi", {"humidity": 50}, GOOD) is None
+    assert responder.respond("온도 어때?", "chipi", SENSOR, {"status": "unknown", "issues": []}) is None
+
+
+def test_handles_matches_respond(responder):
+    assert responder.handles("온도 어때", "chipi", SENSOR, GOOD)
+    assert not responder.handles("온도 좀 올려줘", "chipi", SENSOR, GOOD)
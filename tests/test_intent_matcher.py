@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.intent_matcher import IntentMatcher, is_question, match_intents, normalize
+
+
+def test_normalize_keeps_word_boundaries():
+    assert normalize("  그 만화,   재밌어!! ") == "그 만화 재밌어"
+    assert normalize("Hi_There") == "hi there"
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("이제 그만", "exit"),
+    ("종료해줘", "exit"),
+    ("온도 어때?", "temperature"),
+    ("너무 더워요", "temperature"),
+    ("습도는?", "humidity"),
+    ("물 줄게", "water"),
+    ("물줄게!", "water"),
+    ("물을 줄게요", "water"),
+    ("살기 싫어", "sad"),
+    ("살기싫어", "sad"),
+    ("안녕 치피", "greeting"),
+    ("좋은아침", "greeting"),
+])
+def test_true_positives(text, intent):
+    assert intent in match_intents(text)
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("그 만화 재밌어", "exit"),
+    ("오늘 종 료일이야", "exit"),
+    ("말 라면 먹을래", "humidity"),
+    ("하이라이트 봤어", "greeting"),
+    ("온 도시가 조용해", "temperature"),
+])
+def test_keywords_do_not_span_word_boundaries(text, intent):
+    assert intent not in match_intents(text)
+
+
+def test_multiple_intents():
+    assert match_intents("안녕, 온도랑 습도 어때?") == {"greeting", "temperature", "humidity"}
+
+
+def test_empty_input():
+    assert match_intents("") == set()
+    assert IntentMatcher({}).match("그만") == set()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("온도 어때?", True),
+    ("습도 어때", True),
+    ("온도 몇도야", True),
+    ("습도 알려줘", True),
+    ("지금 덥니", True),
+    ("온도 좀 올려줘", False),
+    ("나 추워", False),
+    ("습도 신경 쓸게", False),
+    ("", False),
+])
+def test_is_question(text, expected):
+    assert is_question(text) is expected
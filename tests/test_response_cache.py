@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.response_cache import ResponseCache, ngram_similarity
+
+SENSOR = {"temperature": 23.4, "humidity": 52}
+GOOD = {"status": "good", "issues": []}
+THIRSTY = {"status": "bad", "issues": ["목이 말라"]}
+
+
+def fill(cache, text, replies, sensor=SENSOR, status=GOOD):
+    for reply in replies:
+        key, cached = cache.lookup(text, "chipi", sensor, status)
+        assert cached is None
+        cache.store(key, text, reply)
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(ttl=60, variety=2, similarity=0)
+
+
+def test_hit_after_pool_is_full(cache):
+    fill(cache, "온도 어때?", ["a", "b"])
+    seen = {cache.lookup("온도 어때?", "chipi", SENSOR, GOOD)[1] for _ in range(4)}
+    assert seen == {"a", "b"}
+
+
+def test_does_not_repeat_last_reply(cache):
+    fill(cache, "온도 어때?", ["a", "b"])
+    first = cache.lookup("온도 어때?", "chipi", SENSOR, GOOD)[1]
+    assert cache.lookup("온도 어때?", "chipi", SENSOR, GOOD)[1] != first
+
+
+@pytest.mark.parametrize("text", ["온도 좀 올려줘", "나 추워", "온도계 사줄게"])
+def test_sensor_keywords_without_question_are_not_cached(cache, text):
+    fill(cache, "온도 어때?", ["a", "b"])
+    assert cache.lookup(text, "chipi", SENSOR, GOOD) == (None, None)
+
+
+def test_plant_status_is_part_of_key(cache):
+    fill(cache, "안녕!", ["안녕! 나 목말라!", "반가워, 물 좀 줄래?"], status=THIRSTY)
+    assert cache.lookup("안녕!", "chipi", SENSOR, THIRSTY)[1] is not None
+    key, reply = cache.lookup("안녕!", "chipi", SENSOR, GOOD)
+    assert key is not None and reply is None
+
+
+def test_sensor_bucket_and_persona(cache):
+    fill(cache, "온도 어때?", ["a", "b"])
+    assert cache.lookup("온도 어때?", "chipi", {"temperature": 25.0, "humidity": 52}, GOOD)[1] is None
+    assert cache.lookup("온도 어때?", "jarvis_4", SENSOR, GOOD)[1] is None
+
+
+def test_compound_or_long_utterances_are_not_cached(cache):
+    assert cache.lookup("안녕 온도 어때?", "chipi", SENSOR, GOOD) == (None, None)
+    assert cache.lookup("물 줄게", "chipi", SENSOR, GOOD) == (None, None)
+    assert cache.lookup("오늘 온도가 어제보다 어때?", "chipi", SENSOR, GOOD) == (None, None)
+
+
+def test_similarity_lookup():
+    cache = ResponseCache(ttl=60, variety=1, similarity=0.3)
+    fill(cache, "습도 어때?", ["h"])
+    assert cache.lookup("습도어떄?", "chipi", SENSOR, GOOD)[1] == "h"
+    assert cache.lookup("뭐해", "chipi", SENSOR, GOOD) == (None, None)
+    assert ngram_similarity("abc", "abc") == 1.0
+
+
+def test_would_hit_does_not_touch_stats(cache):
+    fill(cache, "온도 어때?", ["a", "b"])
+    before = cache.stats()
+    assert cache.would_hit("온도 어때", "chipi", SENSOR, GOOD)
+    assert not cache.would_hit("습도 어때?", "chipi", SENSOR, GOOD)
+    assert not cache.would_hit("온도 좀 올려줘", "chipi", SENSOR, GOOD)
+    assert cache.stats() == before
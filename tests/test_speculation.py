@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.speculation import edit_distance, normalize_text, transcripts_match
+
+
+def test_normalize_and_edit_distance():
+    assert normalize_text(" 오늘, 날씨 어때? ") == "오늘날씨어때"
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("", "abc") == 3
+
+
+@pytest.mark.parametrize("draft, final", [
+    ("오늘 날씨 어때", "오늘 날씨 어때?"),
+    ("오늘 날씨는 어때", "오늘 날씨는 어떄"),
+    ("안녕 치피야 반가워", "안녕, 치피야. 반가워!"),
+    ("나 오늘 못 갔어", "나 오늘 못 갔어."),
+])
+def test_matches_same_utterance(draft, final):
+    assert transcripts_match(draft, final, 0.15)
+
+
+@pytest.mark.parametrize("draft, final", [
+    ("오늘 기분이 좋아", "오늘 기분이 안 좋아"),
+    ("나 오늘 학교 갔어", "나 오늘 학교 안 갔어"),
+    ("숙제 다 했어", "숙제 다 못 했어"),
+    ("그거 재밌어", "그거 재미없어"),
+    ("이거 좋지 않아", "이거 좋아"),
+    ("오늘 날씨", "내일 비와"),
+    ("", "안녕"),
+])
+def test_rejects_different_or_negated_utterance(draft, final):
+    assert not transcripts_match(draft, final, 0.15)
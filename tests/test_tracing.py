@@ -0,0 +1,53 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.tracing import Tracer
+
+
+def test_turns_are_per_thread():
+    tracer = Tracer(enabled=True)
+    barrier = threading.Barrier(2)
+    turn_ids = {}
+
+    def handle(serial):
+        turn_ids[serial] = tracer.start_turn(device=serial)
+        barrier.wait()  # 두 턴이 동시에 진행 중일 때 기록
+        with tracer.span("server.chat"):
+            pass
+
+    threads = [threading.Thread(target=handle, args=(serial,)) for serial in ("SN-A", "SN-B")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert turn_ids["SN-A"].startswith("SN-A-") and turn_ids["SN-B"].startswith("SN-B-")
+    for turn_id in turn_ids.values():
+        assert [span["name"] for span in tracer.spans(turn_id)] == ["server.chat"]
+    # 턴을 시작하지 않은 스레드에는 다른 스레드의 턴이 보이지 않음
+    assert tracer.turn_id is None
+
+
+def test_bind_carries_turn_to_worker_threads():
+    tracer = Tracer(enabled=True)
+    turn_id = tracer.start_turn()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        bound = tracer.bind(lambda: tracer.record("tts.generate", 0.01))
+        for future in [executor.submit(bound) for _ in range(4)]:
+            future.result()
+        executor.submit(lambda: tracer.record("unbound", 0.01)).result()
+
+    assert len(tracer.spans(turn_id)) == 4
+    assert [span["turn"] for span in tracer.spans() if span["name"] == "unbound"] == [None]
+
+
+def test_explicit_turn_id_overrides_current_turn():
+    tracer = Tracer(enabled=True)
+    tracer.start_turn(turn_id=7)
+    tracer.record("db.build_context", 0.01, turn_id=3)
+    assert tracer.spans()[0]["turn"] == 3
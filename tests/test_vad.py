@@ -0,0 +1,115 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.tts.vad import EnergyVAD, VADGate, load_wav
+
+SAMPLE_RATE = 16000
+FRAME_SEC = 0.02
+
+
+def _make_vad(sample_rate=SAMPLE_RATE):
+    # env(CHIPI_VAD_*)와 상관없이 같은 결과가 나오도록 값을 모두 지정
+    return EnergyVAD(sample_rate=sample_rate, margin_db=12, min_speech_ms=100, hangover_ms=500)
+
+
+def _silence(sec, seed=0):
+    """아주 작은 배경 소음 (-80dBFS 정도)"""
+    return np.random.default_rng(seed).normal(0, 1e-4, int(SAMPLE_RATE * sec)).astype(np.float32)
+
+
+def _tone(sec, freq=220.0, amplitude=0.3):
+    t = np.arange(int(SAMPLE_RATE * sec)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _voice_wavs():
+    """voice/ 폴더에서 내용이 WAV인 파일 (확장자가 .mp3여도 RIFF면 포함)"""
+    voice_dir = os.path.join(PROJECT_ROOT, "voice")
+    if not os.path.isdir(voice_dir):
+        return []
+    paths = []
+    for name in sorted(os.listdir(voice_dir)):
+        path = os.path.join(voice_dir, name)
+        with open(path, "rb") as f:
+            if f.read(4) == b"RIFF":
+                paths.append(path)
+    return paths
+
+
+def test_silence_tone_silence_is_one_segment():
+    samples = np.concatenate((_silence(1.0), _tone(1.0), _silence(1.0, seed=1)))
+
+    segments = _make_vad().segments(samples)
+
+    assert len(segments) == 1
+    start, end = segments[0]
+    assert start == pytest.approx(1.0, abs=2 * FRAME_SEC)
+    assert end == pytest.approx(2.0, abs=2 * FRAME_SEC)
+
+
+def test_tone_until_end_of_input_closes_at_input_length():
+    samples = np.concatenate((_silence(0.5), _tone(1.0)))
+
+    segments = _make_vad().segments(samples)
+
+    assert len(segments) == 1
+    assert segments[0][0] == pytest.approx(0.5, abs=2 * FRAME_SEC)
+    assert segments[0][1] == pytest.approx(1.5)
+
+
+def test_silence_only_has_no_segments():
+    assert _make_vad().segments(_silence(2.0)) == []
+
+
+def test_short_click_is_not_speech():
+    # min_speech_ms(100ms)보다 짧은 소리는 발화로 보지 않음
+    samples = np.concatenate((_silence(1.0), _tone(0.04), _silence(1.0, seed=1)))
+    assert _make_vad().segments(samples) == []
+
+
+def test_segments_accepts_pcm_bytes():
+    samples = np.concatenate((_silence(1.0), _tone(1.0), _silence(1.0, seed=1)))
+    pcm = (samples * 32767.0).astype("<i2").tobytes()
+
+    assert len(_make_vad().segments(pcm)) == 1
+
+
+def test_gate_forwards_only_speech_with_pre_roll():
+    samples = np.concatenate((_silence(1.0), _tone(1.0), _silence(1.0, seed=1)))
+    pcm = (samples * 32767.0).astype("<i2").tobytes()
+    gate = VADGate(_make_vad(), pre_roll_ms=300)
+
+    forwarded, started, ended = b"", False, False
+    chunk = int(SAMPLE_RATE * 0.1) * 2  # 100ms씩 (마이크 스트림처럼)
+    for i in range(0, len(pcm), chunk):
+        out, s, e = gate.feed(pcm[i:i + chunk])
+        forwarded += out
+        started |= s
+        ended |= e
+
+    assert started and ended
+    forwarded_sec = len(forwarded) / 2 / SAMPLE_RATE
+    # 말소리 1초 + 앞부분 보관분(최대 0.3초) + 끝 판정까지의 무음(0.5초)
+    assert 1.0 <= forwarded_sec <= 1.0 + 0.3 + 0.5 + 2 * FRAME_SEC
+
+
+@pytest.mark.parametrize("path", _voice_wavs() or [pytest.param(None, marks=pytest.mark.skip("voice/ WAV 없음"))])
+def test_voice_samples_have_speech(path):
+    samples, sample_rate = load_wav(path)
+    duration = len(samples) / sample_rate
+
+    segments = _make_vad(sample_rate).segments(samples)
+
+    assert segments, os.path.basename(path)
+    previous_end = 0.0
+    for start, end in segments:
+        assert previous_end <= start < end <= duration + 1e-6
+        previous_end = end
+    # 녹음 파일 대부분이 말소리지만 전체가 한 덩어리는 아님 (앞쪽 무음은 잘려야 함)
+    assert segments[0][0] > 0
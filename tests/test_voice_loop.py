@@ -0,0 +1,88 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pygame")  # voice_loop → playback
+
+from src.core.voice_loop import VoiceLoop
+
+FALLBACK = "미안, 다시 말해줄래?"
+
+
+class FakeBrain:
+    def __init__(self, stream_run):
+        self.stream_run = stream_run
+        self.messages = []
+
+    def add_msg(self, text):
+        self.messages.append(text)
+
+
+class FakeTTS:
+    name = "fake"
+
+    def __init__(self):
+        self.played = []
+
+    def synthesize(self, text, **params):
+        return text.encode("utf-8")
+
+    def play(self, audio_data):
+        self.played.append(audio_data.decode("utf-8"))
+        return False
+
+
+def _run_turn(brain, text="안녕 치피야"):
+    tts = FakeTTS()
+    loop = VoiceLoop(brain, tts)
+
+    async def main():
+        loop._loop = asyncio.get_running_loop()
+        await asyncio.wait_for(loop._turn(text, set()), timeout=3)
+
+    try:
+        asyncio.run(main())
+    finally:
+        for executor in (loop._llm_executor, loop._tts_executor, loop._play_executor):
+            executor.shutdown(wait=True)
+    return tts.played
+
+
+def test_turn_speaks_reply_sentences():
+    def stream_run(ai_name, device_serial):
+        yield "안녕! 나는 치피야. "
+        yield "오늘 기분 어때?"
+
+    played = _run_turn(FakeBrain(stream_run))
+
+    assert FALLBACK not in played
+    assert "".join(played).replace(" ", "") == "안녕!나는치피야.오늘기분어때?"
+
+
+def test_turn_falls_back_when_llm_call_fails():
+    def stream_run(ai_name, device_serial):
+        raise RuntimeError("LLM 연결 실패")
+
+    assert _run_turn(FakeBrain(stream_run)) == [FALLBACK]
+
+
+def test_turn_falls_back_when_llm_stream_fails():
+    def stream_run(ai_name, device_serial):
+        raise RuntimeError("LLM 연결 실패")
+        yield  # 제너레이터 (첫 next()에서 실패)
+
+    assert _run_turn(FakeBrain(stream_run)) == [FALLBACK]
+
+
+def test_turn_keeps_spoken_part_when_llm_fails_midway():
+    def stream_run(ai_name, device_serial):
+        yield "나는 화분 요정 치피야. 잠깐만"
+        raise RuntimeError("스트림 끊김")
+
+    played = _run_turn(FakeBrain(stream_run))
+
+    assert played and FALLBACK not in played